@@ -0,0 +1,47 @@
+"""add_property_metrics
+
+Revision ID: 7c1e4a9b2d30
+Revises: [generated_id]
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9b2d30'
+down_revision: Union[str, None] = '[generated_id]'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are backfilled by the reconciliation job on the next API startup
+    op.create_table(
+        'property_metrics',
+        sa.Column('property_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_units', sa.Integer(), nullable=False),
+        sa.Column('total_rooms', sa.Integer(), nullable=False),
+        sa.Column('occupied_rooms', sa.Integer(), nullable=False),
+        sa.Column('vacant_rooms', sa.Integer(), nullable=False),
+        sa.Column('potential_monthly', sa.Numeric(12, 2), nullable=False),
+        sa.Column('actual_monthly', sa.Numeric(12, 2), nullable=False),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('collected_this_month', sa.Numeric(12, 2), nullable=False),
+        sa.Column('outstanding_this_month', sa.Numeric(12, 2), nullable=False),
+        sa.Column('overdue_amount', sa.Numeric(12, 2), nullable=False),
+        sa.Column('open_maintenance', sa.Integer(), nullable=False),
+        sa.Column('expiring_30', sa.Integer(), nullable=False),
+        sa.Column('expiring_60', sa.Integer(), nullable=False),
+        sa.Column('expiring_90', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('property_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('property_metrics')
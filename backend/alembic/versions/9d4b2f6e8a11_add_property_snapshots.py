@@ -0,0 +1,41 @@
+"""add_property_snapshots
+
+Revision ID: 9d4b2f6e8a11
+Revises: 7c1e4a9b2d30
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b2f6e8a11'
+down_revision: Union[str, None] = '7c1e4a9b2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'property_snapshots',
+        sa.Column('property_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('total_rooms', sa.Integer(), nullable=False),
+        sa.Column('occupied_rooms', sa.Integer(), nullable=False),
+        sa.Column('vacant_rooms', sa.Integer(), nullable=False),
+        sa.Column('rent_roll', sa.Numeric(12, 2), nullable=False),
+        sa.Column('collected', sa.Numeric(12, 2), nullable=False),
+        sa.Column('overdue', sa.Numeric(12, 2), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('property_id', 'snapshot_date')
+    )
+    # Range reads across a whole portfolio filter on the date first
+    op.create_index('ix_property_snapshots_snapshot_date', 'property_snapshots', ['snapshot_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_snapshots_snapshot_date', table_name='property_snapshots')
+    op.drop_table('property_snapshots')
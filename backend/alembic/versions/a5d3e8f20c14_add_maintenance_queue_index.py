@@ -0,0 +1,28 @@
+"""add_maintenance_queue_index
+
+Revision ID: a5d3e8f20c14
+Revises: f2b9c4e61a07
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d3e8f20c14'
+down_revision: Union[str, None] = 'f2b9c4e61a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_maintenance_requests_queue', 'maintenance_requests',
+        ['status', sa.text('priority DESC'), 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_maintenance_requests_queue', table_name='maintenance_requests')
@@ -0,0 +1,60 @@
+"""add_search_indexes
+
+Revision ID: b3e8c5d1f472
+Revises: 9d4b2f6e8a11
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8c5d1f472'
+down_revision: Union[str, None] = '9d4b2f6e8a11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Generated tsvector columns read by app/services/search.py. The 'simple'
+# configuration keeps names and emails unstemmed; emails are indexed whole
+# and split on '@' and '.' so any part of the address prefix-matches.
+SEARCH_VECTORS = {
+    'users': "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+             "email || ' ' || translate(email, '@.', '  ')",
+    'messages': "coalesce(message, '')",
+    'maintenance_requests': "coalesce(title, '') || ' ' || coalesce(description, '')",
+    'documents': "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || "
+                 "coalesce(document_type, '') || ' ' || coalesce(filename, '')",
+}
+
+# pg_trgm indexes for fuzzy name/email matches and for room/unit number prefix ILIKE
+TRIGRAM_INDEXES = {
+    'ix_users_email_trgm': ('users', 'email'),
+    'ix_users_first_name_trgm': ('users', 'first_name'),
+    'ix_users_last_name_trgm': ('users', 'last_name'),
+    'ix_rooms_room_number_trgm': ('rooms', 'room_number'),
+    'ix_units_unit_number_trgm': ('units', 'unit_number'),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('simple', {expression})) STORED"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN search_vector")
@@ -0,0 +1,47 @@
+"""add_maintenance_photos
+
+Revision ID: b8e1f6a3d592
+Revises: a5d3e8f20c14
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1f6a3d592'
+down_revision: Union[str, None] = 'a5d3e8f20c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'maintenance_photos',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('request_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('uploaded_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('original_key', sa.String(length=500), nullable=False),
+        sa.Column('mime_type', sa.String(length=100), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('thumbnail_key', sa.String(length=500), nullable=True),
+        sa.Column('thumbnail_webp_key', sa.String(length=500), nullable=True),
+        sa.Column('display_webp_key', sa.String(length=500), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['maintenance_requests.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['uploaded_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_maintenance_photos_request_id', 'maintenance_photos', ['request_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_maintenance_photos_request_id', table_name='maintenance_photos')
+    op.drop_table('maintenance_photos')
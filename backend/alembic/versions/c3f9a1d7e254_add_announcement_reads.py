@@ -0,0 +1,39 @@
+"""add_announcement_reads
+
+Revision ID: c3f9a1d7e254
+Revises: b8e1f6a3d592
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a1d7e254'
+down_revision: Union[str, None] = 'b8e1f6a3d592'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'announcement_reads',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('announcement_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('read_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['announcement_id'], ['announcements.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id', 'announcement_id')
+    )
+    op.create_index(
+        'ix_announcements_property_feed', 'announcements',
+        ['property_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_announcements_property_feed', table_name='announcements')
+    op.drop_table('announcement_reads')
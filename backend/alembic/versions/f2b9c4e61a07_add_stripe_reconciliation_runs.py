@@ -0,0 +1,42 @@
+"""add_stripe_reconciliation_runs
+
+Revision ID: f2b9c4e61a07
+Revises: e4a7d2c9f018
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9c4e61a07'
+down_revision: Union[str, None] = 'e4a7d2c9f018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stripe_reconciliation_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('listed_from', sa.BigInteger(), nullable=False),
+        sa.Column('watermark', sa.BigInteger(), nullable=False),
+        sa.Column('intents_seen', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payments_paid', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payments_failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('discrepancies', postgresql.JSONB(astext_type=sa.Text()), nullable=False,
+                  server_default=sa.text("'[]'::jsonb")),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Lookups by stripe_payment_id were unindexed; reconciliation matches whole pages of intents at once
+    op.create_index('ix_payments_stripe_payment_id', 'payments', ['stripe_payment_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_stripe_payment_id', table_name='payments')
+    op.drop_table('stripe_reconciliation_runs')
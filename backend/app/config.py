@@ -9,6 +9,37 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Refresh tokens are single use; /auth/refresh trades one for a new access/refresh pair
+    refresh_token_expire_days: int = 14
+    # Seconds between re-reads of revoked access tokens into each worker's memory (0 disables);
+    # a logout on another worker takes effect here within this interval
+    token_revocation_sync_seconds: int = 30
+    # bcrypt cost factor; stored hashes at another cost are re-hashed on the user's next login
+    bcrypt_rounds: int = 12
+    # Processes per worker doing bcrypt, so login bursts queue there instead of occupying request threads
+    # (0 hashes on the request thread pool instead)
+    password_hash_workers: int = 2
+    
+    # Rate limits on login (/auth/login) and signup (operator and tenant): token buckets per client IP
+    # and per account (the email submitted), "<requests>/<seconds>" refilled evenly; "" disables one
+    rate_limit_login_ip: str = "30/60"
+    rate_limit_login_account: str = "10/300"
+    rate_limit_signup_ip: str = "10/600"
+    rate_limit_signup_account: str = "5/600"
+    # "memory" (per process, capped at rate_limit_max_keys buckets; with N workers an address gets up to
+    # N times each limit), "redis" (shared across workers, needs rate_limit_url) or "none"
+    rate_limit_backend: str = "memory"
+    rate_limit_url: str = "redis://localhost:6379/1"
+    rate_limit_max_keys: int = 100_000
+    # Proxies in front of the app that append to X-Forwarded-For; the client address for rate limits is
+    # this many entries from the right (0 uses the connecting address, for running without a proxy)
+    forwarded_client_hops: int = 1
+
+    # Connection pool per process; the production launcher sizes its worker count so that
+    # workers * (db_pool_size + db_max_overflow) stays within db_connection_budget
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_connection_budget: int = 80
     
     # Environment
     environment: str = "development"
@@ -17,6 +48,41 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:5173"
     tenant_frontend_url: str = "http://localhost:5174"
     
+    # Dashboard rollups - seconds between full property_metrics reconciliations (0 disables)
+    metrics_reconcile_interval_seconds: int = 900
+    # Seconds between captures of today's property_snapshots rows (0 disables)
+    metrics_snapshot_interval_seconds: int = 3600
+    
+    # Stripe webhooks - seconds between sweeps of unprocessed stripe_events (0 disables)
+    stripe_event_interval_seconds: int = 60
+    # Concurrent Stripe API calls per worker; callers beyond this queue instead of tying up request threads
+    stripe_max_concurrency: int = 8
+    # Reconciliation re-lists intents this many days before its watermark, since ACH intents settle days after creation
+    stripe_reconcile_lookback_days: int = 7
+    
+    # Tenant portal bootstrap - sections of /tenants/me/bootstrap queried at once per worker, each on its own connection
+    tenant_bootstrap_concurrency: int = 4
+    
+    # Response cache - "memory" (per-process LRU), "redis" (shared, needs response_cache_url) or "none"
+    response_cache_backend: str = "memory"
+    response_cache_url: str = "redis://localhost:6379/0"
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_entries: int = 5000
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    
+    # Maintenance photos - threads generating thumbnails per worker, and the largest accepted upload
+    maintenance_photo_workers: int = 2
+    maintenance_photo_max_bytes: int = 15 * 1024 * 1024
+    # Seconds between sweeps for photos whose job was lost with its worker (0 disables), and how long
+    # a photo may stay processing before the sweep re-queues it
+    maintenance_photo_sweep_interval_seconds: int = 300
+    maintenance_photo_stale_seconds: int = 600
+    
+    # Response compression - bodies below the minimum go out uncompressed
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    
     class Config:
         env_file = ".env"
         case_sensitive = False  # This allows lowercase field names to read UPPERCASE env vars
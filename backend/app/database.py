@@ -1,14 +1,26 @@
-from sqlalchemy import create_engine
+import zlib
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 
 settings = get_settings()
 
+
+def _pool_options(database_url: str) -> dict:
+    # SQLite (tests, local scripts) uses its own single-connection pools
+    if database_url.startswith("sqlite"):
+        return {}
+    return {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    echo=True if settings.environment == "development" else False
+    echo=True if settings.environment == "development" else False,
+    **_pool_options(settings.database_url)
 )
 
 # Create session factory
@@ -25,3 +37,39 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(connection):
+    """INSERT construct with ON CONFLICT support for the connection's dialect"""
+    if connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
+
+@contextmanager
+def advisory_lock(name: str, bind=None):
+    """
+    Yield whether this process got the Postgres advisory lock `name`, held
+    until the block exits. Every gunicorn worker (and host) starts the same
+    background jobs; wrapping a run in this lets one of them do the work
+    while the rest skip it. The lock lives on a connection of its own, since
+    a Session may switch connections after each commit. Other databases
+    (SQLite in tests) have a single process, so the lock is always granted.
+    """
+    bind = bind if bind is not None else engine
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = zlib.crc32(name.encode())
+    with bind.connect() as connection:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
@@ -1,9 +1,20 @@
 from app.routers import notifications
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
-from app.routers import documents, stripe_routes
+from app.routers import documents, stripe_routes, exports, search
+from app.config import get_settings
+from app.services.property_metrics import reconciliation_loop
+from app.services.property_snapshots import snapshot_loop
+from app.services.stripe_events import stripe_event_loop
+from app.services.tokens import revocation_sync_loop
+from app.services.maintenance_photos import photo_recovery_loop
+from app.services.response_cache import response_cache
+from app.utils.auth import get_current_operator
+from app.utils.compression import CompressionMiddleware
 
 from app.routers import (
     auth,
@@ -28,7 +39,9 @@ load_dotenv()
 app = FastAPI(
     title="CoLiv API",
     description="Co-living property management platform",
-    version="1.0.0"
+    version="1.0.0",
+    # Routes with a response_model are serialized by pydantic and only need dumping; orjson does that fastest
+    default_response_class=ORJSONResponse,
 )
 
 # Environment-based CORS configuration
@@ -59,6 +72,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+settings = get_settings()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
+@app.on_event("startup")
+async def start_metrics_jobs():
+    settings = get_settings()
+    if settings.metrics_reconcile_interval_seconds > 0:
+        app.state.metrics_reconciliation = asyncio.create_task(
+            reconciliation_loop(settings.metrics_reconcile_interval_seconds)
+        )
+    if settings.metrics_snapshot_interval_seconds > 0:
+        app.state.metrics_snapshots = asyncio.create_task(
+            snapshot_loop(settings.metrics_snapshot_interval_seconds)
+        )
+
+@app.on_event("startup")
+async def start_stripe_event_processor():
+    settings = get_settings()
+    if settings.stripe_event_interval_seconds > 0:
+        app.state.stripe_events = asyncio.create_task(
+            stripe_event_loop(settings.stripe_event_interval_seconds)
+        )
+
+@app.on_event("startup")
+async def start_token_revocation_sync():
+    settings = get_settings()
+    if settings.token_revocation_sync_seconds > 0:
+        app.state.token_revocations = asyncio.create_task(
+            revocation_sync_loop(settings.token_revocation_sync_seconds)
+        )
+
+@app.on_event("startup")
+async def start_photo_recovery():
+    settings = get_settings()
+    if settings.maintenance_photo_sweep_interval_seconds > 0:
+        app.state.photo_recovery = asyncio.create_task(
+            photo_recovery_loop(settings.maintenance_photo_sweep_interval_seconds)
+        )
+
 # Health check endpoint
 @app.get("/")
 def read_root():
@@ -72,6 +129,11 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/health/cache")
+def cache_stats(current_user=Depends(get_current_operator)):
+    """Response cache hit ratio, size and eviction counters"""
+    return response_cache.stats()
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
@@ -89,3 +151,5 @@ app.include_router(documents.router, prefix="/api/v1")
 app.include_router(stripe_routes.router, prefix="/api/v1")
 app.include_router(notifications.router, prefix="/api/v1")
 app.include_router(messages.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
@@ -8,6 +8,14 @@ from app.models.tenant import Tenant, TenantStatus
 from app.models.payment import Payment, PaymentStatus
 from app.models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
 from app.models.announcement import Announcement, AnnouncementPriority
+from app.models.property_metrics import PropertyMetrics
+from app.models.property_snapshot import PropertySnapshot
+from app.models.scope_version import ScopeVersion
+from app.models.stripe_event import StripeEvent
+from app.models.stripe_reconciliation import StripeReconciliationRun
+from app.models.maintenance_photo import MaintenancePhoto, MaintenancePhotoStatus
+from app.models.announcement_read import AnnouncementRead
+from app.models.revoked_token import RevokedToken
 
 # This ensures all models are imported when we import from models
 __all__ = [
@@ -29,4 +37,13 @@ __all__ = [
     "MaintenanceStatus",
     "Announcement",
     "AnnouncementPriority",
+    "PropertyMetrics",
+    "PropertySnapshot",
+    "ScopeVersion",
+    "StripeEvent",
+    "StripeReconciliationRun",
+    "MaintenancePhoto",
+    "MaintenancePhotoStatus",
+    "AnnouncementRead",
+    "RevokedToken",
 ]
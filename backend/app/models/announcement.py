@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, Text, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -23,3 +23,13 @@ class Announcement(BaseModel):
     
     # Relationships
     property = relationship("Property", back_populates="announcements")
+
+
+# The tenant feed pages through a property's announcements newest first,
+# and the unread count scans the same range
+Index(
+    "ix_announcements_property_feed",
+    Announcement.property_id,
+    Announcement.created_at.desc(),
+    Announcement.id.desc(),
+)
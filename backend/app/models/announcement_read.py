@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class AnnouncementRead(Base):
+    """
+    An announcement a tenant has read. Unread is the absence of a row, so
+    posting an announcement writes nothing per tenant; the primary key
+    leads with the tenant for the unread count's anti-join.
+    """
+    __tablename__ = "announcement_reads"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    announcement_id = Column(UUID(as_uuid=True), ForeignKey("announcements.id", ondelete="CASCADE"),
+                             primary_key=True)
+    read_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text, Enum as SQLEnum, ARRAY, DateTime
+from sqlalchemy import Column, String, ForeignKey, Text, Enum as SQLEnum, ARRAY, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -37,3 +37,13 @@ class MaintenanceRequest(BaseModel):
     
     # Relationships
     property = relationship("Property", back_populates="maintenance_requests")
+
+
+# Work queue order: per status, most urgent first, then oldest first. Closed
+# history sits under its own status prefix, so it never slows the open queue.
+Index(
+    "ix_maintenance_requests_queue",
+    MaintenanceRequest.status,
+    MaintenanceRequest.priority.desc(),
+    MaintenanceRequest.created_at,
+)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import BaseModel
+
+
+class MaintenancePhotoStatus:
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class MaintenancePhoto(BaseModel):
+    """
+    A photo attached to a maintenance request. The original is stored as
+    uploaded; the thumbnail and WebP variants are filled in by the photo
+    worker pool, after which `status` becomes ready.
+    """
+    __tablename__ = "maintenance_photos"
+
+    request_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_requests.id", ondelete="CASCADE"),
+                        nullable=False, index=True)
+    uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+
+    original_key = Column(String(500), nullable=False)
+    mime_type = Column(String(100))
+    file_size = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+
+    # Storage keys of the generated variants
+    thumbnail_key = Column(String(500))  # JPEG, for clients without WebP
+    thumbnail_webp_key = Column(String(500))
+    display_webp_key = Column(String(500))  # Full-screen view; much lighter than a phone original
+
+    status = Column(String(20), nullable=False, default=MaintenancePhotoStatus.PROCESSING)
@@ -24,7 +24,7 @@ class Payment(BaseModel):
     paid_date = Column(Date)
     status = Column(SQLEnum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
     payment_method = Column(String(50))  # card, ach, manual
-    stripe_payment_id = Column(String(100))
+    stripe_payment_id = Column(String(100), index=True)
     late_fee = Column(Numeric(10, 2), default=0)
     
     # New fields for custom payment requests
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class PropertyMetrics(Base):
+    """
+    Per-property rollup read by the dashboards.
+    Kept current by PropertyMetricsService on every flush that touches the
+    property tree, payments or maintenance, and reconciled periodically.
+    """
+    __tablename__ = "property_metrics"
+
+    property_id = Column(UUID(as_uuid=True), ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+
+    # Occupancy
+    total_units = Column(Integer, nullable=False, default=0)
+    total_rooms = Column(Integer, nullable=False, default=0)
+    occupied_rooms = Column(Integer, nullable=False, default=0)
+    vacant_rooms = Column(Integer, nullable=False, default=0)
+
+    # Monthly rent roll
+    potential_monthly = Column(Numeric(12, 2), nullable=False, default=0)
+    actual_monthly = Column(Numeric(12, 2), nullable=False, default=0)
+
+    # Time-dependent figures below are relative to this day; rows from an
+    # earlier day are stale and get recomputed on read
+    as_of = Column(Date, nullable=False)
+
+    # Payments due in the month of `as_of`, plus all unpaid balances past due
+    collected_this_month = Column(Numeric(12, 2), nullable=False, default=0)
+    outstanding_this_month = Column(Numeric(12, 2), nullable=False, default=0)
+    overdue_amount = Column(Numeric(12, 2), nullable=False, default=0)
+
+    open_maintenance = Column(Integer, nullable=False, default=0)
+
+    # Active leases ending within 30/60/90 days of `as_of`
+    expiring_30 = Column(Integer, nullable=False, default=0)
+    expiring_60 = Column(Integer, nullable=False, default=0)
+    expiring_90 = Column(Integer, nullable=False, default=0)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class PropertySnapshot(Base):
+    """
+    One row per property per day, captured by PropertySnapshotService.
+    Room and tenant statuses are overwritten in place, so these rows are the
+    only record of how occupancy and revenue developed over time.
+    """
+    __tablename__ = "property_snapshots"
+
+    property_id = Column(UUID(as_uuid=True), ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    snapshot_date = Column(Date, primary_key=True, index=True)
+
+    total_rooms = Column(Integer, nullable=False, default=0)
+    occupied_rooms = Column(Integer, nullable=False, default=0)
+    vacant_rooms = Column(Integer, nullable=False, default=0)
+
+    # Monthly rent of occupied rooms
+    rent_roll = Column(Numeric(12, 2), nullable=False, default=0)
+
+    # Month-to-date payments collected and unpaid balances past due, as of `snapshot_date`
+    collected = Column(Numeric(12, 2), nullable=False, default=0)
+    overdue = Column(Numeric(12, 2), nullable=False, default=0)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class RevokedToken(Base):
+    """
+    Tokens refused before their expiry, keyed by the token's `jti`.
+
+    Access tokens land here on logout and are mirrored in memory by every
+    worker (app.services.tokens). Refresh tokens land here when rotated, so
+    each is used once, and a replayed one adds its whole family. Rows are
+    purged once `expires_at` passes, since the token is refused anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    token_type = Column(String(16), nullable=False)  # access, refresh or family
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
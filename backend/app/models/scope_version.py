@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ScopeVersion(Base):
+    """
+    Change counter per cache scope, e.g. "property:<id>" or "tenant:<id>".
+    Bumped by ScopeVersionService whenever a write touches the scope; ETags
+    for read endpoints are derived from it.
+    """
+    __tablename__ = "scope_versions"
+
+    scope = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class StripeEvent(Base):
+    """
+    Webhook events as received from Stripe, keyed by Stripe's event id so
+    retried deliveries are stored once. StripeEventService applies pending
+    rows in the order Stripe created them and stamps `processed_at`.
+    """
+    __tablename__ = "stripe_events"
+
+    id = Column(String(255), primary_key=True)  # evt_...
+    type = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    # Stripe's creation time (unix seconds); the processing order
+    created = Column(BigInteger, nullable=False)
+
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True))
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+
+    __table_args__ = (
+        # The processor only ever scans unprocessed rows
+        Index("ix_stripe_events_pending", "created", "id", postgresql_where=processed_at.is_(None)),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class StripeReconciliationRun(Base):
+    """
+    One pass of StripeReconciliationService over the PaymentIntents created
+    since the previous run's watermark, with what it changed and the
+    discrepancies it left for a person to look at.
+    """
+    __tablename__ = "stripe_reconciliation_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+
+    # PaymentIntents created at or after `listed_from` were listed; the next run starts from `watermark`
+    listed_from = Column(BigInteger, nullable=False)
+    watermark = Column(BigInteger, nullable=False)
+
+    intents_seen = Column(Integer, nullable=False, default=0)
+    payments_paid = Column(Integer, nullable=False, default=0)
+    payments_failed = Column(Integer, nullable=False, default=0)
+    discrepancies = Column(JSONB, nullable=False, default=list)
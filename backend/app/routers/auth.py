@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 
 from app.database import get_db
 from app.models.user import User
 from app.models.operator import Operator
 from app.schemas.user import UserCreate, UserResponse
+from app.services.passwords import hash_password, verify_password
+from app.services.rate_limit import rate_limited
+from app.services.tokens import TokenService
 from app.utils.auth import (
-    get_password_hash,
-    verify_password,
-    create_access_token,
+    Principal,
+    get_current_principal,
     get_current_user,
+    oauth2_scheme,
 )
 from app.config import get_settings
 
@@ -20,22 +25,22 @@ settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    """Register a new operator"""
-    # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Create user
-    hashed_password = get_password_hash(user.password)
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def _create_operator(db: Session, email: str, password_hash: str) -> User:
     db_user = User(
-        email=user.email,
-        password_hash=hashed_password,
+        email=email,
+        password_hash=password_hash,
         role='operator'
     )
     db.add(db_user)
@@ -47,15 +52,36 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     
     db.commit()
     db.refresh(db_user)
+    return db_user
+
+
+def _user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _store_password_hash(db: Session, user: User, password_hash: str):
+    user.password_hash = password_hash
+    db.commit()
+
+
+@router.post("/signup", dependencies=[Depends(rate_limited("signup", "email"))])
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
+    """Register a new operator"""
+    # Check if user already exists
+    if await run_in_threadpool(_email_registered, db, user.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
-    access_token = create_access_token(
-        data={"sub": db_user.email}, 
-        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
-    )
+    # Create user
+    hashed_password = await hash_password(user.password)
+    db_user = await run_in_threadpool(_create_operator, db, user.email, hashed_password)
+    
+    tokens = await run_in_threadpool(TokenService.issue, db, db_user)
     
     return {
-        "access_token": access_token,
-        "token_type": "bearer",
+        **tokens,
         "user": {
             "id": str(db_user.id),
             "email": db_user.email,
@@ -64,32 +90,53 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/login")
-def login(
+@router.post("/login", dependencies=[Depends(rate_limited("login", "username"))])
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """Login for operators and tenants"""
     # Find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(_user_by_email, db, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    matches, new_hash = await verify_password(form_data.password, user.password_hash) if user else (False, None)
+    if not matches:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Hashed at a previous BCRYPT_ROUNDS: keep the re-hash made while verifying
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, db, user, new_hash)
     
-    access_token = create_access_token(
-        data={"sub": user.email},  
-        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
-    )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return await run_in_threadpool(TokenService.issue, db, user)
+
+
+@router.post("/refresh")
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """Trade a refresh token for a new access/refresh pair; each refresh token works once"""
+    tokens = TokenService.rotate(db, body.refresh_token)
+    if tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return tokens
+
+
+@router.post("/logout")
+def logout(
+    body: LogoutRequest,
+    token: str = Depends(oauth2_scheme),
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Revoke the access token, and the session's refresh tokens when one is sent"""
+    TokenService.revoke(db, token, body.refresh_token)
+    return {"message": "Logged out"}
 
 
 @router.get("/me", response_model=UserResponse)
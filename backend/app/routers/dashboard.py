@@ -1,16 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from datetime import date
+from typing import Optional
 
 from app.database import get_db
 from app.models.user import User
 from app.models.property import Property
-from app.models.unit import Unit
-from app.models.room import Room, RoomStatus
+from app.models.property_metrics import PropertyMetrics
+from app.services.property_metrics import PropertyMetricsService, LEASE_EXPIRATION_WINDOWS, metrics_tags
+from app.services.property_snapshots import PropertySnapshotService, BUCKETS
+from app.services.response_cache import response_cache
+from app.services.scope_versions import scope_key
 from app.utils.auth import get_current_operator
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+def _operator_rollup_query(operator_id):
+    """Portfolio totals summed over the operator's property_metrics rows"""
+    def total(column):
+        return func.coalesce(func.sum(column), 0)
+
+    return select(
+        func.count(Property.id).label("total_properties"),
+        func.count(PropertyMetrics.property_id).filter(
+            PropertyMetrics.as_of == date.today()
+        ).label("current_rows"),
+        total(PropertyMetrics.total_units).label("total_units"),
+        total(PropertyMetrics.total_rooms).label("total_rooms"),
+        total(PropertyMetrics.occupied_rooms).label("occupied_rooms"),
+        total(PropertyMetrics.actual_monthly).label("actual_monthly"),
+        total(PropertyMetrics.collected_this_month).label("collected_this_month"),
+        total(PropertyMetrics.outstanding_this_month).label("outstanding_this_month"),
+        total(PropertyMetrics.overdue_amount).label("overdue_amount"),
+        total(PropertyMetrics.open_maintenance).label("open_maintenance"),
+        *[total(getattr(PropertyMetrics, f"expiring_{days}")).label(f"expiring_{days}")
+          for days in LEASE_EXPIRATION_WINDOWS],
+    ).select_from(Property).outerjoin(
+        PropertyMetrics, PropertyMetrics.property_id == Property.id
+    ).where(Property.operator_id == operator_id)
+
+
+def _lease_expirations(metrics) -> dict:
+    return {
+        f"next_{days}_days": getattr(metrics, f"expiring_{days}")
+        for days in LEASE_EXPIRATION_WINDOWS
+    }
+
 
 @router.get("/operator")
 def get_operator_dashboard(
@@ -18,44 +54,37 @@ def get_operator_dashboard(
     current_user: User = Depends(get_current_operator)
 ):
     """Get dashboard metrics for the operator across all properties"""
-    
+
     operator_id = current_user.operator.id
-    
-    # Get all properties for this operator
-    properties = db.query(Property).filter(
-        Property.operator_id == operator_id
-    ).all()
-    
-    property_ids = [p.id for p in properties]
-    
-    # Get all units for these properties
-    units = db.query(Unit).filter(
-        Unit.property_id.in_(property_ids)
-    ).all() if property_ids else []
-    
-    unit_ids = [u.id for u in units]
-    
-    # Get all rooms for these units
-    rooms = db.query(Room).filter(
-        Room.unit_id.in_(unit_ids)
-    ).all() if unit_ids else []
-    
-    # Calculate metrics
-    total_rooms = len(rooms)
-    occupied_rooms = len([r for r in rooms if r.status == RoomStatus.OCCUPIED])
-    
-    # Calculate total revenue from occupied rooms
-    total_revenue = sum(
-        float(r.rent_amount) for r in rooms if r.status == RoomStatus.OCCUPIED
+
+    def build():
+        property_ids = db.execute(
+            select(Property.id).where(Property.operator_id == operator_id)
+        ).scalars().all()
+        metrics = db.execute(_operator_rollup_query(operator_id)).one()
+        
+        # Rows are normally kept current on write; fill in any that are missing or from an earlier day
+        if metrics.current_rows < metrics.total_properties:
+            PropertyMetricsService.ensure_current(db, property_ids, [])
+            metrics = db.execute(_operator_rollup_query(operator_id)).one()
+
+        return {
+            "total_properties": metrics.total_properties,
+            "total_units": metrics.total_units,
+            "total_rooms": metrics.total_rooms,
+            "occupied_rooms": metrics.occupied_rooms,
+            "total_revenue": float(metrics.actual_monthly),
+            "collected_this_month": float(metrics.collected_this_month),
+            "outstanding_this_month": float(metrics.outstanding_this_month),
+            "overdue_amount": float(metrics.overdue_amount),
+            "open_maintenance": metrics.open_maintenance,
+            "lease_expirations": _lease_expirations(metrics),
+        }, metrics_tags(property_ids)
+
+    operator_scope = scope_key("operator", operator_id)
+    return response_cache.cached(
+        "dashboard-operator", operator_scope, build, params={"as_of": date.today()}, tags=[operator_scope]
     )
-    
-    return {
-        "total_properties": len(properties),
-        "total_units": len(units),
-        "total_rooms": total_rooms,
-        "occupied_rooms": occupied_rooms,
-        "total_revenue": total_revenue,
-    }
 
 
 @router.get("/property/{property_id}")
@@ -65,58 +94,101 @@ def get_property_dashboard(
     current_user: User = Depends(get_current_operator)
 ):
     """Get detailed dashboard metrics for a specific property"""
-    
-    # Verify property ownership
-    property = db.query(Property).filter(
-        Property.id == property_id,
-        Property.operator_id == current_user.operator.id
-    ).first()
-    
-    if not property:
-        from fastapi import HTTPException, status
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found"
+
+    def build():
+        query = select(Property.id, Property.name, PropertyMetrics).outerjoin(
+            PropertyMetrics, PropertyMetrics.property_id == Property.id
+        ).where(
+            Property.id == property_id,
+            Property.operator_id == current_user.operator.id
         )
-    
-    # Get units for this property
-    units = db.query(Unit).filter(Unit.property_id == property_id).all()
-    unit_ids = [u.id for u in units]
-    
-    # Get rooms for these units
-    rooms = db.query(Room).filter(
-        Room.unit_id.in_(unit_ids)
-    ).all() if unit_ids else []
-    
-    # Calculate metrics
-    total_rooms = len(rooms)
-    occupied_rooms = len([r for r in rooms if r.status == RoomStatus.OCCUPIED])
-    vacant_rooms = len([r for r in rooms if r.status == RoomStatus.VACANT])
-    
-    occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
-    
-    # Calculate revenue
-    potential_monthly = sum(float(r.rent_amount) for r in rooms)
-    actual_monthly = sum(
-        float(r.rent_amount) for r in rooms if r.status == RoomStatus.OCCUPIED
+        row = db.execute(query).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+
+        if PropertyMetricsService.ensure_current(db, [row.id], [row.PropertyMetrics] if row.PropertyMetrics else []):
+            row = db.execute(query).first()
+        metrics = row.PropertyMetrics
+
+        total_rooms = metrics.total_rooms
+        occupancy_rate = (metrics.occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
+
+        return {
+            "property": {
+                "id": str(row.id),
+                "name": row.name,
+            },
+            "units": {
+                "total": metrics.total_units,
+            },
+            "rooms": {
+                "total": total_rooms,
+                "occupied": metrics.occupied_rooms,
+                "vacant": metrics.vacant_rooms,
+                "occupancy_rate": round(occupancy_rate, 1),
+            },
+            "revenue": {
+                "potential_monthly": float(metrics.potential_monthly),
+                "actual_monthly": float(metrics.actual_monthly),
+                "collected_this_month": float(metrics.collected_this_month),
+                "outstanding_this_month": float(metrics.outstanding_this_month),
+                "overdue": float(metrics.overdue_amount),
+            },
+            "maintenance": {
+                "open": metrics.open_maintenance,
+            },
+            "lease_expirations": _lease_expirations(metrics),
+        }, [scope_key("property", row.id), *metrics_tags([row.id])]
+
+    # Keyed per operator, so another operator's request never reaches an entry built after the ownership check
+    return response_cache.cached(
+        "dashboard-property", scope_key("operator", current_user.operator.id), build,
+        params={"property_id": property_id, "as_of": date.today()},
     )
-    
+
+
+@router.get("/history")
+def get_dashboard_history(
+    start: date,
+    end: date,
+    bucket: str = "month",
+    property_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Get occupancy and revenue over time from the daily snapshots, downsampled to day/week/month buckets"""
+
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(BUCKETS)}"
+        )
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+
+    if property_id:
+        owned = db.query(Property.id).filter(
+            Property.id == property_id,
+            Property.operator_id == current_user.operator.id
+        ).first()
+        if not owned:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+
     return {
-        "property": {
-            "id": str(property.id),
-            "name": property.name,
-        },
-        "units": {
-            "total": len(units),
-        },
-        "rooms": {
-            "total": total_rooms,
-            "occupied": occupied_rooms,
-            "vacant": vacant_rooms,
-            "occupancy_rate": round(occupancy_rate, 1),
-        },
-        "revenue": {
-            "potential_monthly": potential_monthly,
-            "actual_monthly": actual_monthly,
-        },
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket": bucket,
+        "points": PropertySnapshotService.history(
+            db, current_user.operator.id, start, end, bucket, property_id
+        ),
     }
@@ -1,5 +1,6 @@
 # Update app/routers/documents.py
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -135,13 +136,18 @@ def get_property_documents(
             detail="Property not found"
         )
     
-    documents = db.query(Document).filter(
+    # Tenant names come from an outer join so documents without a tenant are kept
+    documents = db.query(Document, User).outerjoin(
+        Tenant, Tenant.id == Document.tenant_id
+    ).outerjoin(
+        User, User.id == Tenant.user_id
+    ).filter(
         Document.property_id == property_id
     ).order_by(Document.created_at.desc()).all()
     
     # Enrich with property and tenant names
     result = []
-    for doc in documents:
+    for doc, user in documents:
         doc_dict = {
             "id": doc.id,
             "property_id": doc.property_id,
@@ -159,13 +165,8 @@ def get_property_documents(
             "tenant_name": None
         }
         
-        if doc.tenant_id:
-            tenant = db.query(Tenant).filter(Tenant.id == doc.tenant_id).first()
-            if tenant:
-                from app.models.user import User
-                user = db.query(User).filter(User.id == tenant.user_id).first()
-                if user:
-                    doc_dict["tenant_name"] = f"{user.first_name} {user.last_name}".strip() or user.email
+        if user:
+            doc_dict["tenant_name"] = f"{user.first_name} {user.last_name}".strip() or user.email
         
         result.append(doc_dict)
     
@@ -178,49 +179,21 @@ def get_all_operator_documents(
 ):
     """Get all documents for operator's properties"""
     
-    # Get all operator's properties
-    properties = db.query(Property).filter(
+    # Property and tenant names come from the same query, so rows serialize straight through the response model
+    full_name = func.trim(func.coalesce(User.first_name, "") + " " + func.coalesce(User.last_name, ""))
+    return db.query(
+        *Document.__table__.columns,
+        Property.name.label("property_name"),
+        func.coalesce(func.nullif(full_name, ""), User.email).label("tenant_name"),
+    ).join(
+        Property, Property.id == Document.property_id
+    ).outerjoin(
+        Tenant, Tenant.id == Document.tenant_id
+    ).outerjoin(
+        User, User.id == Tenant.user_id
+    ).filter(
         Property.operator_id == current_user.operator.id
-    ).all()
-    
-    property_ids = [str(prop.id) for prop in properties]
-    
-    documents = db.query(Document).filter(
-        Document.property_id.in_(property_ids)
     ).order_by(Document.created_at.desc()).all()
-    
-    # Enrich with property and tenant names
-    result = []
-    for doc in documents:
-        property = next((p for p in properties if str(p.id) == str(doc.property_id)), None)
-        doc_dict = {
-            "id": doc.id,
-            "property_id": doc.property_id,
-            "tenant_id": doc.tenant_id,
-            "document_type": doc.document_type,
-            "title": doc.title,
-            "description": doc.description,
-            "filename": doc.filename,
-            "file_url": doc.file_url,
-            "file_size": doc.file_size,
-            "mime_type": doc.mime_type,
-            "visible_to_all_tenants": doc.visible_to_all_tenants,
-            "created_at": doc.created_at,
-            "property_name": property.name if property else "Unknown",
-            "tenant_name": None
-        }
-        
-        if doc.tenant_id:
-            tenant = db.query(Tenant).filter(Tenant.id == doc.tenant_id).first()
-            if tenant:
-                from app.models.user import User
-                user = db.query(User).filter(User.id == tenant.user_id).first()
-                if user:
-                    doc_dict["tenant_name"] = f"{user.first_name} {user.last_name}".strip() or user.email
-        
-        result.append(doc_dict)
-    
-    return result
 
 @router.delete("/{document_id}")
 def delete_document(
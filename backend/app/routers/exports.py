@@ -0,0 +1,192 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, func
+from datetime import date
+from typing import Optional
+
+from app.database import get_db
+from app.models.user import User
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room
+from app.models.tenant import Tenant, TenantStatus
+from app.models.payment import Payment, PaymentStatus
+from app.utils.auth import get_current_operator
+from app.utils.exports import csv_chunks, xlsx_chunks
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+# Rows fetched per round trip; with psycopg2 this is a server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _stream_rows(db: Session, query):
+    result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        for row in result:
+            yield row
+    finally:
+        result.close()
+
+
+def _export_response(name: str, fmt: str, header, rows) -> StreamingResponse:
+    filename = f"{name}-{date.today().isoformat()}.{fmt}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if fmt == "xlsx":
+        # Already deflated inside the zip container; the middleware leaves this content type alone
+        return StreamingResponse(xlsx_chunks(header, rows, sheet_name=name), media_type=MEDIA_TYPES[fmt], headers=headers)
+
+    # Compressed on the way out by CompressionMiddleware, one chunk at a time
+    return StreamingResponse(csv_chunks(header, rows), media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+def _check_format(fmt: str):
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unsupported export format: {fmt}"
+        )
+
+
+def _scope(db: Session, current_user: User, property_id: Optional[str]):
+    """Filter limiting rows to the operator's properties, or to one property after an ownership check"""
+    if property_id:
+        owned = db.query(Property.id).filter(
+            Property.id == property_id,
+            Property.operator_id == current_user.operator.id
+        ).first()
+        if not owned:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+        return Property.id == property_id
+    return Property.operator_id == current_user.operator.id
+
+
+def _parse_status(enum_type, value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return enum_type(value.lower())
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"status must be one of: {', '.join(s.value for s in enum_type)}"
+        )
+
+
+@router.get("/payments.{fmt}")
+def export_payments(
+    fmt: str,
+    property_id: Optional[str] = None,
+    payment_status: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """
+    Export payments with tenant and room details, optionally filtered by property, status and due date.
+    A payment belongs to the room it was charged for, so a tenant's earlier payments stay with the
+    property they were paid at after a move; payments without a room fall back to the tenant's room.
+    """
+    _check_format(fmt)
+    filters = [_scope(db, current_user, property_id)]
+    wanted_status = _parse_status(PaymentStatus, payment_status)
+    if wanted_status:
+        filters.append(Payment.status == wanted_status)
+    if start:
+        filters.append(Payment.due_date >= start)
+    if end:
+        filters.append(Payment.due_date <= end)
+
+    query = select(
+        Payment.due_date, Payment.paid_date, Property.name, Unit.unit_number, Room.room_number,
+        User.email, User.first_name, User.last_name, Payment.payment_type, Payment.description,
+        Payment.amount, Payment.late_fee, Payment.status, Payment.payment_method,
+    ).select_from(Payment).join(
+        Tenant, Tenant.id == Payment.tenant_id
+    ).join(
+        User, User.id == Tenant.user_id
+    ).outerjoin(
+        Room, Room.id == func.coalesce(Payment.room_id, Tenant.room_id)
+    ).outerjoin(
+        Unit, Unit.id == Room.unit_id
+    ).outerjoin(
+        Property, Property.id == Unit.property_id
+    ).where(*filters).order_by(Payment.due_date, Payment.id)
+
+    header = ["Due Date", "Paid Date", "Property", "Unit", "Room", "Tenant Email", "First Name", "Last Name",
+              "Type", "Description", "Amount", "Late Fee", "Status", "Payment Method"]
+    return _export_response("payments", fmt, header, _stream_rows(db, query))
+
+
+@router.get("/tenants.{fmt}")
+def export_tenants(
+    fmt: str,
+    property_id: Optional[str] = None,
+    tenant_status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Export tenants with their lease terms and current room"""
+    _check_format(fmt)
+    filters = [_scope(db, current_user, property_id)]
+    wanted_status = _parse_status(TenantStatus, tenant_status)
+    if wanted_status:
+        filters.append(Tenant.status == wanted_status)
+
+    query = select(
+        Property.name, Unit.unit_number, Room.room_number, User.email, User.first_name, User.last_name,
+        Tenant.status, Tenant.lease_start, Tenant.lease_end, Tenant.move_in_date,
+        Tenant.rent_amount, Tenant.deposit_paid,
+    ).select_from(Tenant).join(
+        User, User.id == Tenant.user_id
+    ).outerjoin(
+        Room, Room.id == Tenant.room_id
+    ).outerjoin(
+        Unit, Unit.id == Room.unit_id
+    ).outerjoin(
+        Property, Property.id == Unit.property_id
+    ).where(*filters).order_by(Property.name, Unit.unit_number, Room.room_number, Tenant.id)
+
+    header = ["Property", "Unit", "Room", "Email", "First Name", "Last Name", "Status",
+              "Lease Start", "Lease End", "Move-in Date", "Rent", "Deposit Paid"]
+    return _export_response("tenants", fmt, header, _stream_rows(db, query))
+
+
+@router.get("/rent-roll.{fmt}")
+def export_rent_roll(
+    fmt: str,
+    property_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Export every room with its rent and current active tenant, if any"""
+    _check_format(fmt)
+    filters = [_scope(db, current_user, property_id)]
+
+    query = select(
+        Property.name, Unit.unit_number, Unit.rental_type, Room.room_number, Room.room_type, Room.status,
+        Room.rent_amount, User.email, User.first_name, User.last_name, Tenant.rent_amount, Tenant.lease_end,
+    ).select_from(Room).join(
+        Unit, Unit.id == Room.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).outerjoin(
+        Tenant, and_(Tenant.room_id == Room.id, Tenant.status == TenantStatus.ACTIVE)
+    ).outerjoin(
+        User, User.id == Tenant.user_id
+    ).where(*filters).order_by(Property.name, Unit.unit_number, Room.room_number, Room.id)
+
+    header = ["Property", "Unit", "Rental Type", "Room", "Room Type", "Room Status", "Listed Rent",
+              "Tenant Email", "First Name", "Last Name", "Lease Rent", "Lease End"]
+    return _export_response("rent-roll", fmt, header, _stream_rows(db, query))
@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import and_, or_, case
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -6,11 +10,13 @@ from pydantic import BaseModel
 
 from app.database import get_db
 from app.models.user import User
-from app.models.maintenance import MaintenanceRequest
+from app.models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
 from app.models.room import Room
 from app.models.unit import Unit
 from app.models.property import Property
+from app.models.maintenance_photo import MaintenancePhoto
 from app.schemas.maintenance import MaintenanceRequestCreate, MaintenanceRequestUpdate, MaintenanceRequestResponse
+from app.services.maintenance_photos import MaintenancePhotoService, photo_detail, photo_thumbnail
 from app.utils.auth import get_current_operator
 
 router = APIRouter(prefix="/maintenance", tags=["Maintenance"])
@@ -22,6 +28,92 @@ class MaintenanceUpdateRequest(BaseModel):
     assigned_to_name: Optional[str] = None
 
 
+# Statuses shown in the queue unless the caller asks for others
+QUEUE_STATUSES = (MaintenanceStatus.OPEN.value, MaintenanceStatus.IN_PROGRESS.value)
+MAX_QUEUE_PAGE = 100
+
+_PRIORITY_RANK = {priority: rank for rank, priority in enumerate(MaintenancePriority)}
+
+
+def _priority_order(postgres: bool):
+    """
+    Postgres sorts the enum in declaration order (LOW .. URGENT), which the
+    queue index follows; elsewhere the stored names need an explicit rank.
+    """
+    if postgres:
+        return MaintenanceRequest.priority
+    return case(
+        *[(MaintenanceRequest.priority == priority, rank) for priority, rank in _PRIORITY_RANK.items()]
+    )
+
+
+def _encode_cursor(request: MaintenanceRequest) -> str:
+    position = [request.priority.value, request.created_at.isoformat(), str(request.id)]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _after_cursor(cursor: str, priority, postgres: bool):
+    """Rows after the cursor's position in (priority desc, created_at, id) order"""
+    try:
+        name, created_at, request_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        level = MaintenancePriority(name)
+        created_at = datetime.fromisoformat(created_at)
+        request_id = UUID(request_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    level = level if postgres else _PRIORITY_RANK[level]
+    return or_(
+        priority < level,
+        and_(priority == level, or_(
+            MaintenanceRequest.created_at > created_at,
+            and_(MaintenanceRequest.created_at == created_at, MaintenanceRequest.id > request_id),
+        )),
+    )
+
+
+def _request_dict(request, property_name, unit_number, room_number, assigned_email, reporter_email,
+                  photos=()) -> dict:
+    return {
+        "id": str(request.id),
+        "property_id": str(request.property_id),
+        "unit_id": str(request.unit_id),
+        "room_id": str(request.room_id) if request.room_id else None,
+        "title": request.title,
+        "description": request.description,
+        "priority": request.priority,
+        "status": request.status,
+        "assigned_to": assigned_email,
+        "created_at": request.created_at.isoformat(),
+        "resolved_at": request.resolved_at.isoformat() if request.resolved_at else None,
+        "property_name": property_name,
+        "unit_number": unit_number,
+        "room_number": room_number or "N/A",
+        "reporter_email": reporter_email,
+        "photos": list(photos),
+    }
+
+
+def _operator_request(db: Session, request_id, current_user: User) -> MaintenanceRequest:
+    """The request when it belongs to one of the operator's properties"""
+    request = db.query(MaintenanceRequest).join(
+        Property, Property.id == MaintenanceRequest.property_id
+    ).filter(
+        MaintenanceRequest.id == request_id,
+        Property.operator_id == current_user.operator.id
+    ).first()
+    
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+    return request
+
+
 @router.post("/", response_model=MaintenanceRequestResponse)
 def create_maintenance_request(
     request: MaintenanceRequestCreate,
@@ -91,36 +183,132 @@ def get_maintenance_by_property(
             detail="Property not found"
         )
     
-    # Get all maintenance requests for this property
-    request_records = db.query(MaintenanceRequest).filter(
+    # Get all maintenance requests for this property with unit, room and assignee in one query
+    request_records = db.query(
+        MaintenanceRequest, Unit.unit_number, Room.room_number, User.email
+    ).join(
+        Unit, Unit.id == MaintenanceRequest.unit_id
+    ).outerjoin(
+        Room, Room.id == MaintenanceRequest.room_id
+    ).outerjoin(
+        User, User.id == MaintenanceRequest.assigned_to
+    ).filter(
         MaintenanceRequest.property_id == property_id
     ).all()
+    photos = MaintenancePhotoService.thumbnails(db, [record[0].id for record in request_records])
+    
+    return [
+        _request_dict(request, property.name, unit_number, room_number, assigned_email, current_user.email,
+                      photos.get(request.id, ()))
+        for request, unit_number, room_number, assigned_email in request_records
+    ]
+
+
+@router.get("/queue")
+def get_maintenance_queue(
+    property_id: Optional[UUID] = None,
+    assigned_to: Optional[UUID] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Operator-wide work queue: most urgent first, then oldest, one page at a time"""
+    
+    statuses = [s.strip() for s in status_filter.split(",") if s.strip()] if status_filter else list(QUEUE_STATUSES)
+    valid = {s.value for s in MaintenanceStatus}
+    if any(s not in valid for s in statuses):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"status must be a comma-separated list of: {', '.join(sorted(valid))}"
+        )
+    if not 1 <= limit <= MAX_QUEUE_PAGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_QUEUE_PAGE}"
+        )
+    
+    postgres = db.get_bind().dialect.name == "postgresql"
+    priority = _priority_order(postgres)
+    query = db.query(
+        MaintenanceRequest, Property.name, Unit.unit_number, Room.room_number, User.email
+    ).join(
+        Property, Property.id == MaintenanceRequest.property_id
+    ).join(
+        Unit, Unit.id == MaintenanceRequest.unit_id
+    ).outerjoin(
+        Room, Room.id == MaintenanceRequest.room_id
+    ).outerjoin(
+        User, User.id == MaintenanceRequest.assigned_to
+    ).filter(
+        Property.operator_id == current_user.operator.id,
+        MaintenanceRequest.status.in_([MaintenanceStatus(s) for s in statuses])
+    )
+    if property_id:
+        query = query.filter(MaintenanceRequest.property_id == property_id)
+    if assigned_to:
+        query = query.filter(MaintenanceRequest.assigned_to == assigned_to)
+    if cursor:
+        query = query.filter(_after_cursor(cursor, priority, postgres))
+    
+    rows = query.order_by(
+        priority.desc(), MaintenanceRequest.created_at, MaintenanceRequest.id
+    ).limit(limit + 1).all()
+    
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = _encode_cursor(last)
+    photos = MaintenancePhotoService.thumbnails(db, [row[0].id for row in page])
+    
+    return {
+        "items": [
+            _request_dict(request, property_name, unit_number, room_number, assigned_email, current_user.email,
+                          photos.get(request.id, ()))
+            for request, property_name, unit_number, room_number, assigned_email in page
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/photos/{photo_id}")
+def get_maintenance_photo(
+    photo_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Full-size URLs for one photo; lists only carry thumbnails"""
+    photo = db.query(MaintenancePhoto).join(
+        MaintenanceRequest, MaintenanceRequest.id == MaintenancePhoto.request_id
+    ).join(
+        Property, Property.id == MaintenanceRequest.property_id
+    ).filter(
+        MaintenancePhoto.id == photo_id,
+        Property.operator_id == current_user.operator.id
+    ).first()
     
-    requests = []
-    for request in request_records:
-        room = db.query(Room).filter(Room.id == request.room_id).first() if request.room_id else None
-        unit = db.query(Unit).filter(Unit.id == request.unit_id).first()
-        assigned_user = db.query(User).filter(User.id == request.assigned_to).first() if request.assigned_to else None
-        
-        requests.append({
-            "id": str(request.id),
-            "property_id": str(request.property_id),
-            "unit_id": str(request.unit_id),
-            "room_id": str(request.room_id) if request.room_id else None,
-            "title": request.title,
-            "description": request.description,
-            "priority": request.priority,
-            "status": request.status,
-            "assigned_to": assigned_user.email if assigned_user else None,
-            "created_at": request.created_at.isoformat(),
-            "resolved_at": request.resolved_at.isoformat() if request.resolved_at else None,
-            "property_name": property.name,
-            "unit_number": unit.unit_number,
-            "room_number": room.room_number if room else "N/A",
-            "reporter_email": current_user.email,
-        })
-    
-    return requests
+    if not photo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo not found"
+        )
+    
+    return photo_detail(photo)
+
+
+@router.post("/{request_id}/photos")
+def upload_maintenance_photo(
+    request_id: UUID,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Attach a photo; thumbnails are generated in the background while it reports processing"""
+    request = _operator_request(db, request_id, current_user)
+    photo = MaintenancePhotoService.upload(db, request, file, current_user.id)
+    return photo_thumbnail(photo)
 
 
 @router.get("/{request_id}", response_model=MaintenanceRequestResponse)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy import or_, and_, func
-from typing import List
+from typing import Dict, List
 from datetime import datetime
 from app.database import get_db
 from app.models.user import User
@@ -113,6 +114,65 @@ def send_message(
     )
 
 
+def _display_name(user: User) -> str:
+    return f"{user.first_name} {user.last_name}" if user.first_name else user.email
+
+
+def _messages_by_tenant(db: Session, tenant_ids: List) -> Dict:
+    """Every message of the given tenants' conversations, oldest first, with sender and receiver in the same query"""
+    sender, receiver = aliased(User), aliased(User)
+    rows = db.query(Message, sender, receiver).join(
+        sender, sender.id == Message.sender_id
+    ).join(
+        receiver, receiver.id == Message.receiver_id
+    ).filter(
+        Message.tenant_id.in_(tenant_ids)
+    ).order_by(Message.created_at.asc()).all()
+    
+    conversations = defaultdict(list)
+    for row in rows:
+        conversations[row[0].tenant_id].append(row)
+    return conversations
+
+
+def _conversation(tenant_id, tenant_user: User, room_number, unit_number, property_name,
+                  rows: List, current_user: User) -> ConversationResponse:
+    messages = [
+        MessageResponse(
+            id=msg.id,
+            sender_id=msg.sender_id,
+            sender_role=msg.sender_role,
+            sender_name=_display_name(sender),
+            sender_email=sender.email,
+            receiver_id=msg.receiver_id,
+            receiver_role=msg.receiver_role,
+            receiver_name=_display_name(receiver),
+            receiver_email=receiver.email,
+            tenant_id=msg.tenant_id,
+            subject=msg.subject,
+            message=msg.message,
+            is_read=msg.is_read,
+            created_at=msg.created_at,
+            read_at=msg.read_at
+        )
+        for msg, sender, receiver in rows
+    ]
+    last_message = rows[-1][0]
+    
+    return ConversationResponse(
+        tenant_id=tenant_id,
+        tenant_name=_display_name(tenant_user),
+        tenant_email=tenant_user.email,
+        property_name=property_name or "N/A",
+        unit_number=unit_number or "N/A",
+        room_number=room_number or "N/A",
+        last_message=last_message.message,
+        last_message_time=last_message.created_at,
+        unread_count=sum(1 for msg, _, _ in rows if msg.receiver_id == current_user.id and not msg.is_read),
+        messages=messages
+    )
+
+
 @router.get("/conversations", response_model=List[ConversationResponse])
 def get_conversations(
     db: Session = Depends(get_db),
@@ -120,168 +180,48 @@ def get_conversations(
 ):
     """Get all conversations for the current user"""
     
+    # The tenant's room, unit and property come with the tenant row
+    tenants = db.query(Tenant.id, User, Room.room_number, Unit.unit_number, Property.name).join(
+        User, User.id == Tenant.user_id
+    ).outerjoin(
+        Room, Room.id == Tenant.room_id
+    ).outerjoin(
+        Unit, Unit.id == Room.unit_id
+    ).outerjoin(
+        Property, Property.id == Unit.property_id
+    )
+    
     if current_user.role == 'tenant':
         # Tenant sees their conversation with their operator
-        tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-        if not tenant:
+        tenants = tenants.filter(Tenant.user_id == current_user.id).all()
+        if not tenants:
             raise HTTPException(status_code=404, detail="Tenant not found")
-        
-        # Get all messages for this tenant
-        messages = db.query(Message).filter(
-            Message.tenant_id == tenant.id
-        ).order_by(Message.created_at.asc()).all()
-        
-        if not messages:
-            return []
-        
-        # Get tenant info
-        room = db.query(Room).filter(Room.id == tenant.room_id).first()
-        unit = db.query(Unit).filter(Unit.id == room.unit_id).first() if room else None
-        property_obj = db.query(Property).filter(Property.id == unit.property_id).first() if unit else None
-        
-        # Get unread count
-        unread_count = db.query(func.count(Message.id)).filter(
-            and_(
-                Message.tenant_id == tenant.id,
-                Message.receiver_id == current_user.id,
-                Message.is_read == False
-            )
-        ).scalar()
-        
-        # Format messages
-        formatted_messages = []
-        for msg in messages:
-            sender = db.query(User).filter(User.id == msg.sender_id).first()
-            receiver = db.query(User).filter(User.id == msg.receiver_id).first()
-            
-            sender_name = f"{sender.first_name} {sender.last_name}" if sender.first_name else sender.email
-            receiver_name = f"{receiver.first_name} {receiver.last_name}" if receiver.first_name else receiver.email
-            
-            formatted_messages.append(MessageResponse(
-                id=msg.id,
-                sender_id=msg.sender_id,
-                sender_role=msg.sender_role,
-                sender_name=sender_name,
-                sender_email=sender.email,
-                receiver_id=msg.receiver_id,
-                receiver_role=msg.receiver_role,
-                receiver_name=receiver_name,
-                receiver_email=receiver.email,
-                tenant_id=msg.tenant_id,
-                subject=msg.subject,
-                message=msg.message,
-                is_read=msg.is_read,
-                created_at=msg.created_at,
-                read_at=msg.read_at
-            ))
-        
-        return [ConversationResponse(
-            tenant_id=tenant.id,
-            tenant_name=f"{current_user.first_name} {current_user.last_name}" if current_user.first_name else current_user.email,
-            tenant_email=current_user.email,
-            property_name=property_obj.name if property_obj else "N/A",
-            unit_number=unit.unit_number if unit else "N/A",
-            room_number=room.room_number if room else "N/A",
-            last_message=messages[-1].message,
-            last_message_time=messages[-1].created_at,
-            unread_count=unread_count,
-            messages=formatted_messages
-        )]
     
     else:  # operator
         # Operator sees all conversations with their tenants
-        operator = db.query(Operator).filter(Operator.user_id == current_user.id).first()
+        operator = db.query(Operator.id).filter(Operator.user_id == current_user.id).first()
         if not operator:
             raise HTTPException(status_code=404, detail="Operator not found")
         
-        # Get all tenants for this operator's properties
-        properties = db.query(Property).filter(Property.operator_id == operator.id).all()
-        property_ids = [p.id for p in properties]
-        
-        units = db.query(Unit).filter(Unit.property_id.in_(property_ids)).all()
-        unit_ids = [u.id for u in units]
-        
-        rooms = db.query(Room).filter(Room.unit_id.in_(unit_ids)).all()
-        room_ids = [r.id for r in rooms]
-        
-        tenants = db.query(Tenant).filter(
-            and_(
-                Tenant.room_id.in_(room_ids),
-                Tenant.status == 'active'
-            )
+        tenants = tenants.filter(
+            Property.operator_id == operator.id,
+            Tenant.status == 'active'
         ).all()
-        
-        conversations = []
-        for tenant in tenants:
-            # Get messages for this tenant
-            messages = db.query(Message).filter(
-                Message.tenant_id == tenant.id
-            ).order_by(Message.created_at.asc()).all()
-            
-            if not messages:
-                continue
-            
-            # Get tenant user info
-            tenant_user = db.query(User).filter(User.id == tenant.user_id).first()
-            
-            # Get property info
-            room = db.query(Room).filter(Room.id == tenant.room_id).first()
-            unit = db.query(Unit).filter(Unit.id == room.unit_id).first() if room else None
-            property_obj = db.query(Property).filter(Property.id == unit.property_id).first() if unit else None
-            
-            # Get unread count
-            unread_count = db.query(func.count(Message.id)).filter(
-                and_(
-                    Message.tenant_id == tenant.id,
-                    Message.receiver_id == current_user.id,
-                    Message.is_read == False
-                )
-            ).scalar()
-            
-            # Format messages
-            formatted_messages = []
-            for msg in messages:
-                sender = db.query(User).filter(User.id == msg.sender_id).first()
-                receiver = db.query(User).filter(User.id == msg.receiver_id).first()
-                
-                sender_name = f"{sender.first_name} {sender.last_name}" if sender.first_name else sender.email
-                receiver_name = f"{receiver.first_name} {receiver.last_name}" if receiver.first_name else receiver.email
-                
-                formatted_messages.append(MessageResponse(
-                    id=msg.id,
-                    sender_id=msg.sender_id,
-                    sender_role=msg.sender_role,
-                    sender_name=sender_name,
-                    sender_email=sender.email,
-                    receiver_id=msg.receiver_id,
-                    receiver_role=msg.receiver_role,
-                    receiver_name=receiver_name,
-                    receiver_email=receiver.email,
-                    tenant_id=msg.tenant_id,
-                    subject=msg.subject,
-                    message=msg.message,
-                    is_read=msg.is_read,
-                    created_at=msg.created_at,
-                    read_at=msg.read_at
-                ))
-            
-            conversations.append(ConversationResponse(
-                tenant_id=tenant.id,
-                tenant_name=f"{tenant_user.first_name} {tenant_user.last_name}" if tenant_user.first_name else tenant_user.email,
-                tenant_email=tenant_user.email,
-                property_name=property_obj.name if property_obj else "N/A",
-                unit_number=unit.unit_number if unit else "N/A",
-                room_number=room.room_number if room else "N/A",
-                last_message=messages[-1].message,
-                last_message_time=messages[-1].created_at,
-                unread_count=unread_count,
-                messages=formatted_messages
-            ))
-        
-        # Sort by last message time
-        conversations.sort(key=lambda x: x.last_message_time, reverse=True)
-        
-        return conversations
+        if not tenants:
+            return []
+    
+    messages = _messages_by_tenant(db, [tenant_id for tenant_id, *_ in tenants])
+    conversations = [
+        _conversation(tenant_id, tenant_user, room_number, unit_number, property_name,
+                      messages[tenant_id], current_user)
+        for tenant_id, tenant_user, room_number, unit_number, property_name in tenants
+        if messages.get(tenant_id)
+    ]
+    
+    # Sort by last message time
+    conversations.sort(key=lambda x: x.last_message_time, reverse=True)
+    
+    return conversations
 
 
 @router.post("/mark-read/{message_id}")
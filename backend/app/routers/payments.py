@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
@@ -6,7 +7,7 @@ from dateutil.relativedelta import relativedelta
 
 from app.database import get_db
 from app.models.user import User
-from app.models.payment import Payment
+from app.models.payment import Payment, PaymentStatus
 from app.models.tenant import Tenant, TenantStatus
 from app.models.room import Room
 from app.models.unit import Unit
@@ -73,52 +74,62 @@ def get_payments_by_property(
             detail="Property not found"
         )
     
-    # Get all units for this property
-    units = db.query(Unit).filter(Unit.property_id == property_id).all()
-    unit_ids = [u.id for u in units]
-    
-    # Get all rooms for these units
-    rooms = db.query(Room).filter(Room.unit_id.in_(unit_ids)).all() if unit_ids else []
-    room_ids = [r.id for r in rooms]
+    # Payments of the property, placed by the room they were charged for like the dashboard rollups;
+    # custom charges without a room follow the tenant
+    charged_room_id = func.coalesce(Payment.room_id, Tenant.room_id)
+    property_payments = select(Payment.id).join(
+        Tenant, Tenant.id == Payment.tenant_id
+    ).join(
+        Room, Room.id == charged_room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).where(Unit.property_id == property_id)
+    
+    # Auto-update status to overdue if past due date and not paid, in one UPDATE.
+    # The dashboard rollups already count pending payments past due as overdue, so they need no refresh.
+    overdue = db.execute(
+        update(Payment).where(
+            Payment.id.in_(property_payments),
+            Payment.status == PaymentStatus.PENDING,
+            Payment.due_date < date.today()
+        ).values(status=PaymentStatus.OVERDUE).execution_options(synchronize_session=False)
+    )
     
-    # Get all tenants for these rooms
-    tenants = db.query(Tenant).filter(Tenant.room_id.in_(room_ids)).all() if room_ids else []
-    tenant_ids = [t.id for t in tenants]
+    # Payments with their tenant, user, room and unit in one query
+    rows = db.query(Payment, User, Room.room_number, Unit.unit_number).join(
+        Tenant, Tenant.id == Payment.tenant_id
+    ).join(
+        User, User.id == Tenant.user_id
+    ).join(
+        Room, Room.id == charged_room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).filter(Unit.property_id == property_id).all()
     
-    # Get all payments for these tenants with details
     payments = []
-    if tenant_ids:
-        payment_records = db.query(Payment).filter(Payment.tenant_id.in_(tenant_ids)).all()
-        
-        for payment in payment_records:
-            # Auto-update status to overdue if past due date and not paid
-            if payment.status == 'pending' and payment.due_date < date.today():
-                payment.status = 'overdue'
-                db.commit()
-            
-            tenant = db.query(Tenant).filter(Tenant.id == payment.tenant_id).first()
-            user = db.query(User).filter(User.id == tenant.user_id).first()
-            room = db.query(Room).filter(Room.id == tenant.room_id).first()
-            unit = db.query(Unit).filter(Unit.id == room.unit_id).first()
-            
-            payments.append({
-                "id": str(payment.id),
-                "tenant_id": str(payment.tenant_id),
-                "amount": str(payment.amount),
-                "payment_date": payment.paid_date.isoformat() if payment.paid_date else None,
-                "payment_method": payment.payment_method,
-                "status": payment.status,
-                "due_date": payment.due_date.isoformat(),
-                "created_at": payment.created_at.isoformat(),
-                "payment_type": payment.payment_type if payment.payment_type else "rent",
-                "description": payment.description,
-                "tenant_email": user.email,
-                "tenant_first_name": user.first_name,
-                "tenant_last_name": user.last_name,
-                "room_number": room.room_number,
-                "unit_number": unit.unit_number,
-                "property_name": property.name,
-            })
+    for payment, user, room_number, unit_number in rows:
+        payments.append({
+            "id": str(payment.id),
+            "tenant_id": str(payment.tenant_id),
+            "amount": str(payment.amount),
+            "payment_date": payment.paid_date.isoformat() if payment.paid_date else None,
+            "payment_method": payment.payment_method,
+            "status": payment.status,
+            "due_date": payment.due_date.isoformat(),
+            "created_at": payment.created_at.isoformat(),
+            "payment_type": payment.payment_type if payment.payment_type else "rent",
+            "description": payment.description,
+            "tenant_email": user.email,
+            "tenant_first_name": user.first_name,
+            "tenant_last_name": user.last_name,
+            "room_number": room_number,
+            "unit_number": unit_number,
+            "property_name": property.name,
+        })
+    
+    # After the rows are read, so the commit does not expire what they were built from
+    if overdue.rowcount:
+        db.commit()
     
     return payments
 
@@ -241,68 +252,58 @@ def generate_recurring_payments(
     """
     
     # Get all properties for this operator
-    properties = db.query(Property).filter(
+    has_properties = db.query(Property.id).filter(
         Property.operator_id == current_user.operator.id
-    ).all()
+    ).first()
     
-    if not properties:
+    if not has_properties:
         return {"message": "No properties found", "created": 0}
     
-    property_ids = [p.id for p in properties]
-    
-    # Get all units for these properties
-    units = db.query(Unit).filter(Unit.property_id.in_(property_ids)).all()
-    unit_ids = [u.id for u in units]
-    
-    # Get all rooms for these units
-    rooms = db.query(Room).filter(Room.unit_id.in_(unit_ids)).all()
-    room_ids = [r.id for r in rooms]
-    
-    # Get all active tenants
-    tenants = db.query(Tenant).filter(
-        Tenant.room_id.in_(room_ids),
+    # Active tenants with their room's rent, in one query
+    tenants = db.query(
+        Tenant.id, Tenant.lease_start, Tenant.lease_end, Room.id.label("room_id"), Room.rent_amount
+    ).join(
+        Room, Room.id == Tenant.room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).filter(
+        Property.operator_id == current_user.operator.id,
         Tenant.status == TenantStatus.ACTIVE
     ).all()
     
     if not tenants:
         return {"message": "No active tenants found", "created": 0}
     
-    payments_created = 0
+    # Rent already on the books, fetched once instead of checked month by month
+    existing = set(db.query(Payment.tenant_id, Payment.due_date).filter(
+        Payment.tenant_id.in_([tenant.id for tenant in tenants]),
+        Payment.payment_type == 'rent'
+    ).all())
+    
+    new_payments = []
     
     for tenant in tenants:
-        # Get tenant's room to get rent amount
-        room = db.query(Room).filter(Room.id == tenant.room_id).first()
-        if not room or not room.rent_amount:
-            continue
-        
         # Generate payments from lease_start to lease_end
-        if not tenant.lease_start or not tenant.lease_end:
+        if not tenant.rent_amount or not tenant.lease_start or not tenant.lease_end:
             continue
         
         current_date = tenant.lease_start
         
         while current_date <= tenant.lease_end:
             # Check if payment already exists for this month
-            existing_payment = db.query(Payment).filter(
-                Payment.tenant_id == tenant.id,
-                Payment.due_date == current_date,
-                Payment.payment_type == 'rent'
-            ).first()
-            
-            if not existing_payment:
-                # Create new payment
-                new_payment = Payment(
+            if (tenant.id, current_date) not in existing:
+                new_payments.append(Payment(
                     tenant_id=tenant.id,
-                    room_id=room.id,
-                    amount=room.rent_amount,
+                    room_id=tenant.room_id,
+                    amount=tenant.rent_amount,
                     due_date=current_date,
                     status='pending',
                     payment_type='rent',
                     payment_method='manual',
                     late_fee=0
-                )
-                db.add(new_payment)
-                payments_created += 1
+                ))
             
             # Move to next month
             if current_date.month == 12:
@@ -310,7 +311,10 @@ def generate_recurring_payments(
             else:
                 current_date = current_date.replace(month=current_date.month + 1)
     
+    # Inserted in batches rather than one statement per payment
+    db.add_all(new_payments)
     db.commit()
+    payments_created = len(new_payments)
     
     return {
         "message": f"Successfully generated {payments_created} payment records",
@@ -1,6 +1,6 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -11,7 +11,10 @@ from app.models.room import Room
 from app.models.tenant import Tenant, TenantStatus
 from app.models.payment import Payment
 from app.schemas.property import PropertyCreate, PropertyUpdate, PropertyResponse
+from app.services.response_cache import response_cache
+from app.services.scope_versions import ScopeVersionService, scope_key
 from app.utils.auth import get_current_operator
+from app.utils.conditional import conditional_response
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
@@ -32,14 +35,27 @@ def create_property(
 
 @router.get("/", response_model=List[PropertyResponse])
 def get_properties(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_operator)
 ):
     """Get all properties for the current operator"""
-    properties = db.query(Property).filter(
-        Property.operator_id == current_user.operator.id
-    ).all()
-    return properties
+    operator_scope = scope_key("operator", current_user.operator.id)
+    # One read serves the ETag and the cache key, so the body served always matches the tag
+    versions = ScopeVersionService.versions(db, [operator_scope])
+    not_modified = conditional_response(request, response, ScopeVersionService.etag_for("properties", versions))
+    if not_modified:
+        return not_modified
+
+    def build():
+        properties = db.query(Property).filter(
+            Property.operator_id == current_user.operator.id
+        ).all()
+        return [PropertyResponse.model_validate(p).model_dump(mode="json") for p in properties]
+
+    return response_cache.cached("properties", operator_scope, build, tags=[operator_scope],
+                                 headers=response.headers, versions=versions)
 
 
 @router.get("/{property_id}", response_model=PropertyResponse)
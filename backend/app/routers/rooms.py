@@ -2,15 +2,19 @@ from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, update
 
 from app.database import get_db
 from app.models.user import User
 from app.models.property import Property
 from app.models.unit import Unit
 from app.models.room import Room
-from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse
+from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse, RoomRentUpdate
 from app.models.tenant import Tenant, TenantStatus
 from app.models.payment import Payment
+from app.services.property_metrics import PropertyMetricsService, metrics_tags
+from app.services.response_cache import response_cache, invalidate_on_commit
+from app.services.scope_versions import ScopeVersionService, scope_key
 from app.utils.auth import get_current_operator
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
@@ -58,75 +62,139 @@ def create_room(
     return room
 
 
-@router.get("/unit/{unit_id}")
-def get_rooms_by_unit(
-    unit_id: UUID,
+@router.post("/bulk-rent")
+def update_rents_bulk(
+    rent_data: RoomRentUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_operator)
 ):
-    """Get all rooms for a specific unit with tenant information"""
-    
-    # Get unit and verify access
-    unit = db.query(Unit).filter(Unit.id == unit_id).first()
+    """Set or adjust the rent of many rooms with a single UPDATE"""
     
-    if not unit:
+    if (rent_data.rent_amount is None) == (rent_data.percent_change is None):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Unit not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of rent_amount or percent_change"
         )
     
-    # Verify operator owns the property
-    property = db.query(Property).filter(
-        Property.id == unit.property_id,
+    room_ids = set(rent_data.room_ids)
+    if not room_ids:
+        return {"updated": 0}
+    
+    # One ownership check for every room in the request
+    owned = db.query(Room.id, Unit.property_id).join(
+        Unit, Unit.id == Room.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).filter(
+        Room.id.in_(room_ids),
         Property.operator_id == current_user.operator.id
-    ).first()
+    ).all()
     
-    if not property:
+    if len(owned) != len(room_ids):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this unit"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more rooms not found or you don't have access"
         )
     
-    rooms = db.query(Room).filter(Room.unit_id == unit_id).all()
+    if rent_data.rent_amount is not None:
+        new_rent = rent_data.rent_amount
+    else:
+        new_rent = func.round(Room.rent_amount * (1 + rent_data.percent_change / 100), 2)
+    
+    result = db.execute(
+        update(Room).where(Room.id.in_(room_ids)).values(rent_amount=new_rent)
+        .execution_options(synchronize_session=False)
+    )
+    
+    # Set-based UPDATEs skip the flush hooks, so refresh the dashboard rollups and cache versions directly
+    property_ids = {property_id for _, property_id in owned}
+    PropertyMetricsService.refresh(db.connection(), property_ids)
+    invalidate_on_commit(db, metrics_tags(property_ids))
+    ScopeVersionService.touch(db, [scope_key("property", property_id) for property_id in property_ids])
+    db.commit()
     
-    # Add tenant information to each room
-    rooms_with_tenants = []
-    for room in rooms:
-        # Get tenant in this room (if any)
-        tenant = db.query(Tenant).filter(
-            Tenant.room_id == room.id,
-            Tenant.status == TenantStatus.ACTIVE
+    return {"updated": result.rowcount}
+
+
+@router.get("/unit/{unit_id}")
+def get_rooms_by_unit(
+    unit_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Get all rooms for a specific unit with tenant information"""
+
+    def build():
+        # Get unit and verify access
+        unit = db.query(Unit).filter(Unit.id == unit_id).first()
+
+        if not unit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Unit not found"
+            )
+
+        # Verify operator owns the property
+        property = db.query(Property).filter(
+            Property.id == unit.property_id,
+            Property.operator_id == current_user.operator.id
         ).first()
-        
-        room_data = {
-            "id": str(room.id),
-            "room_number": room.room_number,
-            "room_type": room.room_type,
-            "rent_amount": room.rent_amount,
-            "size_sqft": room.size_sqft,
-            "has_private_bath": room.has_private_bath,
-            "status": room.status,
-            "unit_id": str(room.unit_id),
-            "created_at": room.created_at,
-            "updated_at": room.updated_at,
-            "tenant": None
-        }
-        
-        if tenant:
-            user = db.query(User).filter(User.id == tenant.user_id).first()
-            room_data["tenant"] = {
-                "id": str(tenant.id),
-                "first_name": getattr(user, 'first_name', None) or "Unknown",
-                "last_name": getattr(user, 'last_name', None) or "User", 
-                "email": user.email,
-                "lease_start": tenant.lease_start,
-                "lease_end": tenant.lease_end,
-                "status": tenant.status
+
+        if not property:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this unit"
+            )
+
+        # Load rooms together with their active tenant (if any) in one query
+        rows = db.query(Room, Tenant, User).outerjoin(
+            Tenant, and_(Tenant.room_id == Room.id, Tenant.status == TenantStatus.ACTIVE)
+        ).outerjoin(
+            User, User.id == Tenant.user_id
+        ).filter(
+            Room.unit_id == unit_id
+        ).all()
+
+        # Add tenant information to each room
+        rooms_with_tenants = []
+        seen_room_ids = set()
+        for room, tenant, user in rows:
+            if room.id in seen_room_ids:
+                continue
+            seen_room_ids.add(room.id)
+
+            room_data = {
+                "id": str(room.id),
+                "room_number": room.room_number,
+                "room_type": room.room_type,
+                "rent_amount": room.rent_amount,
+                "size_sqft": room.size_sqft,
+                "has_private_bath": room.has_private_bath,
+                "status": room.status,
+                "unit_id": str(room.unit_id),
+                "created_at": room.created_at,
+                "updated_at": room.updated_at,
+                "tenant": None
             }
-        
-        rooms_with_tenants.append(room_data)
-    
-    return rooms_with_tenants
+
+            if tenant:
+                room_data["tenant"] = {
+                    "id": str(tenant.id),
+                    "first_name": getattr(user, 'first_name', None) or "Unknown",
+                    "last_name": getattr(user, 'last_name', None) or "User", 
+                    "email": user.email,
+                    "lease_start": tenant.lease_start,
+                    "lease_end": tenant.lease_end,
+                    "status": tenant.status
+                }
+
+            rooms_with_tenants.append(room_data)
+
+        return rooms_with_tenants, [scope_key("property", unit.property_id)]
+
+    return response_cache.cached(
+        "rooms-by-unit", scope_key("operator", current_user.operator.id), build, params={"unit_id": unit_id}
+    )
 
 
 @router.get("/{room_id}", response_model=RoomResponse)
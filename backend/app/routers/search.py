@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.models.user import User
+from app.services.search import SearchService, SEARCH_TYPES
+from app.utils.auth import get_current_operator
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+MAX_RESULTS_PER_TYPE = 50
+
+
+@router.get("")
+def search(
+    q: str,
+    types: Optional[str] = None,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Search the operator's tenants, rooms, messages, maintenance requests and documents"""
+
+    wanted = [t.strip() for t in types.split(",") if t.strip()] if types else list(SEARCH_TYPES)
+    unknown = [t for t in wanted if t not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"types must be a comma-separated list of: {', '.join(SEARCH_TYPES)}"
+        )
+    if not 1 <= limit <= MAX_RESULTS_PER_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_RESULTS_PER_TYPE}"
+        )
+
+    return {
+        "query": q,
+        "results": SearchService.search(db, current_user, q, wanted, limit),
+    }
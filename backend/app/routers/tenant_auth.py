@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from app.database import get_db
 from app.models.user import User
-from app.utils.auth import get_password_hash, create_access_token
+from app.services.passwords import hash_password
+from app.services.rate_limit import rate_limited
+from app.services.tokens import TokenService
 from typing import Optional
 
 router = APIRouter(prefix="/tenant-auth", tags=["Tenant Authentication"])
@@ -25,7 +28,9 @@ class TenantSignupRequest(BaseModel):
 class TenantSignupResponse(BaseModel):
     message: str
     access_token: str
+    refresh_token: str
     token_type: str
+    expires_in: int
 
 @router.post("/check-email", response_model=CheckEmailResponse)
 def check_tenant_eligibility(
@@ -58,8 +63,23 @@ def check_tenant_eligibility(
         message="Email found! You can create your account."
     )
 
-@router.post("/signup", response_model=TenantSignupResponse)
-def tenant_signup(
+def _pending_tenant(db: Session, email: str):
+    return db.query(User).filter(
+        User.email == email,
+        User.role == 'tenant',
+        User.is_activated == False
+    ).first()
+
+
+def _activate(db: Session, user: User, password_hash: str):
+    user.password_hash = password_hash
+    user.is_activated = True
+    db.commit()
+
+
+@router.post("/signup", response_model=TenantSignupResponse,
+             dependencies=[Depends(rate_limited("signup", "email"))])
+async def tenant_signup(
     signup_data: TenantSignupRequest,
     db: Session = Depends(get_db)
 ):
@@ -78,11 +98,7 @@ def tenant_signup(
         )
     
     # Find pending tenant user
-    user = db.query(User).filter(
-        User.email == signup_data.email,
-        User.role == 'tenant',
-        User.is_activated == False
-    ).first()
+    user = await run_in_threadpool(_pending_tenant, db, signup_data.email)
     
     if not user:
         raise HTTPException(
@@ -91,16 +107,9 @@ def tenant_signup(
         )
     
     # Activate the account
-    user.password_hash = get_password_hash(signup_data.password)
-    user.is_activated = True
-    
-    db.commit()
+    password_hash = await hash_password(signup_data.password)
+    await run_in_threadpool(_activate, db, user, password_hash)
     
-    # Create access token
-    access_token = create_access_token(data={"sub": user.email})
+    tokens = await run_in_threadpool(TokenService.issue, db, user)
     
-    return TenantSignupResponse(
-        message="Account activated successfully",
-        access_token=access_token,
-        token_type="bearer"
-    )
+    return TenantSignupResponse(message="Account activated successfully", **tokens)
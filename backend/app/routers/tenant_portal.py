@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
+from uuid import UUID
 from app.models.document import Document  # Add this
 from app.services.file_storage import file_storage  # Add this
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, literal, select
 
-from app.database import get_db
+from app.database import get_db, dialect_insert
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.room import Room
@@ -15,33 +19,84 @@ from app.models.unit import Unit
 from app.models.property import Property
 from app.models.payment import Payment
 from app.models.maintenance import MaintenanceRequest
+from app.models.maintenance_photo import MaintenancePhoto
 from app.models.announcement import Announcement
-from app.utils.auth import get_current_user
+from app.models.announcement_read import AnnouncementRead
+from app.schemas.payment import TenantPaymentResponse
+from app.services.maintenance_photos import MaintenancePhotoService, photo_detail, photo_thumbnail
+from app.services.scope_versions import ScopeVersionService, scope_key
+from app.services.tenant_bootstrap import TenantBootstrapService, TenantContext, unread_announcement_count
+from app.utils.auth import Principal, get_current_principal
+from app.utils.conditional import conditional_response
 
 router = APIRouter(prefix="/tenants/me", tags=["Tenant Portal"])
 
 
 def get_current_tenant(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    principal: Principal = Depends(get_current_principal)
 ) -> Tenant:
-    """Get the current tenant from the authenticated user"""
-    if current_user.role != 'tenant':
+    """
+    Get the current tenant from the token's tenant claim, with the property
+    of their room resolved in the same query as `tenant.property_id`
+    (None without a room)
+    """
+    if principal.role != 'tenant':
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Tenant role required."
         )
     
-    tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-    if not tenant:
+    # Tokens without the claim still name the user
+    owner = Tenant.id == principal.tenant_id if principal.tenant_id else Tenant.user_id == principal.id
+    row = db.query(Tenant, Unit.property_id).outerjoin(
+        Room, Room.id == Tenant.room_id
+    ).outerjoin(
+        Unit, Unit.id == Room.unit_id
+    ).filter(owner).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tenant profile not found"
         )
     
+    tenant, tenant.property_id = row
     return tenant
 
 
+# ============ ANNOUNCEMENT FEED ============
+
+FEED_PAGE = 20
+MAX_FEED_PAGE = 100
+# Bumped when a tenant marks announcements read, so feed ETags follow read state
+READS_SCOPE = "announcement-reads"
+
+
+class AnnouncementReadRequest(BaseModel):
+    announcement_ids: List[UUID] = []
+    all: bool = False
+
+
+def _feed_cursor(announcement: Announcement) -> str:
+    position = [announcement.created_at.isoformat(), str(announcement.id)]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _feed_position(cursor: str):
+    try:
+        created_at, announcement_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(announcement_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _unread_count(db: Session, tenant: Tenant) -> int:
+    return unread_announcement_count(db, tenant.id, tenant.property_id)
+
+
 @router.get("/")
 @router.get("/profile")
 def get_my_profile(
@@ -59,8 +114,28 @@ def get_my_profile(
     }
 
 
+@router.get("/bootstrap")
+async def get_my_bootstrap(
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Portal home screen in one request: recent items and counts from every section"""
+    context = TenantContext(
+        tenant_id=tenant.id,
+        user_id=tenant.user_id,
+        room_id=tenant.room_id,
+        property_id=tenant.property_id,
+    )
+    bind = db.get_bind()
+    # The sections use connections of their own; return this one to the pool first
+    db.close()
+    return await TenantBootstrapService.load(bind, context)
+
+
 @router.get("/lease")
 def get_my_lease(
+    request: Request,
+    response: Response,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
@@ -73,20 +148,29 @@ def get_my_lease(
             detail="No active lease found. You may have moved out."
         )
     
-    room = db.query(Room).filter(Room.id == tenant.room_id).first()
-    if not room:
+    property_id = tenant.property_id
+    if not property_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
-        
-    unit = db.query(Unit).filter(Unit.id == room.unit_id).first()
-    property = db.query(Property).filter(Property.id == unit.property_id).first()
+
+    not_modified = conditional_response(request, response, ScopeVersionService.etag(
+        db, "lease", scope_key("tenant", tenant.id), scope_key("property", property_id)
+    ))
+    if not_modified:
+        return not_modified
+
+    room_number, unit_number, property_name = db.query(
+        Room.room_number, Unit.unit_number, Property.name
+    ).join(Unit, Unit.id == Room.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).filter(Room.id == tenant.room_id).one()
     
     return {
-        "property_name": property.name,
-        "unit_number": unit.unit_number,
-        "room_number": room.room_number,
+        "property_name": property_name,
+        "unit_number": unit_number,
+        "room_number": room_number,
         "lease_start": tenant.lease_start,
         "lease_end": tenant.lease_end,
         "rent_amount": tenant.rent_amount,
@@ -94,7 +178,7 @@ def get_my_lease(
     }
 
 
-@router.get("/payments")
+@router.get("/payments", response_model=List[TenantPaymentResponse])
 def get_my_payments(
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
@@ -125,18 +209,7 @@ def get_my_payments(
         Payment.tenant_id == tenant.id
     ).order_by(Payment.due_date.desc()).all()
     
-    return [{
-        "id": str(payment.id),
-        "amount": str(payment.amount),
-        "due_date": payment.due_date.isoformat(),
-        "paid_date": payment.paid_date.isoformat() if payment.paid_date else None,
-        "status": payment.status.lower(),
-        "payment_method": payment.payment_method,
-        "late_fee": str(payment.late_fee) if payment.late_fee else "0.00",
-        "created_at": payment.created_at.isoformat(),
-        "payment_type": payment.payment_type if payment.payment_type else "rent",
-        "description": payment.description
-    } for payment in payments]
+    return payments
 
 
 @router.get("/maintenance")
@@ -150,6 +223,7 @@ def get_my_maintenance_requests(
     requests = db.query(MaintenanceRequest).filter(
         MaintenanceRequest.room_id == room.id
     ).order_by(MaintenanceRequest.created_at.desc()).all()
+    photos = MaintenancePhotoService.thumbnails(db, [request.id for request in requests])
     
     return [
         {
@@ -161,11 +235,57 @@ def get_my_maintenance_requests(
             "created_at": request.created_at.isoformat(),
             "resolved_at": request.resolved_at.isoformat() if request.resolved_at else None,
             "assigned_to": str(request.assigned_to) if request.assigned_to else None,
+            "photos": photos.get(request.id, []),
         }
         for request in requests
     ]
 
 
+@router.post("/maintenance/{request_id}/photos")
+def upload_maintenance_photo(
+    request_id: UUID,
+    file: UploadFile = File(...),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Attach a photo to one of the tenant's maintenance requests"""
+    # Without a room, `room_id == NULL` would match every common-area request
+    if tenant.room_id is None:
+        raise HTTPException(status_code=404, detail="Maintenance request not found")
+    
+    request = db.query(MaintenanceRequest).filter(
+        MaintenanceRequest.id == request_id,
+        MaintenanceRequest.room_id == tenant.room_id
+    ).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="Maintenance request not found")
+    
+    photo = MaintenancePhotoService.upload(db, request, file, tenant.user_id)
+    return photo_thumbnail(photo)
+
+
+@router.get("/maintenance/photos/{photo_id}")
+def get_maintenance_photo(
+    photo_id: UUID,
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Full-size URLs for a photo on one of the tenant's requests"""
+    if tenant.room_id is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    
+    photo = db.query(MaintenancePhoto).join(
+        MaintenanceRequest, MaintenanceRequest.id == MaintenancePhoto.request_id
+    ).filter(
+        MaintenancePhoto.id == photo_id,
+        MaintenanceRequest.room_id == tenant.room_id
+    ).first()
+    if not photo:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    
+    return photo_detail(photo)
+
+
 @router.post("/maintenance")
 def create_maintenance_request(
     request_data: dict,
@@ -203,41 +323,141 @@ def create_maintenance_request(
 
 @router.get("/announcements")
 def get_my_announcements(
+    request: Request,
+    response: Response,
+    limit: int = FEED_PAGE,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
-    """Get announcements for tenant's property"""
-    room = db.query(Room).filter(Room.id == tenant.room_id).first()
-    unit = db.query(Unit).filter(Unit.id == room.unit_id).first()
+    """
+    Announcement feed for the tenant's property, newest first, with read state.
+    `cursor` pages back through older announcements; `since` (a previous
+    `newest_cursor`) returns only those posted after it, so a poll does not
+    resend the whole feed.
+    """
+    if not 1 <= limit <= MAX_FEED_PAGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_FEED_PAGE}"
+        )
+    older_than = _feed_position(cursor) if cursor else None
+    newer_than = _feed_position(since) if since else None
+
+    property_id = tenant.property_id
+    if not property_id:
+        return {"items": [], "next_cursor": None, "newest_cursor": since}
+
+    not_modified = conditional_response(request, response, ScopeVersionService.etag(
+        db, f"announcements|{limit}|{cursor}|{since}",
+        scope_key("property", property_id), scope_key(READS_SCOPE, tenant.id)
+    ))
+    if not_modified:
+        return not_modified
+    
+    # Read state comes from the same query as the page
+    query = db.query(Announcement, AnnouncementRead.read_at).outerjoin(
+        AnnouncementRead, and_(
+            AnnouncementRead.announcement_id == Announcement.id,
+            AnnouncementRead.tenant_id == tenant.id
+        )
+    ).filter(Announcement.property_id == property_id)
+    if older_than:
+        created_at, announcement_id = older_than
+        query = query.filter(or_(
+            Announcement.created_at < created_at,
+            and_(Announcement.created_at == created_at, Announcement.id < announcement_id),
+        ))
+    if newer_than:
+        created_at, announcement_id = newer_than
+        query = query.filter(or_(
+            Announcement.created_at > created_at,
+            and_(Announcement.created_at == created_at, Announcement.id > announcement_id),
+        ))
+    
+    rows = query.order_by(Announcement.created_at.desc(), Announcement.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
     
-    announcements = db.query(Announcement).filter(
-        Announcement.property_id == unit.property_id
-    ).order_by(Announcement.created_at.desc()).limit(20).all()
+    return {
+        "items": [
+            {
+                "id": str(announcement.id),
+                "title": announcement.title,
+                "message": announcement.message,
+                "priority": announcement.priority,
+                "created_at": announcement.created_at.isoformat(),
+                "read": read_at is not None,
+            }
+            for announcement, read_at in page
+        ],
+        "next_cursor": _feed_cursor(page[-1][0]) if len(rows) > limit else None,
+        "newest_cursor": _feed_cursor(page[0][0]) if page else since,
+    }
+
+
+@router.get("/announcements/unread-count")
+def get_my_unread_announcement_count(
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Unread badge count"""
+    return {"unread_count": _unread_count(db, tenant)}
+
+
+@router.post("/announcements/read")
+def mark_announcements_read(
+    read_request: AnnouncementReadRequest,
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Mark the given announcements, or all of them, as read; returns the new unread count"""
+    if not read_request.all and not read_request.announcement_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide announcement_ids or all=true"
+        )
+    if not tenant.property_id:
+        return {"unread_count": 0}
+    
+    # One INSERT ... SELECT, limited to the tenant's own property; reads already recorded are kept
+    announcements = select(
+        literal(tenant.id, AnnouncementRead.tenant_id.type), Announcement.id
+    ).where(Announcement.property_id == tenant.property_id)
+    if not read_request.all:
+        announcements = announcements.where(Announcement.id.in_(read_request.announcement_ids))
+    
+    inserted = db.execute(
+        dialect_insert(db.connection())(AnnouncementRead.__table__).from_select(
+            ["tenant_id", "announcement_id"], announcements
+        ).on_conflict_do_nothing(index_elements=["tenant_id", "announcement_id"])
+    ).rowcount
+    if inserted:
+        ScopeVersionService.touch(db, [scope_key(READS_SCOPE, tenant.id)])
+    db.commit()
     
-    return [
-        {
-            "id": str(announcement.id),
-            "title": announcement.title,
-            "message": announcement.message,
-            "priority": announcement.priority,
-            "created_at": announcement.created_at.isoformat(),
-        }
-        for announcement in announcements
-    ]
+    return {"unread_count": _unread_count(db, tenant)}
+
+
 @router.get("/documents")
 def get_my_documents(
+    request: Request,
+    response: Response,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Get documents available to current tenant"""
     
-    # Get tenant's room and property info
-    room = db.query(Room).filter(Room.id == tenant.room_id).first()
-    if not room:
+    # Get tenant's property
+    property_id = tenant.property_id
+    if not property_id:
         return []
-    
-    unit = db.query(Unit).filter(Unit.id == room.unit_id).first()
-    property_id = unit.property_id
+
+    not_modified = conditional_response(request, response, ScopeVersionService.etag(
+        db, "documents", scope_key("tenant", tenant.id), scope_key("property", property_id)
+    ))
+    if not_modified:
+        return not_modified
     
     print(f"DEBUG TENANT: tenant_id={tenant.id}, property_id={property_id}")
     
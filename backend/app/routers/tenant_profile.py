@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 
 from app.database import get_db
 from app.models.user import User
 from app.models.tenant import Tenant
-from app.utils.auth import get_current_user, get_password_hash, verify_password
+from app.services.passwords import hash_password, verify_password
+from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/tenants/me/profile", tags=["Tenant Profile"])
 
@@ -87,30 +89,36 @@ def update_profile(
     }
 
 
+def _store_password_hash(db: Session, user: User, password_hash: str):
+    user.password_hash = password_hash
+    db.commit()
+
+
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_change: PasswordChange,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Change tenant password"""
     
-    # Verify current password
-    if not verify_password(password_change.current_password, current_user.password_hash):
+    # Validate new password strength
+    if len(password_change.new_password) < 8:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Current password is incorrect"
+            detail="New password must be at least 8 characters long"
         )
     
-    # Validate new password strength
-    if len(password_change.new_password) < 8:
+    # Verify current password
+    matches, _ = await verify_password(password_change.current_password, current_user.password_hash)
+    if not matches:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="New password must be at least 8 characters long"
+            detail="Current password is incorrect"
         )
     
     # Update password
-    current_user.password_hash = get_password_hash(password_change.new_password)
-    db.commit()
+    password_hash = await hash_password(password_change.new_password)
+    await run_in_threadpool(_store_password_hash, db, current_user, password_hash)
     
     return {"message": "Password changed successfully"}
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List
 from datetime import datetime
 import logging
 
@@ -11,8 +11,10 @@ from app.models.room import Room, RoomStatus
 from app.models.unit import Unit
 from app.models.property import Property
 from app.models.payment import Payment
-from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse
+from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse, TenantSummaryResponse
+from app.services.tenant_import import TenantImportService, MAX_IMPORT_ROWS, parse_csv, send_invitations
 from app.utils.auth import get_current_operator
+from app.config import get_settings
 
 router = APIRouter(prefix="/tenants", tags=["Tenants"])
 logger = logging.getLogger(__name__)
@@ -149,6 +151,59 @@ def create_tenant(
     return db_tenant
 
 
+def _run_import(rows, dry_run, db, current_user, background_tasks):
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No rows to import"
+        )
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Imports are limited to {MAX_IMPORT_ROWS} rows"
+        )
+    
+    result = TenantImportService.import_rows(db, current_user.operator.id, rows, dry_run=dry_run)
+    
+    # Invitations go out after the response instead of holding up the import
+    if result.invitations and not dry_run:
+        signup_url = f"{get_settings().tenant_frontend_url}/signup"
+        background_tasks.add_task(send_invitations, result.invitations, signup_url)
+    
+    return result.summary(dry_run)
+
+
+@router.post("/import")
+def import_tenants(
+    rows: List[Dict[str, Any]],
+    background_tasks: BackgroundTasks,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Onboard many tenants at once from a JSON array of tenant rows; returns a per-row report"""
+    return _run_import(rows, dry_run, db, current_user, background_tasks)
+
+
+@router.post("/import/csv")
+def import_tenants_csv(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Onboard many tenants at once from a CSV upload with one tenant per row"""
+    try:
+        rows = parse_csv(file.file.read())
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded CSV"
+        )
+    return _run_import(rows, dry_run, db, current_user, background_tasks)
+
+
 @router.get("/property/{property_id}")
 def get_tenants_by_property(
     property_id: str,
@@ -169,79 +224,77 @@ def get_tenants_by_property(
             detail="Property not found"
         )
     
-    # Get all units for this property
-    units = db.query(Unit).filter(Unit.property_id == property_id).all()
-    unit_ids = [u.id for u in units]
+    # Get active tenants in current rooms, with their user, room and unit in one query
+    active_rows = db.query(Tenant, User, Room, Unit).join(
+        User, User.id == Tenant.user_id
+    ).join(
+        Room, Room.id == Tenant.room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).filter(
+        Unit.property_id == property_id
+    ).all()
     
-    # Get all rooms for these units
-    rooms = db.query(Room).filter(Room.unit_id.in_(unit_ids)).all() if unit_ids else []
-    room_ids = [r.id for r in rooms]
+    # Get moved out tenants who were previously in rooms of this property
+    # We'll track this by checking if they ever had a room in this property
+    # For now, we'll include all moved out tenants since we need to add property tracking
+    # In a future update, we should add a property_id field to tenants table
+    property_has_rooms = db.query(Room.id).join(
+        Unit, Unit.id == Room.unit_id
+    ).filter(
+        Unit.property_id == property_id
+    ).exists()
+    
+    moved_out_rows = db.query(Tenant, User).join(
+        User, User.id == Tenant.user_id
+    ).filter(
+        Tenant.status == TenantStatus.MOVED_OUT,
+        Tenant.room_id.is_(None),
+        property_has_rooms
+    ).all()
     
     tenants = []
     
-    if room_ids:
-        # Get active tenants in current rooms
-        active_tenants = db.query(Tenant).filter(Tenant.room_id.in_(room_ids)).all()
-        
-        # Get moved out tenants who were previously in rooms of this property
-        # We'll track this by checking if they ever had a room in this property
-        moved_out_tenants = db.query(Tenant).filter(
-            Tenant.status == TenantStatus.MOVED_OUT,
-            Tenant.room_id.is_(None)
-        ).all()
-        
-        # Filter moved out tenants to only include those who belonged to this property
-        # For now, we'll include all moved out tenants since we need to add property tracking
-        # In a future update, we should add a property_id field to tenants table
-        
-        all_property_tenants = active_tenants + moved_out_tenants 
-        
-        for tenant in all_property_tenants:
-            user = db.query(User).filter(User.id == tenant.user_id).first()
-            
-            if tenant.room_id:
-                # Active tenant with room
-                room = db.query(Room).filter(Room.id == tenant.room_id).first()
-                unit = db.query(Unit).filter(Unit.id == room.unit_id).first()
-                
-                tenants.append({
-                    "id": str(tenant.id),
-                    "user_id": str(tenant.user_id),
-                    "room_id": str(tenant.room_id),
-                    "lease_start": tenant.lease_start.isoformat(),
-                    "lease_end": tenant.lease_end.isoformat(),
-                    "rent_amount": str(tenant.rent_amount),
-                    "deposit_paid": str(tenant.deposit_paid) if tenant.deposit_paid else None,
-                    "status": tenant.status,
-                    "move_in_date": tenant.move_in_date.isoformat() if tenant.move_in_date else None,
-                    "created_at": tenant.created_at.isoformat(),
-                    "email": user.email,
-                    "first_name": user.first_name,  # ADD THIS LINE
-                    "last_name": user.last_name,    # ADD THIS LINE
-                    "room_number": room.room_number,
-                    "unit_number": unit.unit_number,
-                    "property_name": property.name,
-                })
-            else:
-                # Moved out tenant (no current room)
-                tenants.append({
-                    "id": str(tenant.id),
-                    "user_id": str(tenant.user_id),
-                    "room_id": None,
-                    "lease_start": tenant.lease_start.isoformat(),
-                    "lease_end": tenant.lease_end.isoformat(),
-                    "rent_amount": str(tenant.rent_amount),
-                    "deposit_paid": str(tenant.deposit_paid) if tenant.deposit_paid else None,
-                    "status": tenant.status,
-                    "move_in_date": tenant.move_in_date.isoformat() if tenant.move_in_date else None,
-                    "created_at": tenant.created_at.isoformat(),
-                    "email": user.email,
-                    "first_name": user.first_name,  # ADD THIS LINE
-                    "last_name": user.last_name,    # ADD THIS LINE
-                    "room_number": "N/A",
-                    "unit_number": "N/A", 
-                    "property_name": property.name,
-                })
+    for tenant, user, room, unit in active_rows:
+        tenants.append({
+            "id": str(tenant.id),
+            "user_id": str(tenant.user_id),
+            "room_id": str(tenant.room_id),
+            "lease_start": tenant.lease_start.isoformat(),
+            "lease_end": tenant.lease_end.isoformat(),
+            "rent_amount": str(tenant.rent_amount),
+            "deposit_paid": str(tenant.deposit_paid) if tenant.deposit_paid else None,
+            "status": tenant.status,
+            "move_in_date": tenant.move_in_date.isoformat() if tenant.move_in_date else None,
+            "created_at": tenant.created_at.isoformat(),
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "room_number": room.room_number,
+            "unit_number": unit.unit_number,
+            "property_name": property.name,
+        })
+    
+    for tenant, user in moved_out_rows:
+        # Moved out tenant (no current room)
+        tenants.append({
+            "id": str(tenant.id),
+            "user_id": str(tenant.user_id),
+            "room_id": None,
+            "lease_start": tenant.lease_start.isoformat(),
+            "lease_end": tenant.lease_end.isoformat(),
+            "rent_amount": str(tenant.rent_amount),
+            "deposit_paid": str(tenant.deposit_paid) if tenant.deposit_paid else None,
+            "status": tenant.status,
+            "move_in_date": tenant.move_in_date.isoformat() if tenant.move_in_date else None,
+            "created_at": tenant.created_at.isoformat(),
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "room_number": "N/A",
+            "unit_number": "N/A", 
+            "property_name": property.name,
+        })
     
     return tenants
 
@@ -408,46 +461,27 @@ def delete_tenant(
     return {"message": "Tenant removed successfully"}
 
 
-@router.get("/all/tenants")
+@router.get("/all/tenants", response_model=List[TenantSummaryResponse])
 def get_all_tenants(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_operator)
 ):
     """Get all tenants across all properties for the current operator"""
     
-    # Get all properties for this operator
-    properties = db.query(Property).filter(
+    # One join from tenant to property; rows serialize straight through the response model
+    return db.query(
+        Tenant.id,
+        User.email.label("user_email"),
+        Room.room_number,
+        Unit.unit_number,
+    ).join(
+        User, User.id == Tenant.user_id
+    ).join(
+        Room, Room.id == Tenant.room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).filter(
         Property.operator_id == current_user.operator.id
     ).all()
-    
-    if not properties:
-        return []
-    
-    property_ids = [p.id for p in properties]
-    
-    # Get all units for these properties
-    units = db.query(Unit).filter(Unit.property_id.in_(property_ids)).all()
-    unit_ids = [u.id for u in units]
-    
-    # Get all rooms for these units
-    rooms = db.query(Room).filter(Room.unit_id.in_(unit_ids)).all()
-    room_ids = [r.id for r in rooms]
-    
-    # Get all tenants for these rooms
-    tenants = db.query(Tenant).filter(Tenant.room_id.in_(room_ids)).all()
-    
-    # Build response with context
-    result = []
-    for tenant in tenants:
-        user = db.query(User).filter(User.id == tenant.user_id).first()
-        room = db.query(Room).filter(Room.id == tenant.room_id).first()
-        unit = db.query(Unit).filter(Unit.id == room.unit_id).first() if room else None
-        
-        result.append({
-            "id": str(tenant.id),
-            "user_email": user.email if user else None,
-            "room_number": room.room_number if room else None,
-            "unit_number": unit.unit_number if unit else None,
-        })
-    
-    return result
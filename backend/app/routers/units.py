@@ -1,20 +1,62 @@
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
 from app.models.user import User
 from app.models.property import Property
 from app.models.unit import Unit
-from app.models.room import Room
+from app.models.room import Room, RoomType, RoomStatus
 from app.models.tenant import Tenant, TenantStatus
 from app.models.payment import Payment
-from app.schemas.unit import UnitCreate, UnitUpdate, UnitResponse
+from app.schemas.unit import (
+    UnitCreate, UnitUpdate, UnitResponse,
+    UnitBulkCreate, UnitClone, UnitWithRoomsResponse,
+)
+from app.services.response_cache import response_cache
+from app.services.scope_versions import ScopeVersionService, scope_key
 from app.utils.auth import get_current_operator
 
 router = APIRouter(prefix="/units", tags=["Units"])
 
+# Room fields copied when a unit layout is cloned
+CLONED_ROOM_FIELDS = ("room_number", "room_type", "size_sqft", "has_private_bath", "rent_amount")
+
+
+def _whole_unit_room(unit: Unit) -> Room:
+    """Whole unit rentals are let through a single virtual room"""
+    return Room(
+        unit=unit,
+        room_number="Whole Unit",
+        room_type=RoomType.PRIVATE,
+        rent_amount=0,  # Will be set during tenant assignment
+        size_sqft=unit.square_feet,  # Inherit from unit
+        has_private_bath=True,  # Whole unit has all amenities
+        status=RoomStatus.VACANT
+    )
+
+
+def _check_unit_numbers(db: Session, property_id, unit_numbers: List[str]):
+    """Reject numbers repeated in the request or already used in the property, with one query"""
+    duplicates = {n for n in unit_numbers if unit_numbers.count(n) > 1}
+    taken = {n for (n,) in db.query(Unit.unit_number).filter(
+        Unit.property_id == property_id,
+        Unit.unit_number.in_(unit_numbers)
+    )}
+    conflicts = sorted(duplicates | taken)
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unit numbers already in use: {', '.join(conflicts)}"
+        )
+
+
+def _load_units_with_rooms(db: Session, unit_ids) -> List[Unit]:
+    return db.query(Unit).options(selectinload(Unit.rooms)).filter(
+        Unit.id.in_(unit_ids)
+    ).order_by(Unit.floor, Unit.unit_number).all()
+
 
 @router.post("/", response_model=UnitResponse, status_code=status.HTTP_201_CREATED)
 def create_unit(
@@ -43,18 +85,7 @@ def create_unit(
     
     # If this is a whole unit rental, create a virtual room
     if unit_data.rental_type == "whole_unit":
-        from app.models.room import Room  # Import Room model
-        
-        virtual_room = Room(
-            unit_id=unit.id,
-            room_number="Whole Unit",
-            room_type="private",
-            rent_amount=0,  # Will be set during tenant assignment
-            size_sqft=unit_data.square_feet,  # Inherit from unit
-            has_private_bath=True,  # Whole unit has all amenities
-            status="vacant"
-        )
-        db.add(virtual_room)
+        db.add(_whole_unit_room(unit))
     
     db.commit()
     db.refresh(unit)
@@ -62,17 +93,17 @@ def create_unit(
     return unit
 
 
-@router.get("/property/{property_id}", response_model=List[UnitResponse])
-def get_units_by_property(
-    property_id: UUID,
+@router.post("/bulk", response_model=List[UnitWithRoomsResponse], status_code=status.HTTP_201_CREATED)
+def create_units_bulk(
+    bulk_data: UnitBulkCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_operator)
 ):
-    """Get all units for a specific property"""
+    """Create several units together with their rooms in one transaction"""
     
-    # Verify property belongs to operator
+    # Verify property belongs to operator (once for the whole batch)
     property = db.query(Property).filter(
-        Property.id == property_id,
+        Property.id == bulk_data.property_id,
         Property.operator_id == current_user.operator.id
     ).first()
     
@@ -82,8 +113,119 @@ def get_units_by_property(
             detail="Property not found or you don't have access"
         )
     
-    units = db.query(Unit).filter(Unit.property_id == property_id).all()
-    return units
+    _check_unit_numbers(db, property.id, [u.unit_number for u in bulk_data.units])
+    
+    units = []
+    for unit_data in bulk_data.units:
+        unit = Unit(property_id=property.id, **unit_data.model_dump(exclude={"rooms"}))
+        db.add(unit)
+        if unit_data.rental_type == "whole_unit":
+            db.add(_whole_unit_room(unit))
+        else:
+            db.add_all(Room(unit=unit, **room.model_dump()) for room in unit_data.rooms)
+        units.append(unit)
+    
+    db.flush()
+    unit_ids = [unit.id for unit in units]
+    db.commit()
+    
+    return _load_units_with_rooms(db, unit_ids)
+
+
+@router.post("/{unit_id}/clone", response_model=List[UnitWithRoomsResponse], status_code=status.HTTP_201_CREATED)
+def clone_unit(
+    unit_id: UUID,
+    clone_data: UnitClone,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Copy a unit and its room layout onto other floors"""
+    
+    # Load the source unit and its rooms, scoped to the operator
+    source = db.query(Unit).options(selectinload(Unit.rooms)).join(
+        Property, Property.id == Unit.property_id
+    ).filter(
+        Unit.id == unit_id,
+        Property.operator_id == current_user.operator.id
+    ).first()
+    
+    if not source:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unit not found"
+        )
+    
+    number_format = clone_data.unit_number_format
+    if number_format is None and source.floor is not None and source.unit_number.startswith(str(source.floor)):
+        number_format = "{floor}" + source.unit_number[len(str(source.floor)):]
+    if not number_format or "{floor}" not in number_format:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unit_number_format with a {floor} placeholder is required for this unit"
+        )
+    
+    unit_numbers = [number_format.replace("{floor}", str(floor)) for floor in clone_data.floors]
+    _check_unit_numbers(db, source.property_id, unit_numbers)
+    
+    units = []
+    for floor, unit_number in zip(clone_data.floors, unit_numbers):
+        unit = Unit(
+            property_id=source.property_id,
+            unit_number=unit_number,
+            floor=floor,
+            bedrooms=source.bedrooms,
+            bathrooms=source.bathrooms,
+            square_feet=source.square_feet,
+            furnished=source.furnished,
+            rental_type=source.rental_type,
+        )
+        db.add(unit)
+        if source.rental_type == "whole_unit":
+            db.add(_whole_unit_room(unit))
+        else:
+            db.add_all(
+                Room(unit=unit, status=RoomStatus.VACANT, **{f: getattr(room, f) for f in CLONED_ROOM_FIELDS})
+                for room in source.rooms
+            )
+        units.append(unit)
+    
+    db.flush()
+    unit_ids = [unit.id for unit in units]
+    db.commit()
+    
+    return _load_units_with_rooms(db, unit_ids)
+
+
+@router.get("/property/{property_id}", response_model=List[UnitResponse])
+def get_units_by_property(
+    property_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_operator)
+):
+    """Get all units for a specific property"""
+    
+    def build():
+        # Verify property belongs to operator
+        property = db.query(Property).filter(
+            Property.id == property_id,
+            Property.operator_id == current_user.operator.id
+        ).first()
+        
+        if not property:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found or you don't have access"
+            )
+        
+        units = db.query(Unit).filter(Unit.property_id == property_id).all()
+        return [UnitResponse.model_validate(unit).model_dump(mode="json") for unit in units]
+    
+    property_scope = scope_key("property", property_id)
+    return response_cache.cached(
+        "units-by-property", scope_key("operator", current_user.operator.id), build,
+        params={"property_id": property_id}, tags=[property_scope],
+        versions=ScopeVersionService.versions(db, [property_scope])
+    )
 
 
 @router.get("/{unit_id}", response_model=UnitResponse)
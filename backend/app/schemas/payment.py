@@ -1,5 +1,5 @@
 # Update app/schemas/payment.py
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from uuid import UUID
 from datetime import datetime, date
 from typing import Optional
@@ -65,3 +65,25 @@ class CustomPaymentRequest(BaseModel):
     payment_type: str  # 'insurance', 'service_fee', 'custom', etc.
     description: str  # Required for custom payments
     payment_method: Optional[str] = 'manual'
+
+
+class TenantPaymentResponse(BaseModel):
+    """Payment as shown in the tenant portal"""
+    id: UUID
+    amount: Decimal
+    due_date: date
+    paid_date: Optional[date] = None
+    status: PaymentStatus
+    payment_method: Optional[str] = None
+    late_fee: Decimal = Decimal("0.00")
+    created_at: datetime
+    payment_type: str = "rent"
+    description: Optional[str] = None
+    
+    @field_validator("late_fee", "payment_type", mode="before")
+    @classmethod
+    def default_when_empty(cls, value, info):
+        return value if value else cls.model_fields[info.field_name].default
+    
+    class Config:
+        from_attributes = True
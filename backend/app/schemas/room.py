@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 from app.models.room import RoomType, RoomStatus
@@ -39,3 +39,11 @@ class RoomResponse(RoomBase):
     
     class Config:
         from_attributes = True
+
+
+class RoomRentUpdate(BaseModel):
+    room_ids: List[UUID]
+    # Exactly one of these: a new rent for every room, or a percentage to apply to each
+    # (above -100%, so no rent drops to zero or below)
+    rent_amount: Optional[Decimal] = Field(None, gt=0)
+    percent_change: Optional[Decimal] = Field(None, gt=-100)
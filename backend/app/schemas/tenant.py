@@ -47,3 +47,14 @@ class TenantWithUserResponse(TenantResponse):
     
     class Config:
         from_attributes = True
+
+
+class TenantSummaryResponse(BaseModel):
+    """One row of the operator's tenant list"""
+    id: UUID
+    user_email: Optional[str] = None
+    room_number: Optional[str] = None
+    unit_number: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from app.schemas.room import RoomBase, RoomResponse
 
 
 class UnitBase(BaseModel):
@@ -35,3 +37,23 @@ class UnitResponse(UnitBase):
     
     class Config:
         from_attributes = True
+
+
+class UnitWithRoomsCreate(UnitBase):
+    # Ignored for whole-unit rentals, which get their virtual room automatically
+    rooms: List[RoomBase] = []
+
+
+class UnitBulkCreate(BaseModel):
+    property_id: UUID
+    units: List[UnitWithRoomsCreate]
+
+
+class UnitClone(BaseModel):
+    floors: List[int]
+    # e.g. "{floor}02"; defaults to swapping the source unit's floor prefix ("101" -> "201")
+    unit_number_format: Optional[str] = None
+
+
+class UnitWithRoomsResponse(UnitResponse):
+    rooms: List[RoomResponse] = []
@@ -1,10 +1,18 @@
-import resend
 import os
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, date
 
-# Initialize Resend with API key
-resend.api_key = os.getenv("RESEND_API_KEY", "")
+
+@lru_cache()
+def get_resend():
+    """The configured resend module, imported on first send rather than at worker boot"""
+    import resend
+    
+    # Initialize Resend with API key
+    resend.api_key = os.getenv("RESEND_API_KEY", "")
+    return resend
+
 
 class EmailService:
     FROM_EMAIL = "CoLiv <onboarding@resend.dev>"  # We'll update this with your domain later
@@ -120,7 +128,7 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [tenant_email],
                 "subject": subject,
@@ -236,7 +244,7 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [tenant_email],
                 "subject": subject,
@@ -341,7 +349,101 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
+                "from": EmailService.FROM_EMAIL,
+                "to": [tenant_email],
+                "subject": subject,
+                "html": html_content,
+            })
+            return response
+        except Exception as e:
+            print(f"Failed to send email: {str(e)}")
+            raise
+
+    @staticmethod
+    def send_tenant_invitation(
+        tenant_email: str,
+        tenant_name: str,
+        property_name: str,
+        signup_url: str
+    ):
+        """Invite a newly onboarded tenant to activate their portal account"""
+        
+        subject = f"Welcome to {property_name} - Activate your tenant account"
+        
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                }}
+                .header {{
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 30px;
+                    border-radius: 10px 10px 0 0;
+                    text-align: center;
+                }}
+                .content {{
+                    background: #f9f9f9;
+                    padding: 30px;
+                    border-radius: 0 0 10px 10px;
+                }}
+                .button {{
+                    display: inline-block;
+                    background: #667eea;
+                    color: white;
+                    padding: 15px 30px;
+                    text-decoration: none;
+                    border-radius: 8px;
+                    margin: 20px 0;
+                    font-weight: bold;
+                }}
+                .footer {{
+                    text-align: center;
+                    color: #999;
+                    font-size: 12px;
+                    margin-top: 30px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>🏠 Welcome to {property_name}</h1>
+            </div>
+            <div class="content">
+                <p>Hi {tenant_name},</p>
+                
+                <p>Your property manager has set up your tenant account. Activate it to pay rent,
+                submit maintenance requests and see announcements online.</p>
+                
+                <center>
+                    <a href="{signup_url}" class="button">
+                        Activate Account
+                    </a>
+                </center>
+                
+                <p style="margin-top: 30px; font-size: 14px; color: #666;">
+                    Sign up with this email address ({tenant_email}) to link your lease.
+                </p>
+            </div>
+            <div class="footer">
+                <p>CoLiv Property Management</p>
+                <p>This is an automated message, please do not reply to this email.</p>
+            </div>
+        </body>
+        </html>
+        """
+        
+        try:
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [tenant_email],
                 "subject": subject,
@@ -483,7 +585,7 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [operator_email],
                 "subject": subject,
@@ -657,7 +759,7 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [operator_email],
                 "subject": subject,
@@ -795,7 +897,7 @@ class EmailService:
         """
         
         try:
-            response = resend.Emails.send({
+            response = get_resend().Emails.send({
                 "from": EmailService.FROM_EMAIL,
                 "to": [operator_email],
                 "subject": subject,
@@ -1,29 +1,50 @@
-import boto3
-from botocore.exceptions import ClientError
 import os
+import threading
 import uuid
-from typing import Optional
+from typing import BinaryIO, Optional
 from fastapi import UploadFile, HTTPException
 
+
+def _client_error():
+    # botocore is only imported once a real client exists
+    from botocore.exceptions import ClientError
+    return ClientError
+
+
 class FileStorageService:
     def __init__(self):
         self.endpoint_url = os.getenv("R2_ENDPOINT_URL")
         self.access_key = os.getenv("R2_ACCESS_KEY_ID") 
         self.secret_key = os.getenv("R2_SECRET_ACCESS_KEY")
         self.bucket_name = os.getenv("R2_BUCKET_NAME")
+        self.configured = all([self.endpoint_url, self.access_key, self.secret_key, self.bucket_name])
+        self._s3_client = None
+        self._client_lock = threading.Lock()
         
-        if not all([self.endpoint_url, self.access_key, self.secret_key, self.bucket_name]):
+        if not self.configured:
             print("WARNING: R2 credentials not configured, using mock storage")
-            self.s3_client = None
-        else:
-            print("SUCCESS: R2 credentials found, initializing real storage")
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                region_name='auto'
-            )
+    
+    @property
+    def s3_client(self):
+        """
+        The S3 client, built on first use: importing boto3 and building a
+        client costs more than the rest of the app's imports together, and
+        most workers never touch storage.
+        """
+        if not self.configured:
+            return None
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    import boto3
+                    self._s3_client = boto3.client(
+                        's3',
+                        endpoint_url=self.endpoint_url,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                        region_name='auto'
+                    )
+        return self._s3_client
     
     async def upload_file(self, file: UploadFile, folder: str = "documents") -> dict:
         """Upload file to R2 (private bucket)"""
@@ -58,11 +79,41 @@ class FileStorageService:
                 "key": key
             }
             
-        except ClientError as e:
+        except _client_error() as e:
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
     
+    def upload_fileobj(self, fileobj: BinaryIO, key: str, content_type: Optional[str] = None):
+        """
+        Stream a file object to R2 under `key`. Large files go up as a
+        multipart upload in chunks, so they are never held in memory whole.
+        """
+        if not self.s3_client:
+            return
+        
+        try:
+            self.s3_client.upload_fileobj(
+                fileobj, self.bucket_name, key,
+                ExtraArgs={"ContentType": content_type or 'application/octet-stream'}
+            )
+        except _client_error() as e:
+            raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+    
+    def download_fileobj(self, key: str, fileobj: BinaryIO):
+        """Stream the object at `key` into a file object"""
+        if not self.s3_client:
+            return
+        
+        self.s3_client.download_fileobj(self.bucket_name, key, fileobj)
+    
+    def put_bytes(self, key: str, content: bytes, content_type: str):
+        """Store a small generated file, such as an image variant"""
+        if not self.s3_client:
+            return
+        
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=content, ContentType=content_type)
+    
     def generate_download_url(self, key: str, expires_in: int = 3600) -> str:
         """Generate a signed URL for secure file download (1 hour expiry by default)"""
         if not self.s3_client:
@@ -75,7 +126,7 @@ class FileStorageService:
                 ExpiresIn=expires_in  # URL expires in 1 hour
             )
             return signed_url
-        except ClientError as e:
+        except _client_error() as e:
             raise HTTPException(status_code=500, detail=f"Failed to generate download URL: {str(e)}")
     
     def delete_file(self, key: str) -> bool:
@@ -86,7 +137,7 @@ class FileStorageService:
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
             return True
-        except ClientError:
+        except _client_error():
             return False
     
     async def _mock_upload(self, file: UploadFile, folder: str) -> dict:
@@ -0,0 +1,309 @@
+"""
+Maintenance photo pipeline.
+
+Uploads are spooled to a temporary file and streamed to storage as the
+original. A small thread pool then produces the variants that clients
+actually load: a JPEG and a WebP thumbnail for ticket lists, and a WebP
+display image for the full-screen view. List endpoints only hand out
+thumbnail URLs; the original is signed on demand.
+
+Queued jobs live only in the worker's memory, so a recycled or restarted
+worker loses them. A periodic sweep re-queues photos that have been
+processing for too long from the stored original, and fails them after an
+hour of retries.
+"""
+import asyncio
+import glob
+import io
+import logging
+import os
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.maintenance import MaintenanceRequest
+from app.models.maintenance_photo import MaintenancePhoto, MaintenancePhotoStatus
+from app.services.file_storage import file_storage
+
+logger = logging.getLogger(__name__)
+
+# Formats Pillow decodes without extra plugins, by upload content type
+PHOTO_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+THUMBNAIL_SIZE = 320
+DISPLAY_SIZE = 1600
+CHUNK_SIZE = 1024 * 1024
+
+SPOOL_PREFIX = "maintenance-photo-"
+# Processing this long after upload (or the last retry) means the job was lost
+MAX_PROCESSING_AGE = timedelta(hours=1)
+
+
+@lru_cache()
+def _photo_executor() -> ThreadPoolExecutor:
+    # Pillow releases the GIL while resizing and encoding, so threads scale across cores
+    return ThreadPoolExecutor(max_workers=get_settings().maintenance_photo_workers, thread_name_prefix="photos")
+
+
+def _log_failure(future: Future) -> None:
+    # Errors outside generate_variants' own handling (e.g. the commit) would otherwise vanish with the Future
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Maintenance photo job failed: {error!r}")
+
+
+def _queue(photo_id, path: str, bind=None) -> None:
+    """Hand a spooled original to the photo pool, which removes the file when done"""
+    _photo_executor().submit(generate_variants, photo_id, path, bind).add_done_callback(_log_failure)
+
+
+def _spool(upload: UploadFile, max_bytes: int) -> str:
+    """Copy the upload to a temporary file in chunks, enforcing the size limit; returns its path"""
+    spooled = tempfile.NamedTemporaryFile(prefix=SPOOL_PREFIX, delete=False)
+    size = 0
+    try:
+        with spooled:
+            while True:
+                chunk = upload.file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Photos must be smaller than {max_bytes // (1024 * 1024)}MB"
+                    )
+                spooled.write(chunk)
+    except BaseException:
+        os.unlink(spooled.name)
+        raise
+    return spooled.name
+
+
+def _variant_key(original_key: str, variant: str, extension: str) -> str:
+    return f"{original_key.rsplit('.', 1)[0]}_{variant}.{extension}"
+
+
+def _encode(image, size: int, image_format: str, **options) -> bytes:
+    copy = image.copy()
+    copy.thumbnail((size, size))
+    buffer = io.BytesIO()
+    copy.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(photo_id, path: str, bind=None):
+    """Worker: build and store the variants of one photo, then mark it ready (or failed)"""
+    # Imported here so web workers that never see a photo do not load Pillow
+    from PIL import Image, ImageOps
+
+    db = Session(bind=bind) if bind is not None else SessionLocal()
+    try:
+        photo = db.get(MaintenancePhoto, photo_id)
+        try:
+            with Image.open(path) as source:
+                # Phone cameras store rotation in EXIF; apply it so thumbnails are upright
+                image = ImageOps.exif_transpose(source).convert("RGB")
+            variants = {
+                "thumbnail_key": (_variant_key(photo.original_key, "thumb", "jpg"), "image/jpeg",
+                                  _encode(image, THUMBNAIL_SIZE, "JPEG", quality=80, optimize=True)),
+                "thumbnail_webp_key": (_variant_key(photo.original_key, "thumb", "webp"), "image/webp",
+                                       _encode(image, THUMBNAIL_SIZE, "WEBP", quality=75)),
+                "display_webp_key": (_variant_key(photo.original_key, "display", "webp"), "image/webp",
+                                     _encode(image, DISPLAY_SIZE, "WEBP", quality=80)),
+            }
+            for column, (key, content_type, content) in variants.items():
+                file_storage.put_bytes(key, content, content_type)
+                setattr(photo, column, key)
+            photo.width, photo.height = image.size
+            photo.status = MaintenancePhotoStatus.READY
+        except Exception as e:
+            logger.error(f"Thumbnail generation failed for maintenance photo {photo_id}: {str(e)}")
+            photo.status = MaintenancePhotoStatus.FAILED
+        db.commit()
+    finally:
+        db.close()
+        os.unlink(path)
+
+
+class MaintenancePhotoService:
+    @staticmethod
+    def upload(db: Session, request: MaintenanceRequest, upload: UploadFile,
+               uploaded_by: uuid.UUID) -> MaintenancePhoto:
+        """Store the original and queue its variants; the photo is returned while still processing"""
+        extension = PHOTO_EXTENSIONS.get(upload.content_type)
+        if not extension:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Photos must be one of: {', '.join(PHOTO_EXTENSIONS)}"
+            )
+
+        path = _spool(upload, get_settings().maintenance_photo_max_bytes)
+        try:
+            photo_id = uuid.uuid4()
+            key = f"maintenance/{request.id}/{photo_id}.{extension}"
+            with open(path, "rb") as original:
+                file_storage.upload_fileobj(original, key, upload.content_type)
+
+            photo = MaintenancePhoto(
+                id=photo_id,
+                request_id=request.id,
+                uploaded_by=uploaded_by,
+                original_key=key,
+                mime_type=upload.content_type,
+                file_size=os.path.getsize(path),
+                status=MaintenancePhotoStatus.PROCESSING,
+            )
+            db.add(photo)
+            db.commit()
+            db.refresh(photo)
+        except BaseException:
+            os.unlink(path)
+            raise
+
+        # The worker owns the spooled file from here and removes it when done
+        _queue(photo.id, path, db.get_bind())
+        return photo
+
+    @staticmethod
+    def thumbnails(db: Session, request_ids: Iterable) -> Dict[uuid.UUID, List[dict]]:
+        """Thumbnail entries for many requests with one query, for list endpoints"""
+        request_ids = list(request_ids)
+        photos = defaultdict(list)
+        if not request_ids:
+            return photos
+
+        rows = db.query(MaintenancePhoto).filter(
+            MaintenancePhoto.request_id.in_(request_ids)
+        ).order_by(MaintenancePhoto.created_at, MaintenancePhoto.id).all()
+        for photo in rows:
+            photos[photo.request_id].append(photo_thumbnail(photo))
+        return photos
+
+
+# ============ LOST JOBS ============
+
+def _download_original(original_key: str) -> str:
+    """The stored original, copied back to a spool file for the pool"""
+    spooled = tempfile.NamedTemporaryFile(prefix=SPOOL_PREFIX, delete=False)
+    try:
+        with spooled:
+            file_storage.download_fileobj(original_key, spooled)
+    except BaseException:
+        os.unlink(spooled.name)
+        raise
+    return spooled.name
+
+
+def _remove_orphaned_spools(max_age: timedelta) -> None:
+    # Files left behind by workers that exited mid-job; live jobs' files are far younger
+    cutoff = time.time() - max_age.total_seconds()
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), SPOOL_PREFIX + "*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except OSError:
+            pass
+
+
+def recover_stale_photos(bind=None, stale_after: Optional[timedelta] = None) -> int:
+    """
+    Background task: re-queue photos processing for longer than `stale_after`
+    since upload or their last retry, and fail those uploaded over
+    MAX_PROCESSING_AGE ago. Returns how many were re-queued.
+    """
+    stale_after = stale_after or timedelta(seconds=get_settings().maintenance_photo_stale_seconds)
+    db = Session(bind=bind) if bind is not None else SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        last_attempt = func.coalesce(MaintenancePhoto.updated_at, MaintenancePhoto.created_at)
+        stale = db.query(MaintenancePhoto).filter(
+            MaintenancePhoto.status == MaintenancePhotoStatus.PROCESSING,
+            last_attempt < now - stale_after
+        ).all()
+
+        requeue = []
+        for photo in stale:
+            give_up = photo.created_at.replace(tzinfo=photo.created_at.tzinfo or timezone.utc) < now - MAX_PROCESSING_AGE
+            # Claimed by a conditional UPDATE, so other workers' sweeps skip it
+            claimed = db.query(MaintenancePhoto).filter(
+                MaintenancePhoto.id == photo.id,
+                MaintenancePhoto.status == MaintenancePhotoStatus.PROCESSING,
+                last_attempt < now - stale_after
+            ).update({
+                "status": MaintenancePhotoStatus.FAILED if give_up else MaintenancePhotoStatus.PROCESSING,
+                "updated_at": now,
+            }, synchronize_session=False)
+            if give_up:
+                logger.error(f"Maintenance photo {photo.id} was never processed; marked failed")
+            elif claimed:
+                requeue.append((photo.id, photo.original_key))
+        db.commit()
+
+        for photo_id, original_key in requeue:
+            try:
+                path = _download_original(original_key)
+            except Exception as e:
+                logger.error(f"Could not re-read the original of maintenance photo {photo_id}: {str(e)}")
+                db.query(MaintenancePhoto).filter(MaintenancePhoto.id == photo_id).update(
+                    {"status": MaintenancePhotoStatus.FAILED}, synchronize_session=False
+                )
+                db.commit()
+                continue
+            _queue(photo_id, path, bind)
+
+        _remove_orphaned_spools(MAX_PROCESSING_AGE)
+        return len(requeue)
+    except Exception as e:
+        logger.error(f"Maintenance photo sweep failed: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+async def photo_recovery_loop(interval_seconds: int):
+    """Sweep for lost photo jobs every `interval_seconds`"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_in_threadpool(recover_stale_photos)
+
+
+def _signed(key: Optional[str]) -> Optional[str]:
+    return file_storage.generate_download_url(key) if key else None
+
+
+def photo_thumbnail(photo: MaintenancePhoto) -> dict:
+    return {
+        "id": str(photo.id),
+        "status": photo.status,
+        "thumbnail_url": _signed(photo.thumbnail_key),
+        "thumbnail_webp_url": _signed(photo.thumbnail_webp_key),
+    }
+
+
+def photo_detail(photo: MaintenancePhoto) -> dict:
+    """Full-size URLs for one photo, signed only when asked for"""
+    return {
+        **photo_thumbnail(photo),
+        "display_webp_url": _signed(photo.display_webp_key),
+        "original_url": _signed(photo.original_key),
+        "width": photo.width,
+        "height": photo.height,
+    }
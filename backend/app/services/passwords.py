@@ -0,0 +1,92 @@
+"""
+Password hashing off the request path.
+
+A bcrypt hash or verify is 100-300 ms of pure CPU. Run inline, a burst of
+logins (every tenant checking rent on the 1st) occupies the worker's
+threads and starves every other route. Here the work goes to a small
+process pool of its own, so bursts queue for the pool while the worker
+keeps serving other requests.
+
+A pool whose process died (OOM kill, crash) is broken for good, so it is
+replaced and the call retried once on the new one.
+
+The cost factor comes from BCRYPT_ROUNDS. Hashes made at any other cost
+are flagged on verify, and login stores the re-hashed password, so a cost
+change rolls out as users sign in.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def password_context(rounds: int) -> CryptContext:
+    # min == max == default, so a hash at any other cost needs an update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+# ============ RUN IN THE POOL ============
+# Module-level and settings-free so they pickle to the pool processes
+
+def _hash(password: str, rounds: int) -> str:
+    return password_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, password_hash: Optional[str], rounds: int) -> Tuple[bool, Optional[str]]:
+    if not password_hash:
+        return False, None
+    return password_context(rounds).verify_and_update(password, password_hash)
+
+
+@lru_cache()
+def _hash_pool() -> Optional[Executor]:
+    workers = get_settings().password_hash_workers
+    if workers <= 0:
+        return None
+    # Spawned, not forked: the parent holds database connections and threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def _in_pool(func, *args):
+    pool = _hash_pool()
+    if pool is None:
+        # PASSWORD_HASH_WORKERS=0: still keep bcrypt off the event loop
+        return await run_in_threadpool(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, partial(func, *args))
+    except BrokenProcessPool:
+        # Calls failing together replace the pool once; later ones find the new pool already cached
+        if _hash_pool() is pool:
+            logger.error("Password hashing pool broke; starting a new one")
+            _hash_pool.cache_clear()
+            pool.shutdown(wait=False)
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool(), partial(func, *args))
+
+
+async def hash_password(password: str) -> str:
+    return await _in_pool(_hash, password, get_settings().bcrypt_rounds)
+
+
+async def verify_password(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    (matches, new_hash): `new_hash` is set when the password matched but the
+    stored hash was made at a different cost and should be replaced.
+    """
+    return await _in_pool(_verify_and_update, password, password_hash, get_settings().bcrypt_rounds)
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
 from app.models.payment import Payment
 from app.models.tenant import Tenant
+from app.models.room import Room
+from app.models.unit import Unit
 from app.models.user import User
 from app.services.email_service import EmailService
 
@@ -17,12 +19,16 @@ class PaymentReminderService:
         """
         today = date.today()
         
-        # Get all pending and overdue payments
-        payments = db.query(Payment).filter(
+        # Get all pending and overdue payments with the tenant's user in one query
+        payments = db.query(Payment, User).join(
+            Tenant, Tenant.id == Payment.tenant_id
+        ).join(
+            User, User.id == Tenant.user_id
+        ).filter(
             Payment.status.in_(['pending', 'overdue'])
         ).all()
         
-        for payment in payments:
+        for payment, user in payments:
             days_until_due = (payment.due_date - today).days
             
             # Determine if we should send a reminder
@@ -38,29 +44,24 @@ class PaymentReminderService:
                 should_send = True  # Overdue
             
             if should_send:
-                # Get tenant info
-                tenant = db.query(Tenant).filter(Tenant.id == payment.tenant_id).first()
-                if tenant:
-                    user = db.query(User).filter(User.id == tenant.user_id).first()
-                    if user:
-                        try:
-                            tenant_name = f"{user.first_name} {user.last_name}" if user.first_name else user.email
-                            
-                            EmailService.send_payment_reminder(
-                                tenant_email=user.email,
-                                tenant_name=tenant_name,
-                                amount=float(payment.amount),
-                                due_date=payment.due_date,
-                                days_until_due=days_until_due
-                            )
-                            
-                            print(f"✅ Payment reminder sent to {user.email} (Due: {payment.due_date}, Days: {days_until_due})")
-                        except Exception as e:
-                            print(f"❌ Failed to send reminder to {user.email}: {str(e)}")
+                try:
+                    tenant_name = f"{user.first_name} {user.last_name}" if user.first_name else user.email
+                    
+                    EmailService.send_payment_reminder(
+                        tenant_email=user.email,
+                        tenant_name=tenant_name,
+                        amount=float(payment.amount),
+                        due_date=payment.due_date,
+                        days_until_due=days_until_due
+                    )
+                    
+                    print(f"✅ Payment reminder sent to {user.email} (Due: {payment.due_date}, Days: {days_until_due})")
+                except Exception as e:
+                    print(f"❌ Failed to send reminder to {user.email}: {str(e)}")
     
     @staticmethod
     def send_announcement_notifications(db: Session, announcement_id: str):
-        """Send announcement notifications to all tenants"""
+        """Send announcement notifications to the active tenants of the announcement's property"""
         from app.models.announcement import Announcement
         
         announcement = db.query(Announcement).filter(
@@ -70,23 +71,30 @@ class PaymentReminderService:
         if not announcement:
             return
         
-        # Get all active tenants
-        tenants = db.query(Tenant).filter(Tenant.status == 'active').all()
+        # Get the users of the property's active tenants
+        users = db.query(User).join(
+            Tenant, Tenant.user_id == User.id
+        ).join(
+            Room, Room.id == Tenant.room_id
+        ).join(
+            Unit, Unit.id == Room.unit_id
+        ).filter(
+            Unit.property_id == announcement.property_id,
+            Tenant.status == 'active'
+        ).all()
         
-        for tenant in tenants:
-            user = db.query(User).filter(User.id == tenant.user_id).first()
-            if user:
-                try:
-                    tenant_name = f"{user.first_name} {user.last_name}" if user.first_name else user.email
-                    
-                    EmailService.send_announcement_notification(
-                        tenant_email=user.email,
-                        tenant_name=tenant_name,
-                        announcement_title=announcement.title,
-                        announcement_content=announcement.content,
-                        announcement_date=announcement.created_at
-                    )
-                    
-                    print(f"✅ Announcement notification sent to {user.email}")
-                except Exception as e:
-                    print(f"❌ Failed to send announcement to {user.email}: {str(e)}")
+        for user in users:
+            try:
+                tenant_name = f"{user.first_name} {user.last_name}" if user.first_name else user.email
+                
+                EmailService.send_announcement_notification(
+                    tenant_email=user.email,
+                    tenant_name=tenant_name,
+                    announcement_title=announcement.title,
+                    announcement_content=announcement.message,
+                    announcement_date=announcement.created_at
+                )
+                
+                print(f"✅ Announcement notification sent to {user.email}")
+            except Exception as e:
+                print(f"❌ Failed to send announcement to {user.email}: {str(e)}")
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+from datetime import date, timedelta
+from itertools import chain
+from typing import Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select, delete, func, distinct, and_, or_, literal, union, inspect, Date
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, advisory_lock, dialect_insert
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room, RoomStatus
+from app.models.tenant import Tenant, TenantStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.maintenance import MaintenanceRequest, MaintenanceStatus
+from app.models.property_metrics import PropertyMetrics
+from app.services.response_cache import invalidate_on_commit
+from app.services.scope_versions import scope_key
+
+logger = logging.getLogger(__name__)
+
+LEASE_EXPIRATION_WINDOWS = (30, 60, 90)
+
+# Columns compared by reconciliation (everything except bookkeeping)
+METRIC_COLUMNS = [
+    "total_units", "total_rooms", "occupied_rooms", "vacant_rooms",
+    "potential_monthly", "actual_monthly",
+    "collected_this_month", "outstanding_this_month", "overdue_amount",
+    "open_maintenance", "expiring_30", "expiring_60", "expiring_90",
+]
+
+
+def metrics_tags(property_ids: Iterable) -> List[str]:
+    """Response cache tags of responses built from these properties' rollup rows"""
+    return [scope_key("metrics", pid) for pid in property_ids]
+
+
+def _month_bounds(today: date):
+    start = today.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def metrics_select(property_ids: Optional[Iterable] = None, today: date = None):
+    """
+    SELECT producing one property_metrics row per property.
+    Each part is aggregated per property in its own subquery so the joins
+    never multiply rows across parts.
+    """
+    today = today or date.today()
+    month_start, month_end = _month_bounds(today)
+    ids = list(property_ids) if property_ids is not None else None
+
+    def scoped(query, column):
+        return query.where(column.in_(ids)) if ids is not None else query
+
+    occupied = Room.status == RoomStatus.OCCUPIED
+    tree = scoped(select(
+        Unit.property_id.label("property_id"),
+        func.count(distinct(Unit.id)).label("total_units"),
+        func.count(Room.id).label("total_rooms"),
+        func.count(Room.id).filter(occupied).label("occupied_rooms"),
+        func.count(Room.id).filter(Room.status == RoomStatus.VACANT).label("vacant_rooms"),
+        func.sum(Room.rent_amount).label("potential_monthly"),
+        func.sum(Room.rent_amount).filter(occupied).label("actual_monthly"),
+    ).select_from(Unit).outerjoin(
+        Room, Room.unit_id == Unit.id
+    ), Unit.property_id).group_by(Unit.property_id).subquery()
+
+    paid = Payment.status == PaymentStatus.PAID
+    due_this_month = and_(Payment.due_date >= month_start, Payment.due_date < month_end)
+    amount_owed = Payment.amount + func.coalesce(Payment.late_fee, 0)
+    payments = scoped(select(
+        Unit.property_id.label("property_id"),
+        func.sum(Payment.amount).filter(paid, due_this_month).label("collected_this_month"),
+        func.sum(amount_owed).filter(~paid, due_this_month).label("outstanding_this_month"),
+        func.sum(amount_owed).filter(or_(
+            Payment.status == PaymentStatus.OVERDUE,
+            and_(Payment.status == PaymentStatus.PENDING, Payment.due_date < today),
+        )).label("overdue_amount"),
+    ).select_from(Payment).outerjoin(
+        Tenant, Tenant.id == Payment.tenant_id
+    ).join(
+        # A payment stays with the room it was charged for; only custom
+        # charges without a room follow the tenant
+        Room, Room.id == func.coalesce(Payment.room_id, Tenant.room_id)
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ), Unit.property_id).group_by(Unit.property_id).subquery()
+
+    maintenance = scoped(select(
+        MaintenanceRequest.property_id.label("property_id"),
+        func.count(MaintenanceRequest.id).label("open_maintenance"),
+    ).where(
+        MaintenanceRequest.status.in_([MaintenanceStatus.OPEN, MaintenanceStatus.IN_PROGRESS])
+    ), MaintenanceRequest.property_id).group_by(MaintenanceRequest.property_id).subquery()
+
+    leases = scoped(select(
+        Unit.property_id.label("property_id"),
+        *[
+            func.count(Tenant.id).filter(Tenant.lease_end <= today + timedelta(days=days)).label(f"expiring_{days}")
+            for days in LEASE_EXPIRATION_WINDOWS
+        ],
+    ).select_from(Tenant).join(
+        Room, Room.id == Tenant.room_id
+    ).join(
+        Unit, Unit.id == Room.unit_id
+    ).where(
+        Tenant.status == TenantStatus.ACTIVE,
+        Tenant.lease_end >= today,
+        Tenant.lease_end <= today + timedelta(days=max(LEASE_EXPIRATION_WINDOWS)),
+    ), Unit.property_id).group_by(Unit.property_id).subquery()
+
+    parts = {"total_units": tree, "total_rooms": tree, "occupied_rooms": tree, "vacant_rooms": tree,
+             "potential_monthly": tree, "actual_monthly": tree,
+             "collected_this_month": payments, "outstanding_this_month": payments, "overdue_amount": payments,
+             "open_maintenance": maintenance,
+             "expiring_30": leases, "expiring_60": leases, "expiring_90": leases}
+
+    query = select(
+        Property.id.label("property_id"),
+        *[func.coalesce(part.c[name], 0).label(name) for name, part in parts.items()],
+        literal(today, Date).label("as_of"),
+    ).select_from(Property)
+    for part in (tree, payments, maintenance, leases):
+        query = query.outerjoin(part, part.c.property_id == Property.id)
+
+    return scoped(query, Property.id)
+
+
+class PropertyMetricsService:
+    @staticmethod
+    def refresh(connection, property_ids: Iterable) -> None:
+        """
+        Recompute the rollup rows for the given properties. Written as an
+        upsert so concurrent refreshes of the same property never collide;
+        rows of deleted properties go with the ON DELETE CASCADE.
+        """
+        ids = list(set(property_ids))
+        if not ids:
+            return
+
+        query = metrics_select(ids)
+        names = [c.name for c in query.selected_columns]
+        statement = dialect_insert(connection)(PropertyMetrics.__table__).from_select(names, query)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["property_id"],
+            set_={
+                **{name: statement.excluded[name] for name in names if name != "property_id"},
+                "refreshed_at": func.now(),
+            },
+        ))
+
+    @staticmethod
+    def reconcile(db: Session) -> dict:
+        """
+        Recompute every property and fix rows that drifted, for example after
+        bulk UPDATEs that bypass ORM events. Returns what was corrected.
+        """
+        table = PropertyMetrics.__table__
+        fresh = {row.property_id: row for row in db.execute(metrics_select())}
+        stored = {row.property_id: row for row in db.execute(select(table))}
+
+        missing = [pid for pid in fresh if pid not in stored]
+        orphaned = [pid for pid in stored if pid not in fresh]
+        drifted = [
+            pid for pid, row in fresh.items()
+            if pid in stored and (
+                stored[pid].as_of != row.as_of
+                or any(float(getattr(stored[pid], c)) != float(getattr(row, c)) for c in METRIC_COLUMNS)
+            )
+        ]
+
+        connection = db.connection()
+        if orphaned:
+            connection.execute(delete(table).where(table.c.property_id.in_(orphaned)))
+        PropertyMetricsService.refresh(connection, missing + drifted)
+        invalidate_on_commit(db, metrics_tags(missing + drifted))
+        db.commit()
+
+        if missing or drifted or orphaned:
+            logger.info(
+                "Property metrics reconciled: %d missing, %d drifted, %d orphaned",
+                len(missing), len(drifted), len(orphaned),
+            )
+        return {
+            "checked": len(fresh),
+            "missing": [str(pid) for pid in missing],
+            "drifted": [str(pid) for pid in drifted],
+            "orphaned": [str(pid) for pid in orphaned],
+        }
+
+    @staticmethod
+    def ensure_current(db: Session, property_ids: Iterable, rows: Iterable) -> bool:
+        """Refresh properties whose row is missing or from an earlier day; True if anything was refreshed"""
+        today = date.today()
+        current = {row.property_id for row in rows if row.as_of == today}
+        stale = [pid for pid in property_ids if pid not in current]
+        if not stale:
+            return False
+        PropertyMetricsService.refresh(db.connection(), stale)
+        invalidate_on_commit(db, metrics_tags(stale))
+        db.commit()
+        return True
+
+
+# ============ INCREMENTAL REFRESH ============
+
+# Foreign keys that place each watched model in the property tree
+_PARENT_KEYS = {
+    Property: [("property", "id")],
+    Unit: [("property", "property_id")],
+    MaintenanceRequest: [("property", "property_id")],
+    Room: [("unit", "unit_id")],
+    Tenant: [("room", "room_id")],
+    Payment: [("room", "room_id"), ("tenant", "tenant_id")],
+}
+
+
+def _key_values(obj, attr):
+    """Current and previous values of a key, so moves refresh both sides"""
+    history = inspect(obj).attrs[attr].history
+    return [v for v in chain(history.added, history.unchanged, history.deleted) if v is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_properties(session, flush_context):
+    touched = session.info.setdefault("property_metrics_touched", {})
+    for obj in chain(session.new, session.dirty, session.deleted):
+        for kind, attr in _PARENT_KEYS.get(type(obj), ()):
+            touched.setdefault(kind, set()).update(_key_values(obj, attr))
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_touched_properties(session):
+    # Recompute once per transaction rather than once per flush
+    session.flush()
+    touched = session.info.pop("property_metrics_touched", None)
+    if not touched:
+        return
+
+    property_ids = set(touched.get("property", ()))
+    lookups = []
+    if touched.get("unit"):
+        lookups.append(select(Unit.property_id).where(Unit.id.in_(touched["unit"])))
+    if touched.get("room"):
+        lookups.append(select(Unit.property_id).join(Room, Room.unit_id == Unit.id)
+                       .where(Room.id.in_(touched["room"])))
+    if touched.get("tenant"):
+        lookups.append(select(Unit.property_id).join(Room, Room.unit_id == Unit.id)
+                       .join(Tenant, Tenant.room_id == Room.id)
+                       .where(Tenant.id.in_(touched["tenant"])))
+
+    connection = session.connection()
+    if lookups:
+        property_ids.update(connection.execute(union(*lookups)).scalars())
+
+    PropertyMetricsService.refresh(connection, property_ids)
+    invalidate_on_commit(session, metrics_tags(property_ids))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_touched_properties(session, previous_transaction):
+    session.info.pop("property_metrics_touched", None)
+
+
+# ============ PERIODIC RECONCILIATION ============
+
+def reconcile_once(bind=None) -> Optional[dict]:
+    """Reconcile unless another worker is already at it (then None)"""
+    with advisory_lock("property_metrics_reconcile", bind) as acquired:
+        if not acquired:
+            return None
+        db = Session(bind=bind) if bind is not None else SessionLocal()
+        try:
+            return PropertyMetricsService.reconcile(db)
+        finally:
+            db.close()
+
+
+async def reconciliation_loop(interval_seconds: int):
+    """Reconcile once at startup and then every `interval_seconds`, in one worker at a time"""
+    while True:
+        try:
+            await run_in_threadpool(reconcile_once)
+        except Exception as e:
+            logger.error(f"Property metrics reconciliation failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    # One-off reconciliation, e.g. from cron: python -m app.services.property_metrics
+    db = SessionLocal()
+    try:
+        print(PropertyMetricsService.reconcile(db))
+    finally:
+        db.close()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func, literal, literal_column, true, Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.database import SessionLocal, advisory_lock, dialect_insert
+from app.models.property import Property
+from app.models.property_snapshot import PropertySnapshot
+from app.services.property_metrics import metrics_select
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = ("day", "week", "month")
+
+
+class bucket_start(FunctionElement):
+    """First day of the week (Monday) or month containing a date"""
+    type = Date()
+    name = "bucket_start"
+    inherit_cache = True
+
+
+@compiles(bucket_start)
+def _compile_bucket_start(element, compiler, **kw):
+    unit, value = element.clauses.clauses
+    return f"CAST(date_trunc({compiler.process(unit, **kw)}, {compiler.process(value, **kw)}) AS DATE)"
+
+
+class PropertySnapshotService:
+    @staticmethod
+    def capture(db: Session, day: Optional[date] = None) -> int:
+        """
+        Write (or overwrite) every property's snapshot for `day`, computed from
+        the live tables. Re-running on the same day keeps the latest figures.
+        """
+        day = day or date.today()
+        metrics = metrics_select(today=day).subquery()
+        query = select(
+            metrics.c.property_id,
+            literal(day, Date).label("snapshot_date"),
+            metrics.c.total_rooms,
+            metrics.c.occupied_rooms,
+            metrics.c.vacant_rooms,
+            metrics.c.actual_monthly.label("rent_roll"),
+            metrics.c.collected_this_month.label("collected"),
+            metrics.c.overdue_amount.label("overdue"),
+        ).where(true())  # keeps INSERT ... SELECT ... ON CONFLICT unambiguous on SQLite
+
+        connection = db.connection()
+        names = [c.name for c in query.selected_columns]
+        statement = dialect_insert(connection)(PropertySnapshot.__table__).from_select(names, query)
+        result = connection.execute(statement.on_conflict_do_update(
+            index_elements=["property_id", "snapshot_date"],
+            set_={name: statement.excluded[name] for name in names[2:]},
+        ))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def history(db: Session, operator_id, start: date, end: date,
+                bucket: str = "month", property_id: Optional[str] = None) -> list:
+        """
+        Portfolio (or single property) time series between `start` and `end`,
+        one point per bucket. Stock figures are the bucket's closing values
+        (its last captured day); occupancy is also averaged over the bucket.
+        `collected` is month-to-date, so month buckets carry the month total.
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket}")
+
+        snapshot = PropertySnapshot
+        scope = [Property.operator_id == operator_id,
+                 snapshot.snapshot_date >= start, snapshot.snapshot_date <= end]
+        if property_id:
+            scope.append(snapshot.property_id == property_id)
+
+        daily = select(
+            snapshot.snapshot_date,
+            func.sum(snapshot.total_rooms).label("total_rooms"),
+            func.sum(snapshot.occupied_rooms).label("occupied_rooms"),
+            func.sum(snapshot.vacant_rooms).label("vacant_rooms"),
+            func.sum(snapshot.rent_roll).label("rent_roll"),
+            func.sum(snapshot.collected).label("collected"),
+            func.sum(snapshot.overdue).label("overdue"),
+        ).join(
+            Property, Property.id == snapshot.property_id
+        ).where(*scope).group_by(snapshot.snapshot_date).cte("daily")
+
+        # The unit is inlined rather than bound so GROUP BY matches the select list
+        period = daily.c.snapshot_date if bucket == "day" else \
+            bucket_start(literal_column(f"'{bucket}'"), daily.c.snapshot_date)
+        buckets = select(
+            period.label("period_start"),
+            func.count().label("days"),
+            func.avg(daily.c.occupied_rooms).label("avg_occupied"),
+            func.avg(daily.c.total_rooms).label("avg_total"),
+            func.max(daily.c.snapshot_date).label("closing_date"),
+        ).group_by(period).subquery()
+
+        rows = db.execute(
+            select(buckets, daily).join(
+                daily, daily.c.snapshot_date == buckets.c.closing_date
+            ).order_by(buckets.c.period_start)
+        ).all()
+
+        return [
+            {
+                "period_start": row.period_start.isoformat(),
+                "days": row.days,
+                "total_rooms": row.total_rooms,
+                "occupied_rooms": row.occupied_rooms,
+                "vacant_rooms": row.vacant_rooms,
+                "average_occupancy_rate": round(float(row.avg_occupied) / float(row.avg_total) * 100, 1)
+                if row.avg_total else 0,
+                "rent_roll": float(row.rent_roll),
+                "collected": float(row.collected),
+                "overdue": float(row.overdue),
+            }
+            for row in rows
+        ]
+
+
+# ============ DAILY CAPTURE ============
+
+def capture_once(bind=None) -> Optional[int]:
+    """Capture today's snapshots unless another worker is already at it (then None)"""
+    with advisory_lock("property_snapshots_capture", bind) as acquired:
+        if not acquired:
+            return None
+        db = Session(bind=bind) if bind is not None else SessionLocal()
+        try:
+            return PropertySnapshotService.capture(db)
+        finally:
+            db.close()
+
+
+async def snapshot_loop(interval_seconds: int):
+    """Capture today's snapshot at startup and then every `interval_seconds`, in one worker at a time"""
+    while True:
+        try:
+            await run_in_threadpool(capture_once)
+        except Exception as e:
+            logger.error(f"Property snapshot capture failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    # One-off capture, e.g. from a daily cron: python -m app.services.property_snapshots
+    db = SessionLocal()
+    try:
+        print(f"Captured {PropertySnapshotService.capture(db)} property snapshots")
+    finally:
+        db.close()
@@ -0,0 +1,258 @@
+"""
+Token-bucket rate limiting for the credential routes.
+
+Every login or signup attempt costs a bcrypt hash, so brute force and
+credential stuffing turn straight into CPU. Each limited route has two
+buckets per attempt: one for the client IP and one for the account (the
+email submitted). A bucket holds `requests` tokens and refills evenly over
+`seconds`; an attempt takes a token from both, and an empty bucket answers
+429 with Retry-After. The check is a route dependency, so a rejected
+attempt never opens a database session or reaches the hashing pool.
+
+Limits are per route in Settings (RATE_LIMIT_<ROUTE>_IP / _ACCOUNT, as
+"<requests>/<seconds>"). The memory store counts per process, so with N
+workers an address gets up to N times its limit (the launcher warns about
+this); the redis store shares buckets across workers and hosts.
+
+The client address is read from the right of X-Forwarded-For, where the
+platform proxy appended it (FORWARDED_CLIENT_HOPS). `request.client` is no
+use here: the proxy-headers middleware sets it from the left-most entry,
+which the client writes itself.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ROUTES = ("login", "signup")
+
+
+@dataclass(frozen=True)
+class Limit:
+    requests: int
+    seconds: int
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second"""
+        return self.requests / self.seconds
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["Limit"]:
+        """'5/300' -> 5 attempts per 300 seconds; empty or '0' disables the bucket"""
+        value = (value or "").strip()
+        if not value or value == "0":
+            return None
+        requests, _, seconds = value.partition("/")
+        limit = cls(int(requests), int(seconds or 1))
+        if limit.requests <= 0 or limit.seconds <= 0:
+            raise ValueError(f"Invalid rate limit {value!r}, expected '<requests>/<seconds>'")
+        return limit
+
+
+# ============ STORES ============
+
+class MemoryBucketStore:
+    """
+    In-process buckets in a dict ordered by last use. A bucket left alone
+    until it refills is the same as no bucket, so entries expire then; the
+    oldest are also dropped past `max_keys`, which bounds memory under a
+    spray of distinct IPs or emails.
+    """
+    in_process = True
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at, full_at)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        """Take one token: (allowed, seconds until the next token when not)"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            tokens, updated_at, _ = self._buckets.pop(key, (limit.requests, now, now))
+            tokens = min(limit.requests, tokens + (now - updated_at) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (limit.requests - tokens) / limit.rate)
+            return allowed, 0.0 if allowed else (1 - tokens) / limit.rate
+
+    def _evict(self, now: float) -> None:
+        # Least recently used first; stop at the first bucket still refilling
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now and len(self._buckets) < self.max_keys:
+                break
+            del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Refill, take and re-arm the expiry in one step on the server, on the server's clock
+_TAKE_SCRIPT = """
+local requests = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or requests
+local updated = tonumber(state[2]) or now
+tokens = math.min(requests, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((requests - tokens) / rate * 1000) + 1)
+return {allowed, tostring((1 - tokens) / rate)}
+"""
+
+
+class RedisBucketStore:
+    """
+    Adapter for any client speaking the Redis protocol (redis-py, valkey, ...),
+    so every worker draws from the same buckets. Each bucket is a hash that
+    expires once it would be full again.
+    """
+    in_process = False
+
+    def __init__(self, client, prefix: str = "coliv:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBucketStore":
+        import redis  # only needed when this store is configured
+
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        allowed, retry_after = self._take(keys=[self.prefix + key], args=[limit.requests, limit.rate])
+        return bool(allowed), 0.0 if allowed else float(retry_after)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+# ============ LIMITER ============
+
+class RateLimiter:
+    def __init__(self, store, limits: Dict[str, Dict[str, Optional[Limit]]]):
+        self.store = store
+        # route -> {"ip": Limit, "account": Limit}
+        self.limits = limits
+
+    def _take_all(self, route: str, ip: Optional[str], account: Optional[str]) -> float:
+        """Seconds to wait when a bucket is empty, 0 when the attempt may go ahead"""
+        limits = self.limits.get(route, {})
+        for kind, subject in (("ip", ip), ("account", account)):
+            limit = limits.get(kind)
+            if limit is None or not subject:
+                continue
+            allowed, retry_after = self.store.take(f"{route}:{kind}:{subject}", limit)
+            # An IP already out of tokens does not also drain the account's bucket
+            if not allowed:
+                return retry_after
+        return 0.0
+
+    async def check(self, route: str, ip: Optional[str], account: Optional[str]) -> None:
+        """Raise 429 when the IP or the account has no attempts left on `route`"""
+        if self.store is None:
+            return
+        account = account.strip().lower() if account else None
+        try:
+            if self.store.in_process:
+                retry_after = self._take_all(route, ip, account)
+            else:
+                retry_after = await run_in_threadpool(self._take_all, route, ip, account)
+        except Exception as e:
+            # A store outage must not lock everyone out
+            logger.error(f"Rate limit check failed: {str(e)}")
+            return
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def route_limits(settings) -> Dict[str, Dict[str, Optional[Limit]]]:
+    return {
+        route: {
+            "ip": Limit.parse(getattr(settings, f"rate_limit_{route}_ip")),
+            "account": Limit.parse(getattr(settings, f"rate_limit_{route}_account")),
+        }
+        for route in ROUTES
+    }
+
+
+def _make_store(settings):
+    if settings.rate_limit_backend == "none":
+        return None
+    if settings.rate_limit_backend == "redis":
+        return RedisBucketStore.from_url(settings.rate_limit_url)
+    return MemoryBucketStore(settings.rate_limit_max_keys)
+
+
+_settings = get_settings()
+rate_limiter = RateLimiter(_make_store(_settings), route_limits(_settings))
+
+
+async def _submitted(request: Request, field: str) -> Optional[str]:
+    """`field` from the form or JSON body, which FastAPI has already read and cached"""
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            body = await request.json()
+        else:
+            body = await request.form()
+        value = body.get(field) if hasattr(body, "get") else None
+    except Exception:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def client_ip(request: Request, hops: Optional[int] = None) -> Optional[str]:
+    """
+    The address the `hops`-th proxy from us saw the request come from: the
+    `hops`-th X-Forwarded-For entry from the right. Entries further left are
+    whatever the client sent. Falls back to the connecting address.
+    """
+    hops = get_settings().forwarded_client_hops if hops is None else hops
+    if hops > 0:
+        forwarded = [host.strip() for host in request.headers.get("x-forwarded-for", "").split(",") if host.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else None
+
+
+def rate_limited(route: str, account_field: str):
+    """
+    Route dependency: take an attempt from the client IP's and the account's
+    bucket for `route`, where the account is `account_field` of the body.
+    """
+    async def check_rate_limit(request: Request):
+        await rate_limiter.check(route, client_ip(request), await _submitted(request, account_field))
+
+    return check_rate_limit
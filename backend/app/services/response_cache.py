@@ -0,0 +1,322 @@
+"""
+Server-side cache for JSON responses that many requests share.
+
+Entries are keyed by route, scope and parameters and tagged with the scopes
+they were built from (see app.services.scope_versions). A commit that
+touches a scope drops every entry carrying its tag; the TTL bounds anything
+the tags can't see, such as the date rolling over.
+
+Tag invalidation only reaches other workers through a shared backend. Routes
+whose scopes are known up front also pass the scope versions they read, which
+go into the key: after a write, every worker computes a new key, so an entry
+built from older data is never served, whichever process built it.
+"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Stats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# ============ BACKENDS ============
+
+class LRUCacheBackend:
+    """In-process LRU bounded by entry count and total payload bytes"""
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (payload, tags, expires_at)
+        self._tags: Dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[2] < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0]
+
+    def set(self, key: str, payload: bytes, tags: Iterable[str], ttl: int) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (payload, tags, time.monotonic() + ttl)
+            self._bytes += len(payload)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._drop(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+            self._stats = _Stats()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "bytes": self._bytes,
+                    **self._stats.as_dict()}
+
+    def _drop(self, key: str) -> None:
+        payload, tags, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """
+    Adapter for any client speaking the Redis protocol (redis-py, valkey, ...).
+    Entries expire through the server's TTL and each tag is a set of keys;
+    evictions are the server's own evicted_keys counter.
+    """
+
+    def __init__(self, client, prefix: str = "coliv:cache:"):
+        self.client = client
+        self.prefix = prefix
+        self._stats = _Stats()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        import redis  # only needed when this backend is configured
+
+        return cls(redis.Redis.from_url(url))
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return payload
+
+    def set(self, key: str, payload: bytes, tags: Iterable[str], ttl: int) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self.prefix + key, payload, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            pipe.expire(self._tag_key(tag), ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = self.client.smembers(tag_key)
+            if keys:
+                dropped += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        self._stats.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+        self._stats = _Stats()
+
+    def stats(self) -> dict:
+        stats = self._stats.as_dict()
+        try:
+            stats["evictions"] = int(self.client.info("stats").get("evicted_keys", 0))
+        except Exception as e:
+            logger.warning(f"Could not read cache server stats: {str(e)}")
+        return {"backend": "redis", **stats}
+
+
+# ============ CACHE ============
+
+class ResponseCache:
+    def __init__(self, backend, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        # Logical clock so a response built while one of its tags was invalidated in this process is not
+        # stored. Invalidations are only remembered while a build that started before them is running.
+        self._clock = count(1)
+        self._invalidated_at: Dict[str, int] = {}
+        self._building = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(route: str, scope: str, params: Optional[dict] = None,
+            versions: Optional[Mapping[str, int]] = None) -> str:
+        items = [(name, str(value)) for name, value in (params or {}).items() if value is not None]
+        items += [(f"v:{scope_name}", str(version)) for scope_name, version in (versions or {}).items()]
+        return f"{route}|{scope}|{urlencode(sorted(items))}"
+
+    def cached(self, route: str, scope: str, build: Callable[[], Any], params: Optional[dict] = None,
+               tags: Iterable[str] = (), headers: Optional[Mapping[str, str]] = None,
+               versions: Optional[Mapping[str, int]] = None) -> Response:
+        """
+        Serve route+scope+params from the cache, or call `build` and cache its
+        result. `build` may return (data, extra_tags) when some tags are only
+        known after the query ran. `versions` are scope versions read before
+        building, stamped into the key. `headers` (e.g. an ETag) are added to
+        the response either way.
+        """
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() != "content-length"}
+        if self.backend is None:
+            return self._response(self._encode(self._unpack(build(), tags)[0]), "BYPASS", headers)
+
+        key = self.key(route, scope, params, versions)
+        try:
+            payload = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Response cache read failed: {str(e)}")
+            payload = None
+        if payload is not None:
+            return self._response(payload, "HIT", headers)
+
+        with self._lock:
+            started = next(self._clock)
+            self._building[started] += 1
+        try:
+            data, tags = self._unpack(build(), tags)
+        finally:
+            with self._lock:
+                self._building[started] -= 1
+                if not self._building[started]:
+                    del self._building[started]
+        payload = self._encode(data)
+        with self._lock:
+            fresh = all(self._invalidated_at.get(tag, 0) < started for tag in tags)
+        if fresh:
+            try:
+                self.backend.set(key, payload, tags, self.ttl_seconds)
+            except Exception as e:
+                logger.error(f"Response cache write failed: {str(e)}")
+        return self._response(payload, "MISS", headers)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        if not tags or self.backend is None:
+            return
+        with self._lock:
+            now = next(self._clock)
+            # Only builds still running can be stale; forget invalidations none of them predates
+            oldest = min(self._building, default=now)
+            self._invalidated_at = {tag: at for tag, at in self._invalidated_at.items() if at > oldest}
+            if self._building:
+                self._invalidated_at.update((tag, now) for tag in tags)
+        try:
+            self.backend.invalidate(tags)
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidated_at.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        if self.backend is None:
+            return {"backend": "none"}
+        return {**self.backend.stats(), "ttl_seconds": self.ttl_seconds}
+
+    @staticmethod
+    def _unpack(result, tags):
+        if isinstance(result, tuple):
+            data, extra = result
+            return data, set(tags) | set(extra)
+        return result, set(tags)
+
+    @staticmethod
+    def _encode(data) -> bytes:
+        # orjson handles UUIDs, dates and enums natively; anything else (Decimal) goes through FastAPI's encoder
+        return orjson.dumps(data, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def _response(payload: bytes, outcome: str, headers: dict) -> Response:
+        return Response(content=payload, media_type="application/json", headers={**headers, "X-Cache": outcome})
+
+
+def _make_backend(settings):
+    if settings.response_cache_backend == "none":
+        return None
+    if settings.response_cache_backend == "redis":
+        return RedisCacheBackend.from_url(settings.response_cache_url)
+    return LRUCacheBackend(settings.response_cache_max_entries, settings.response_cache_max_bytes)
+
+
+_settings = get_settings()
+response_cache = ResponseCache(_make_backend(_settings), _settings.response_cache_ttl_seconds)
+
+
+# ============ INVALIDATION ON COMMIT ============
+
+def invalidate_on_commit(session: Session, tags: Iterable[str]) -> None:
+    """Drop cache entries with these tags once the session's transaction commits"""
+    session.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_cache_tags(session, previous_transaction):
+    session.info.pop("response_cache_tags", None)
@@ -0,0 +1,159 @@
+"""
+Version stamps for conditional GETs and response cache invalidation.
+
+Every write that goes through the ORM bumps a counter for each scope it
+touches (a property, an operator's property list, a tenant). Read endpoints
+hash the counters of the scopes they depend on into a strong ETag, so a
+revalidation costs one primary-key lookup instead of the full query. The
+same scopes are the tags of cached responses, dropped once the write commits.
+"""
+import hashlib
+import uuid
+from itertools import chain
+from typing import Dict, Iterable
+
+from sqlalchemy import event, select, inspect, func, union
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room
+from app.models.user import User
+from app.models.tenant import Tenant
+from app.models.announcement import Announcement
+from app.models.document import Document
+from app.models.scope_version import ScopeVersion
+from app.services.response_cache import invalidate_on_commit
+
+
+def scope_key(kind: str, key) -> str:
+    # Keys arrive as UUIDs or strings depending on the caller; normalise them
+    return f"{kind}:{uuid.UUID(str(key))}"
+
+
+class ScopeVersionService:
+    @staticmethod
+    def bump(connection, scopes: Iterable[str]) -> None:
+        """Increment the counters for the given scopes, creating them as needed"""
+        scopes = sorted(set(scopes))
+        if not scopes:
+            return
+
+        table = ScopeVersion.__table__
+        statement = dialect_insert(connection)(table).values([{"scope": scope, "version": 1} for scope in scopes])
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["scope"],
+            set_={"version": table.c.version + 1, "updated_at": func.now()},
+        ))
+
+    @staticmethod
+    def touch(db: Session, scopes: Iterable[str]) -> None:
+        """For writes that bypass the ORM hooks, such as set-based UPDATEs"""
+        scopes = list(scopes)
+        ScopeVersionService.bump(db.connection(), scopes)
+        invalidate_on_commit(db, scopes)
+
+    @staticmethod
+    def versions(db: Session, scopes: Iterable[str]) -> Dict[str, int]:
+        scopes = list(scopes)
+        rows = db.execute(select(ScopeVersion.scope, ScopeVersion.version).where(ScopeVersion.scope.in_(scopes)))
+        found = dict(rows.all())
+        return {scope: found.get(scope, 0) for scope in scopes}
+
+    @staticmethod
+    def etag(db: Session, resource: str, *scopes: str) -> str:
+        """Strong ETag for `resource` as seen through the given scopes"""
+        return ScopeVersionService.etag_for(resource, ScopeVersionService.versions(db, scopes))
+
+    @staticmethod
+    def etag_for(resource: str, versions: Dict[str, int]) -> str:
+        """The same ETag from versions already read, e.g. the ones a cache key was stamped with"""
+        stamp = ";".join(f"{scope}={versions[scope]}" for scope in sorted(versions))
+        return '"' + hashlib.sha1(f"{resource}|{stamp}".encode()).hexdigest() + '"'
+
+
+# ============ BUMP ON WRITE ============
+
+# Scopes each watched model belongs to, as (kind, foreign key attribute)
+_SCOPE_KEYS = {
+    Property: [("property", "id"), ("operator", "operator_id")],
+    Unit: [("property", "property_id")],
+    Room: [("unit", "unit_id")],
+    Tenant: [("tenant", "id"), ("room", "room_id")],
+    Announcement: [("property", "property_id")],
+    Document: [("property", "property_id"), ("tenant", "tenant_id")],
+    # Tenants' names and emails appear in room and tenant responses
+    User: [("user", "id")],
+}
+
+# Updates to these models only count when one of the listed columns changed;
+# a login re-hashing a password must not invalidate the tenant's property
+_WATCHED_COLUMNS = {
+    User: ("first_name", "last_name", "email"),
+}
+
+
+def _changed(obj) -> bool:
+    columns = _WATCHED_COLUMNS.get(type(obj))
+    if columns is None:
+        return True
+    state = inspect(obj)
+    return state.pending or state.deleted or state.was_deleted or any(
+        state.attrs[column].history.has_changes() for column in columns
+    )
+
+
+def _key_values(obj, attr):
+    """Current and previous values of a key, so moves bump both sides"""
+    history = inspect(obj).attrs[attr].history
+    return [v for v in chain(history.added, history.unchanged, history.deleted) if v is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_scopes(session, flush_context):
+    touched = session.info.setdefault("scope_versions_touched", {})
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not _changed(obj):
+            continue
+        for kind, attr in _SCOPE_KEYS.get(type(obj), ()):
+            touched.setdefault(kind, set()).update(_key_values(obj, attr))
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_touched_scopes(session):
+    session.flush()
+    touched = session.info.pop("scope_versions_touched", None)
+    if not touched:
+        return
+
+    connection = session.connection()
+    # Users reach their property through their tenant row's room
+    users = touched.pop("user", None)
+    if users:
+        for tenant_id, room_id in connection.execute(
+            select(Tenant.id, Tenant.room_id).where(Tenant.user_id.in_(users))
+        ):
+            touched.setdefault("tenant", set()).add(tenant_id)
+            touched.setdefault("room", set()).add(room_id)
+    if not touched:
+        return
+
+    # Rooms and tenants only reach their property through the unit
+    lookups = []
+    units, rooms = touched.pop("unit", None), touched.pop("room", None)
+    if units:
+        lookups.append(select(Unit.property_id).where(Unit.id.in_(units)))
+    if rooms:
+        lookups.append(select(Unit.property_id).join(Room, Room.unit_id == Unit.id).where(Room.id.in_(rooms)))
+    if lookups:
+        touched.setdefault("property", set()).update(connection.execute(union(*lookups)).scalars())
+
+    scopes = [scope_key(kind, key) for kind, keys in touched.items() for key in keys]
+    ScopeVersionService.bump(connection, scopes)
+    invalidate_on_commit(session, scopes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_touched_scopes(session, previous_transaction):
+    session.info.pop("scope_versions_touched", None)
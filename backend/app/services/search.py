@@ -0,0 +1,216 @@
+import re
+from typing import Iterable, List
+
+from sqlalchemy import select, func, or_, and_, case, literal, literal_column, Float
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.tenant import Tenant
+from app.models.room import Room
+from app.models.unit import Unit
+from app.models.property import Property
+from app.models.message import Message
+from app.models.maintenance import MaintenanceRequest
+from app.models.document import Document
+
+SEARCH_TYPES = ("tenant", "room", "message", "maintenance", "document")
+MIN_QUERY_LENGTH = 2
+# How a hit matched, weakest first. Results are ordered by match class before rank,
+# since ranks from different tables (ts_rank, similarity, constants) are not comparable
+MATCH_CLASSES = ("fuzzy", "prefix", "exact")
+FUZZY, PREFIX, EXACT = range(len(MATCH_CLASSES))
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def _normalized(hits: List[dict]) -> List[dict]:
+    """Scale one type's ranks to 0-1 relative to its best hit"""
+    top = max((hit["rank"] for hit in hits), default=0)
+    if top > 0:
+        for hit in hits:
+            hit["rank"] = hit["rank"] / top
+    return hits
+
+
+class _Matcher:
+    """
+    Builds the WHERE condition, rank and match class for one searchable table.
+
+    On Postgres this uses the table's generated `search_vector` column
+    (GIN indexed) with a prefix tsquery, plus pg_trgm similarity on the
+    columns listed as fuzzy. Other databases fall back to ILIKE on the
+    plain columns so the endpoint still works, unranked, in tests.
+    Columns listed as exact put hits equal to the whole query in the
+    EXACT class on every database.
+    """
+
+    def __init__(self, dialect: str, query: str):
+        self.postgres = dialect == "postgresql"
+        self.raw = query.strip()
+        self.terms = _terms(query)
+        # 'simple' config: names and emails must not be stemmed; every term is a prefix for type-ahead
+        self.tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in self.terms))
+
+    def full_text(self, table: str, columns: Iterable, fuzzy: Iterable = (), exact: Iterable = ()):
+        columns, fuzzy = list(columns), list(fuzzy)
+        if not self.postgres:
+            condition, rank = self._ilike(columns, "%{}%")
+            return condition, rank, self._match(exact, literal(PREFIX))
+
+        vector = literal_column(f"{table}.search_vector")
+        terms_match = vector.op("@@")(self.tsquery)
+        condition = terms_match
+        rank = func.ts_rank(vector, self.tsquery)
+        if fuzzy:
+            condition = or_(condition, *[column.op("%")(self.raw) for column in fuzzy])
+            rank = func.greatest(rank, *[func.similarity(column, self.raw) for column in fuzzy])
+        # Without the tsquery matching, the row was found by trigram similarity alone
+        return condition, rank, self._match(exact, case((terms_match, PREFIX), else_=FUZZY))
+
+    def prefix(self, columns: Iterable, exact: Iterable = ()):
+        """Short codes such as room and unit numbers: prefix match, exact matches first"""
+        condition, _ = self._ilike(list(columns), "{}%")
+        rank = case(*[(func.lower(column) == self.raw.lower(), 1.0) for column in exact], else_=0.5)
+        return condition, rank, self._match(exact, literal(PREFIX))
+
+    def _match(self, exact: Iterable, otherwise):
+        """EXACT where one of the exact columns equals the whole query, else `otherwise`"""
+        whens = [(func.lower(column) == self.raw.lower(), EXACT) for column in exact]
+        return case(*whens, else_=otherwise) if whens else otherwise
+
+    def _ilike(self, columns, pattern: str):
+        condition = and_(*[
+            or_(*[column.ilike(pattern.format(term)) for column in columns])
+            for term in self.terms
+        ])
+        return condition, literal(1.0, Float)
+
+
+class SearchService:
+    @staticmethod
+    def search(db: Session, user: User, query: str, types: Iterable[str] = SEARCH_TYPES, limit: int = 10) -> List[dict]:
+        """
+        Ranked search across the operator's tenants, rooms, messages,
+        maintenance requests and documents; at most `limit` hits per type.
+        Hits are ordered by match class, then by rank scaled to 0-1 within
+        their type.
+        """
+        if len(query.strip()) < MIN_QUERY_LENGTH or not _terms(query):
+            return []
+
+        operator_id = user.operator.id
+        match = _Matcher(db.get_bind().dialect.name, query)
+        owned = Property.operator_id == operator_id
+        results = []
+
+        if "tenant" in types:
+            condition, rank, matched = match.full_text(
+                "users", [User.first_name, User.last_name, User.email],
+                fuzzy=[User.email, User.first_name, User.last_name],
+                exact=[User.email, User.first_name, User.last_name],
+            )
+            rows = db.execute(
+                select(Tenant.id, User.first_name, User.last_name, User.email, Room.room_number,
+                       Unit.unit_number, Property.id.label("property_id"), rank.label("rank"), matched.label("match"))
+                .join(User, User.id == Tenant.user_id)
+                .join(Room, Room.id == Tenant.room_id)
+                .join(Unit, Unit.id == Room.unit_id)
+                .join(Property, Property.id == Unit.property_id)
+                .where(owned, condition).order_by(matched.desc(), rank.desc()).limit(limit)
+            )
+            results += _normalized([{
+                "type": "tenant",
+                "id": str(row.id),
+                "title": " ".join(filter(None, [row.first_name, row.last_name])) or row.email,
+                "subtitle": f"{row.email} · Unit {row.unit_number}, Room {row.room_number}",
+                "property_id": str(row.property_id),
+                "rank": float(row.rank),
+                "match": row.match,
+            } for row in rows])
+
+        if "room" in types:
+            condition, rank, matched = match.prefix([Room.room_number, Unit.unit_number],
+                                           exact=[Room.room_number, Unit.unit_number])
+            rows = db.execute(
+                select(Room.id, Room.room_number, Room.status, Unit.unit_number, Property.name,
+                       Property.id.label("property_id"), rank.label("rank"), matched.label("match"))
+                .join(Unit, Unit.id == Room.unit_id)
+                .join(Property, Property.id == Unit.property_id)
+                .where(owned, condition).order_by(matched.desc(), rank.desc(), Unit.unit_number, Room.room_number).limit(limit)
+            )
+            results += _normalized([{
+                "type": "room",
+                "id": str(row.id),
+                "title": f"Unit {row.unit_number}, Room {row.room_number}",
+                "subtitle": f"{row.name} · {row.status.value}",
+                "property_id": str(row.property_id),
+                "rank": float(row.rank),
+                "match": row.match,
+            } for row in rows])
+
+        if "message" in types:
+            condition, rank, matched = match.full_text("messages", [Message.message])
+            rows = db.execute(
+                select(Message.id, Message.tenant_id, Message.message, Message.created_at, rank.label("rank"),
+                       matched.label("match"))
+                .where(or_(Message.sender_id == user.id, Message.receiver_id == user.id), condition)
+                .order_by(matched.desc(), rank.desc(), Message.created_at.desc()).limit(limit)
+            )
+            results += _normalized([{
+                "type": "message",
+                "id": str(row.id),
+                "title": row.message if len(row.message) <= 80 else row.message[:77] + "...",
+                "subtitle": row.created_at.isoformat(),
+                "tenant_id": str(row.tenant_id),
+                "rank": float(row.rank),
+                "match": row.match,
+            } for row in rows])
+
+        if "maintenance" in types:
+            condition, rank, matched = match.full_text(
+                "maintenance_requests", [MaintenanceRequest.title, MaintenanceRequest.description],
+                exact=[MaintenanceRequest.title],
+            )
+            rows = db.execute(
+                select(MaintenanceRequest.id, MaintenanceRequest.title, MaintenanceRequest.status,
+                       MaintenanceRequest.property_id, rank.label("rank"), matched.label("match"))
+                .join(Property, Property.id == MaintenanceRequest.property_id)
+                .where(owned, condition).order_by(matched.desc(), rank.desc(), MaintenanceRequest.created_at.desc()).limit(limit)
+            )
+            results += _normalized([{
+                "type": "maintenance",
+                "id": str(row.id),
+                "title": row.title,
+                "subtitle": row.status.value,
+                "property_id": str(row.property_id),
+                "rank": float(row.rank),
+                "match": row.match,
+            } for row in rows])
+
+        if "document" in types:
+            condition, rank, matched = match.full_text(
+                "documents", [Document.title, Document.description, Document.document_type, Document.filename],
+                exact=[Document.title, Document.filename],
+            )
+            rows = db.execute(
+                select(Document.id, Document.title, Document.document_type, Document.property_id, rank.label("rank"),
+                       matched.label("match"))
+                .join(Property, Property.id == Document.property_id)
+                .where(owned, condition).order_by(matched.desc(), rank.desc(), Document.created_at.desc()).limit(limit)
+            )
+            results += _normalized([{
+                "type": "document",
+                "id": str(row.id),
+                "title": row.title,
+                "subtitle": row.document_type,
+                "property_id": str(row.property_id),
+                "rank": float(row.rank),
+                "match": row.match,
+            } for row in rows])
+
+        results.sort(key=lambda r: (r["match"], r["rank"]), reverse=True)
+        for result in results:
+            result["match"] = MATCH_CLASSES[result["match"]]
+        return results
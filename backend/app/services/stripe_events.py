@@ -0,0 +1,326 @@
+"""
+Durable processing of Stripe webhook events.
+
+The webhook only verifies the signature and records the event, keyed by
+Stripe's event id so retried deliveries are stored once, and acknowledges
+straight away. Events are applied here, oldest first, right after each
+delivery and by a periodic loop that picks up anything left over. Emails
+go out only after the payment changes have committed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone, date
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal, dialect_insert
+from app.models.user import User
+from app.models.operator import Operator
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room
+from app.models.tenant import Tenant
+from app.models.payment import Payment, PaymentStatus
+from app.models.stripe_event import StripeEvent
+from app.services.email_service import EmailService
+from app.services.stripe_service import get_stripe
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+# An event that keeps failing is left for the replay tool after this many tries
+MAX_ATTEMPTS = 5
+
+
+@dataclass
+class PaymentReceipt:
+    """What the two confirmation emails need, read in one query before the commit"""
+    tenant_email: str
+    tenant_name: str
+    amount: float
+    payment_date: date
+    operator_email: Optional[str] = None
+    operator_name: Optional[str] = None
+    property_name: Optional[str] = None
+    unit_number: Optional[str] = None
+    room_number: Optional[str] = None
+
+
+def _display_name(first_name, last_name, email) -> str:
+    return f"{first_name} {last_name}" if first_name else email
+
+
+def _event_dict(event) -> dict:
+    # StripeObject serializes itself as the API's JSON
+    return event if isinstance(event, dict) else json.loads(str(event))
+
+
+# ============ EVENT HANDLERS ============
+
+def _payment_for(db: Session, intent: dict) -> Optional[Payment]:
+    payment_id = (intent.get("metadata") or {}).get("payment_id")
+    try:
+        payment_id = uuid.UUID(str(payment_id))
+    except ValueError:
+        return None
+    return db.query(Payment).filter(Payment.id == payment_id).first()
+
+
+def _receipt(db: Session, payment: Payment) -> Optional[PaymentReceipt]:
+    OperatorUser = aliased(User)
+    row = db.execute(
+        select(
+            User.email, User.first_name, User.last_name,
+            Room.room_number, Unit.unit_number, Property.name.label("property_name"),
+            OperatorUser.email.label("operator_email"),
+            OperatorUser.first_name.label("operator_first_name"),
+            OperatorUser.last_name.label("operator_last_name"),
+        ).select_from(Tenant).join(
+            User, User.id == Tenant.user_id
+        ).outerjoin(
+            Room, Room.id == Tenant.room_id
+        ).outerjoin(
+            Unit, Unit.id == Room.unit_id
+        ).outerjoin(
+            Property, Property.id == Unit.property_id
+        ).outerjoin(
+            Operator, Operator.id == Property.operator_id
+        ).outerjoin(
+            OperatorUser, OperatorUser.id == Operator.user_id
+        ).where(Tenant.id == payment.tenant_id)
+    ).first()
+    if row is None:
+        return None
+
+    return PaymentReceipt(
+        tenant_email=row.email,
+        tenant_name=_display_name(row.first_name, row.last_name, row.email),
+        amount=float(payment.amount),
+        payment_date=payment.paid_date,
+        operator_email=row.operator_email,
+        operator_name=_display_name(row.operator_first_name, row.operator_last_name, row.operator_email)
+        if row.operator_email else None,
+        property_name=row.property_name,
+        unit_number=row.unit_number,
+        room_number=row.room_number,
+    )
+
+
+def _payment_succeeded(db: Session, intent: dict, created: int) -> Optional[PaymentReceipt]:
+    payment = _payment_for(db, intent)
+    # Already paid: a replay or a duplicate, so nothing changes and nobody is emailed twice
+    if payment is None or payment.status == PaymentStatus.PAID:
+        return None
+
+    payment.status = PaymentStatus.PAID
+    payment.paid_date = datetime.fromtimestamp(created, timezone.utc).date()
+    payment.payment_method = "stripe"
+    db.flush()
+    return _receipt(db, payment)
+
+
+def _payment_failed(db: Session, intent: dict, created: int) -> None:
+    payment = _payment_for(db, intent)
+    # A failure delivered after the success must not undo it
+    if payment is not None and payment.status != PaymentStatus.PAID:
+        payment.status = PaymentStatus.FAILED
+        db.flush()
+
+
+_HANDLERS = {
+    "payment_intent.succeeded": _payment_succeeded,
+    "payment_intent.payment_failed": _payment_failed,
+}
+
+
+def _send_receipt(receipt: PaymentReceipt):
+    try:
+        EmailService.send_payment_confirmation(
+            tenant_email=receipt.tenant_email,
+            tenant_name=receipt.tenant_name,
+            amount=receipt.amount,
+            payment_date=receipt.payment_date,
+            payment_method="Stripe"
+        )
+    except Exception as e:
+        logger.error(f"Failed to send payment confirmation to {receipt.tenant_email}: {str(e)}")
+
+    if not receipt.operator_email:
+        return
+    try:
+        EmailService.send_operator_payment_received(
+            operator_email=receipt.operator_email,
+            operator_name=receipt.operator_name,
+            tenant_name=receipt.tenant_name,
+            tenant_email=receipt.tenant_email,
+            amount=receipt.amount,
+            payment_date=receipt.payment_date,
+            property_name=receipt.property_name,
+            unit_number=receipt.unit_number,
+            room_number=receipt.room_number
+        )
+    except Exception as e:
+        logger.error(f"Failed to send operator payment notification to {receipt.operator_email}: {str(e)}")
+
+
+# ============ QUEUE ============
+
+class StripeEventService:
+    @staticmethod
+    def record(db: Session, event) -> bool:
+        """Store a verified event; False when Stripe already delivered it"""
+        event = _event_dict(event)
+        statement = dialect_insert(db.connection())(StripeEvent.__table__).values(
+            id=event["id"], type=event["type"], payload=event, created=event["created"], attempts=0
+        ).on_conflict_do_nothing(index_elements=["id"])
+        inserted = db.execute(statement).rowcount == 1
+        db.commit()
+        return inserted
+
+    @staticmethod
+    def process_pending(db: Session, limit: int = BATCH_SIZE) -> int:
+        """
+        Apply up to `limit` pending events, oldest first, in one transaction.
+
+        The batch is locked, so processors in other workers wait and then
+        skip what this one applied. Each event runs in a savepoint: a failing
+        event is rolled back and retried on a later run without holding up
+        the rest. Returns the number of events applied.
+        """
+        events = db.execute(
+            select(StripeEvent).where(
+                StripeEvent.processed_at.is_(None),
+                StripeEvent.attempts < MAX_ATTEMPTS
+            ).order_by(StripeEvent.created, StripeEvent.id).limit(limit).with_for_update()
+        ).scalars().all()
+
+        applied, receipts = 0, []
+        for event in events:
+            event.attempts += 1
+            handler = _HANDLERS.get(event.type)
+            try:
+                with db.begin_nested():
+                    receipt = handler(db, event.payload["data"]["object"], event.created) if handler else None
+            except Exception as e:
+                event.last_error = str(e)[:2000]
+                logger.error(f"Stripe event {event.id} ({event.type}) failed: {str(e)}")
+                continue
+            event.processed_at = datetime.now(timezone.utc)
+            event.last_error = None
+            applied += 1
+            if receipt:
+                receipts.append(receipt)
+
+        db.commit()
+
+        for receipt in receipts:
+            _send_receipt(receipt)
+        return applied
+
+    @staticmethod
+    def process_all(db: Session, batch_size: int = BATCH_SIZE) -> int:
+        """Drain the queue batch by batch; a batch with failures ends the run so they are not retried at once"""
+        total = 0
+        while True:
+            applied = StripeEventService.process_pending(db, limit=batch_size)
+            total += applied
+            if applied < batch_size:
+                return total
+
+    @staticmethod
+    def replay(db: Session, since: datetime, until: Optional[datetime] = None,
+               types: Iterable[str] = ()) -> int:
+        """Mark stored events created in [since, until) as pending again; returns how many"""
+        conditions = [StripeEvent.created >= int(since.timestamp())]
+        if until:
+            conditions.append(StripeEvent.created < int(until.timestamp()))
+        types = list(types)
+        if types:
+            conditions.append(StripeEvent.type.in_(types))
+
+        result = db.execute(
+            update(StripeEvent).where(*conditions)
+            .values(processed_at=None, attempts=0, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def backfill(db: Session, since: datetime, until: Optional[datetime] = None,
+                 types: Iterable[str] = tuple(_HANDLERS)) -> int:
+        """
+        Record events that never reached the webhook, paging through Stripe's
+        event list (which only goes back 30 days). Returns how many were new.
+        """
+        created = {"gte": int(since.timestamp())}
+        if until:
+            created["lt"] = int(until.timestamp())
+
+        stripe = get_stripe()
+        recorded = 0
+        for event in stripe.Event.list(created=created, types=list(types), limit=100).auto_paging_iter():
+            recorded += StripeEventService.record(db, event)
+        return recorded
+
+
+def process_pending_events(bind=None) -> int:
+    """Background task: drain the queue with a session of its own"""
+    db = Session(bind=bind) if bind is not None else SessionLocal()
+    try:
+        return StripeEventService.process_all(db)
+    except Exception as e:
+        logger.error(f"Stripe event processing failed: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+async def stripe_event_loop(interval_seconds: int):
+    """Apply pending events at startup and then every `interval_seconds`"""
+    while True:
+        await run_in_threadpool(process_pending_events)
+        await asyncio.sleep(interval_seconds)
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.stripe_events",
+        description="Drain, replay or backfill the Stripe event queue",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("process", help="Apply every pending event")
+
+    replay = commands.add_parser("replay", help="Re-apply stored events created in a time range")
+    replay.add_argument("--since", type=datetime.fromisoformat, required=True, help="ISO date or datetime")
+    replay.add_argument("--until", type=datetime.fromisoformat)
+    replay.add_argument("--type", dest="types", action="append", default=[], help="Event type; repeatable")
+    replay.add_argument("--from-stripe", action="store_true",
+                        help="First record events missing locally from Stripe's event list (last 30 days)")
+
+    args = parser.parse_args(argv)
+    db = SessionLocal()
+    try:
+        if args.command == "replay":
+            since = args.since if args.since.tzinfo else args.since.replace(tzinfo=timezone.utc)
+            until = args.until if not args.until or args.until.tzinfo else args.until.replace(tzinfo=timezone.utc)
+            if args.from_stripe:
+                print(f"Recorded {StripeEventService.backfill(db, since, until, args.types or tuple(_HANDLERS))} "
+                      f"events from Stripe")
+            print(f"Marked {StripeEventService.replay(db, since, until, args.types)} events for replay")
+        print(f"Applied {StripeEventService.process_all(db)} events")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # e.g. python -m app.services.stripe_events replay --since 2026-10-01 --from-stripe
+    _main()
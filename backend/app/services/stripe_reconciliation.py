@@ -0,0 +1,214 @@
+"""
+Batch reconciliation of payment statuses against Stripe.
+
+Catches what missed webhooks left behind. Each run pages through the
+PaymentIntents created since the previous run's watermark (less a
+lookback, because ACH intents settle days after they are created),
+matches every page to payments with one query, and applies the status
+changes with one UPDATE per outcome. Anything it should not decide on its
+own is recorded on the run as a discrepancy.
+"""
+import argparse
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import select, update, case, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.payment import Payment, PaymentStatus
+from app.models.tenant import Tenant
+from app.models.room import Room
+from app.models.unit import Unit
+from app.models.stripe_reconciliation import StripeReconciliationRun
+from app.services.property_metrics import PropertyMetricsService, metrics_tags
+from app.services.response_cache import invalidate_on_commit
+from app.services.stripe_service import get_stripe, to_cents
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+DAY_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class _Outcome:
+    paid: Dict[uuid.UUID, str] = field(default_factory=dict)  # payment id -> succeeded intent id
+    paid_dates: Dict[uuid.UUID, date] = field(default_factory=dict)
+    failed: Set[uuid.UUID] = field(default_factory=set)
+    property_ids: Set[uuid.UUID] = field(default_factory=set)
+    discrepancies: List[dict] = field(default_factory=list)
+    intents_seen: int = 0
+
+    def report(self, kind: str, intent, payment_id=None, **detail):
+        self.discrepancies.append({
+            "kind": kind,
+            "payment_intent": intent.id,
+            "payment_id": str(payment_id) if payment_id else None,
+            **detail,
+        })
+
+
+def _metadata_payment_id(intent) -> Optional[uuid.UUID]:
+    payment_id = (intent.get("metadata") or {}).get("payment_id")
+    try:
+        return uuid.UUID(str(payment_id))
+    except ValueError:
+        return None
+
+
+def _paid_on(intent) -> date:
+    """The day the money moved: the latest charge's (expanded on the list), else the intent's creation"""
+    charge = intent.get("latest_charge")
+    created = charge.get("created") if hasattr(charge, "get") else None
+    return datetime.fromtimestamp(created or intent.created, timezone.utc).date()
+
+
+def _pages(stripe, **params) -> Iterator[list]:
+    """PaymentIntent list pages, newest first, following Stripe's cursor"""
+    page = stripe.PaymentIntent.list(**params)
+    while True:
+        if page.data:
+            yield page.data
+        if not page.has_more or not page.data:
+            return
+        page = stripe.PaymentIntent.list(**params, starting_after=page.data[-1].id)
+
+
+def _match_page(db: Session, intents: list, outcome: _Outcome):
+    """Compare one page of intents with their payments, fetched together"""
+    intent_ids = [intent.id for intent in intents]
+    metadata_ids = {pid for pid in map(_metadata_payment_id, intents) if pid}
+
+    rows = db.execute(
+        select(
+            Payment.id, Payment.stripe_payment_id, Payment.status, Payment.amount,
+            Payment.payment_method, Unit.property_id
+        ).outerjoin(
+            Tenant, Tenant.id == Payment.tenant_id
+        ).outerjoin(
+            Room, Room.id == func.coalesce(Payment.room_id, Tenant.room_id)
+        ).outerjoin(
+            Unit, Unit.id == Room.unit_id
+        ).where(or_(Payment.stripe_payment_id.in_(intent_ids), Payment.id.in_(metadata_ids)))
+    ).all()
+    by_intent = {row.stripe_payment_id: row for row in rows if row.stripe_payment_id}
+    by_id = {row.id: row for row in rows}
+
+    for intent in intents:
+        outcome.intents_seen += 1
+        metadata_id = _metadata_payment_id(intent)
+        row = by_intent.get(intent.id) or by_id.get(metadata_id)
+        if row is None:
+            # Intents without our metadata were not created by this app
+            if metadata_id:
+                outcome.report("unknown_payment", intent, metadata_id)
+            continue
+
+        current = row.stripe_payment_id == intent.id
+        if intent.status == "succeeded":
+            if row.status == PaymentStatus.PAID or row.id in outcome.paid:
+                if not current and row.payment_method == "stripe":
+                    outcome.report("duplicate_charge", intent, row.id, amount=intent.amount_received)
+                continue
+            if intent.amount_received != to_cents(row.amount):
+                outcome.report("amount_mismatch", intent, row.id,
+                               expected=to_cents(row.amount), received=intent.amount_received)
+                continue
+            outcome.paid[row.id] = intent.id
+            outcome.paid_dates[row.id] = _paid_on(intent)
+            outcome.property_ids.add(row.property_id)
+        elif current and row.status == PaymentStatus.PAID and row.payment_method == "stripe":
+            outcome.report("paid_without_successful_intent", intent, row.id, stripe_status=intent.status)
+        elif (current and row.status == PaymentStatus.PENDING
+              and intent.status == "requires_payment_method" and intent.get("last_payment_error")):
+            outcome.failed.add(row.id)
+            outcome.property_ids.add(row.property_id)
+
+
+class StripeReconciliationService:
+    @staticmethod
+    def reconcile(db: Session, now: Optional[int] = None, lookback_days: Optional[int] = None,
+                  page_size: int = PAGE_SIZE) -> StripeReconciliationRun:
+        """List, match and apply; returns the recorded run with its discrepancies"""
+        now = int(now if now is not None else time.time())
+        lookback = (lookback_days if lookback_days is not None
+                    else get_settings().stripe_reconcile_lookback_days) * DAY_SECONDS
+
+        previous = db.query(StripeReconciliationRun.watermark).filter(
+            StripeReconciliationRun.finished_at.isnot(None)
+        ).order_by(StripeReconciliationRun.watermark.desc()).first()
+        listed_from = (previous.watermark if previous else now) - lookback
+
+        outcome = _Outcome()
+        stripe = get_stripe()
+        for intents in _pages(stripe, created={"gte": listed_from, "lt": now}, limit=page_size,
+                              expand=["data.latest_charge"]):
+            _match_page(db, intents, outcome)
+
+        payments_paid = 0
+        if outcome.paid:
+            # A webhook may have marked some paid since the match; those keep their date and receipt
+            payments_paid = db.execute(
+                update(Payment).where(
+                    Payment.id.in_(outcome.paid),
+                    Payment.status != PaymentStatus.PAID
+                ).values(
+                    status=PaymentStatus.PAID,
+                    paid_date=case(outcome.paid_dates, value=Payment.id),
+                    payment_method="stripe",
+                    stripe_payment_id=case(outcome.paid, value=Payment.id),
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+        if outcome.failed:
+            db.execute(
+                update(Payment).where(
+                    Payment.id.in_(outcome.failed),
+                    Payment.status == PaymentStatus.PENDING
+                ).values(status=PaymentStatus.FAILED).execution_options(synchronize_session=False)
+            )
+
+        # Set-based UPDATEs skip the flush hooks, so refresh the dashboard rollups directly
+        property_ids = outcome.property_ids - {None}
+        if property_ids:
+            PropertyMetricsService.refresh(db.connection(), property_ids)
+            invalidate_on_commit(db, metrics_tags(property_ids))
+
+        run = StripeReconciliationRun(
+            listed_from=listed_from,
+            watermark=now,
+            intents_seen=outcome.intents_seen,
+            payments_paid=payments_paid,
+            payments_failed=len(outcome.failed),
+            discrepancies=outcome.discrepancies,
+            finished_at=datetime.now(timezone.utc),
+        )
+        db.add(run)
+        db.commit()
+
+        if outcome.discrepancies:
+            logger.warning(f"Stripe reconciliation found {len(outcome.discrepancies)} discrepancies")
+        return run
+
+
+if __name__ == "__main__":
+    # e.g. hourly from cron: python -m app.services.stripe_reconciliation
+    parser = argparse.ArgumentParser(prog="python -m app.services.stripe_reconciliation",
+                                     description="Reconcile payment statuses against Stripe")
+    parser.add_argument("--lookback-days", type=int, help="Override STRIPE_RECONCILE_LOOKBACK_DAYS")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        run = StripeReconciliationService.reconcile(db, lookback_days=args.lookback_days)
+        print(f"{run.intents_seen} intents checked: {run.payments_paid} payments marked paid, "
+              f"{run.payments_failed} marked failed, {len(run.discrepancies)} discrepancies")
+        for discrepancy in run.discrepancies:
+            print(f"  {discrepancy}")
+    finally:
+        db.close()
@@ -1,20 +1,66 @@
-import stripe
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from functools import lru_cache, partial
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+
+# PaymentIntent states in which the tenant can still complete the same intent
+REUSABLE_INTENT_STATUSES = ("requires_payment_method", "requires_confirmation", "requires_action")
+# States in which money is already moving (ACH takes days to settle); a second intent could charge twice
+SETTLING_INTENT_STATUSES = ("processing", "requires_capture", "succeeded")
+
+
+@lru_cache()
+def get_stripe():
+    """
+    The configured stripe module, imported on first use: the SDK is large
+    and only the payment routes need it, so workers boot without it.
+    """
+    import stripe
+
+    # Initialize Stripe with secret key from environment
+    stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+    # Safe to retry: every create carries an idempotency key
+    stripe.max_network_retries = 2
+    return stripe
+
+
+@lru_cache()
+def _stripe_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=get_settings().stripe_max_concurrency, thread_name_prefix="stripe")
+
+
+async def call_stripe(func, *args, **kwargs):
+    """
+    Run a blocking Stripe call on its own bounded pool, so a slow Stripe
+    API holds neither the event loop nor the threads serving other routes.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_stripe_executor(), partial(func, *args, **kwargs))
+
+
+def to_cents(amount: Decimal) -> int:
+    # Amount is in dollars, Stripe expects cents
+    return int(amount * 100)
 
-# Initialize Stripe with secret key from environment
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
 
 class StripeService:
     @staticmethod
-    def create_payment_intent(amount: Decimal, payment_id: str, tenant_email: str):
+    def create_payment_intent(amount: Decimal, payment_id: str, tenant_email: str,
+                              idempotency_key: Optional[str] = None):
         """
         Create a Stripe payment intent for a payment
         Amount is in dollars, Stripe expects cents
         """
+        stripe = get_stripe()
         try:
             intent = stripe.PaymentIntent.create(
-                amount=int(amount * 100),  # Convert dollars to cents
+                amount=to_cents(amount),
                 currency="usd",
                 payment_method_types=["card", "us_bank_account"],  # Allow cards and ACH
                 metadata={
@@ -22,6 +68,7 @@ class StripeService:
                     "tenant_email": tenant_email,
                 },
                 receipt_email=tenant_email,
+                idempotency_key=idempotency_key,
             )
             return {
                 "client_secret": intent.client_secret,
@@ -29,10 +76,56 @@ class StripeService:
             }
         except stripe.error.StripeError as e:
             raise Exception(f"Stripe error: {str(e)}")
-    
+
+    @staticmethod
+    def payment_intent_for(amount: Decimal, payment_id: str, tenant_email: str,
+                           existing_intent_id: Optional[str] = None):
+        """
+        The payment's stored intent when the tenant can still complete it
+        for the same amount. A new one is only created when there is none,
+        it was canceled or the amount changed (the old one is canceled
+        then); while the stored one is processing or has succeeded, 409.
+
+        The idempotency key covers the payment, the amount and the intent
+        being replaced, so concurrent clicks and network retries get the same
+        new intent back instead of creating several.
+        """
+        if existing_intent_id:
+            intent = StripeService.retrieve_payment_intent(existing_intent_id)
+            if intent.status in SETTLING_INTENT_STATUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A payment is already in progress"
+                )
+            if intent.status in REUSABLE_INTENT_STATUSES:
+                if intent.amount == to_cents(amount) and intent.currency == "usd":
+                    return {
+                        "client_secret": intent.client_secret,
+                        "payment_intent_id": intent.id,
+                    }
+                # Stale amount: make sure the tenant cannot still pay it alongside the new one
+                StripeService.cancel_payment_intent(intent.id)
+
+        return StripeService.create_payment_intent(
+            amount=amount,
+            payment_id=payment_id,
+            tenant_email=tenant_email,
+            idempotency_key=f"payment-intent:{payment_id}:{to_cents(amount)}:{existing_intent_id or 'first'}",
+        )
+
+    @staticmethod
+    def cancel_payment_intent(payment_intent_id: str):
+        """Cancel a payment intent that will not be used"""
+        stripe = get_stripe()
+        try:
+            return stripe.PaymentIntent.cancel(payment_intent_id)
+        except stripe.error.StripeError as e:
+            raise Exception(f"Stripe error: {str(e)}")
+
     @staticmethod
     def retrieve_payment_intent(payment_intent_id: str):
         """Retrieve a payment intent to check its status"""
+        stripe = get_stripe()
         try:
             return stripe.PaymentIntent.retrieve(payment_intent_id)
         except stripe.error.StripeError as e:
@@ -0,0 +1,266 @@
+"""
+Everything the tenant portal needs for its first screen, in one response.
+
+The portal used to open with seven requests, each authenticating and
+walking room -> unit -> property again. Here the tenant is resolved once
+by the caller, and each section (lease, payment totals, maintenance,
+announcements, documents, messages) is an independent read with its own
+session, run side by side on a small bounded pool. Sections carry only the
+latest few items plus the counts the home screen shows; the full lists stay
+on their own paginated endpoints.
+"""
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import select, func, case, or_, and_, exists
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.tenant import Tenant
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room
+from app.models.payment import Payment, PaymentStatus
+from app.models.maintenance import MaintenanceRequest, MaintenanceStatus
+from app.models.announcement import Announcement
+from app.models.announcement_read import AnnouncementRead
+from app.models.document import Document
+from app.models.message import Message
+
+RECENT_ITEMS = 3
+
+OPEN_MAINTENANCE = (MaintenanceStatus.OPEN, MaintenanceStatus.IN_PROGRESS)
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """The resolved tenant, as plain values safe to hand to other threads"""
+    tenant_id: uuid.UUID
+    user_id: uuid.UUID
+    room_id: Optional[uuid.UUID]
+    property_id: Optional[uuid.UUID]
+
+
+@lru_cache()
+def _bootstrap_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=get_settings().tenant_bootstrap_concurrency,
+                              thread_name_prefix="bootstrap")
+
+
+def unread_announcement_count(db: Session, tenant_id, property_id) -> int:
+    """One anti-join: the property's announcements without a read row for this tenant"""
+    if not property_id:
+        return 0
+    return db.query(func.count(Announcement.id)).filter(
+        Announcement.property_id == property_id,
+        ~exists().where(
+            AnnouncementRead.tenant_id == tenant_id,
+            AnnouncementRead.announcement_id == Announcement.id
+        )
+    ).scalar()
+
+
+# ============ SECTIONS ============
+
+def _lease(db: Session, tenant: TenantContext) -> dict:
+    row = db.execute(
+        select(
+            User.email, User.first_name, User.last_name,
+            Tenant.lease_start, Tenant.lease_end, Tenant.rent_amount, Tenant.status,
+            Room.room_number, Unit.unit_number, Property.name.label("property_name"),
+        ).select_from(Tenant).join(
+            User, User.id == Tenant.user_id
+        ).outerjoin(
+            Room, Room.id == Tenant.room_id
+        ).outerjoin(
+            Unit, Unit.id == Room.unit_id
+        ).outerjoin(
+            Property, Property.id == Unit.property_id
+        ).where(Tenant.id == tenant.tenant_id)
+    ).one()
+    return {
+        "email": row.email,
+        "first_name": row.first_name,
+        "last_name": row.last_name,
+        "property_name": row.property_name,
+        "unit_number": row.unit_number,
+        "room_number": row.room_number,
+        "lease_start": row.lease_start.isoformat() if row.lease_start else None,
+        "lease_end": row.lease_end.isoformat() if row.lease_end else None,
+        "rent_amount": float(row.rent_amount) if row.rent_amount is not None else None,
+        "status": row.status,
+    }
+
+
+def _payments(db: Session, tenant: TenantContext) -> dict:
+    today = date.today()
+    # Pending past its due date counts as overdue, as the payments list reports it
+    overdue = or_(Payment.status == PaymentStatus.OVERDUE,
+                  and_(Payment.status == PaymentStatus.PENDING, Payment.due_date < today))
+    pending = and_(Payment.status == PaymentStatus.PENDING, Payment.due_date >= today)
+    summary = db.execute(
+        select(
+            func.count(Payment.id).label("count"),
+            func.count(case((Payment.status == PaymentStatus.PAID, 1))).label("paid_count"),
+            func.count(case((pending, 1))).label("pending_count"),
+            func.count(case((overdue, 1))).label("overdue_count"),
+            func.coalesce(func.sum(case((or_(pending, overdue), Payment.amount), else_=0)), 0).label("outstanding"),
+        ).where(Payment.tenant_id == tenant.tenant_id)
+    ).one()
+
+    next_due = db.query(Payment.amount, Payment.due_date).filter(
+        Payment.tenant_id == tenant.tenant_id, pending
+    ).order_by(Payment.due_date).first()
+    return {
+        "count": summary.count,
+        "paid_count": summary.paid_count,
+        "pending_count": summary.pending_count,
+        "overdue_count": summary.overdue_count,
+        "outstanding_amount": float(summary.outstanding),
+        "next_due": {
+            "amount": float(next_due.amount),
+            "due_date": next_due.due_date.isoformat(),
+        } if next_due else None,
+    }
+
+
+def _maintenance(db: Session, tenant: TenantContext) -> dict:
+    if not tenant.room_id:
+        return {"open_count": 0, "recent": []}
+
+    # The open count rides along on every row as a window aggregate
+    rows = db.query(
+        MaintenanceRequest,
+        func.count(case((MaintenanceRequest.status.in_(OPEN_MAINTENANCE), 1))).over().label("open_count"),
+    ).filter(
+        MaintenanceRequest.room_id == tenant.room_id
+    ).order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc()).limit(RECENT_ITEMS).all()
+    return {
+        "open_count": rows[0].open_count if rows else 0,
+        "recent": [
+            {
+                "id": str(request.id),
+                "title": request.title,
+                "priority": request.priority,
+                "status": request.status,
+                "created_at": request.created_at.isoformat(),
+            }
+            for request, _ in rows
+        ],
+    }
+
+
+def _announcements(db: Session, tenant: TenantContext) -> dict:
+    if not tenant.property_id:
+        return {"unread_count": 0, "recent": []}
+
+    rows = db.query(Announcement, AnnouncementRead.read_at).outerjoin(
+        AnnouncementRead, and_(
+            AnnouncementRead.announcement_id == Announcement.id,
+            AnnouncementRead.tenant_id == tenant.tenant_id
+        )
+    ).filter(
+        Announcement.property_id == tenant.property_id
+    ).order_by(Announcement.created_at.desc(), Announcement.id.desc()).limit(RECENT_ITEMS).all()
+    return {
+        "unread_count": unread_announcement_count(db, tenant.tenant_id, tenant.property_id),
+        "recent": [
+            {
+                "id": str(announcement.id),
+                "title": announcement.title,
+                "priority": announcement.priority,
+                "created_at": announcement.created_at.isoformat(),
+                "read": read_at is not None,
+            }
+            for announcement, read_at in rows
+        ],
+    }
+
+
+def _documents(db: Session, tenant: TenantContext) -> dict:
+    visible = Document.tenant_id == tenant.tenant_id
+    if tenant.property_id:
+        visible = or_(visible, and_(Document.property_id == tenant.property_id,
+                                    Document.visible_to_all_tenants == True))
+
+    rows = db.query(Document, func.count().over().label("total")).filter(
+        visible
+    ).order_by(Document.created_at.desc(), Document.id.desc()).limit(RECENT_ITEMS).all()
+    return {
+        "count": rows[0].total if rows else 0,
+        "recent": [
+            {
+                "id": str(document.id),
+                "title": document.title,
+                "document_type": document.document_type,
+                "created_at": document.created_at.isoformat(),
+            }
+            for document, _ in rows
+        ],
+    }
+
+
+def _messages(db: Session, tenant: TenantContext) -> dict:
+    unread = and_(Message.receiver_id == tenant.user_id, Message.is_read == False)
+    rows = db.query(
+        Message, func.count(case((unread, 1))).over().label("unread_count")
+    ).filter(
+        Message.tenant_id == tenant.tenant_id
+    ).order_by(Message.created_at.desc(), Message.id.desc()).limit(1).all()
+    latest = rows[0][0] if rows else None
+    return {
+        "unread_count": rows[0].unread_count if rows else 0,
+        "latest": {
+            "id": str(latest.id),
+            "sender_role": latest.sender_role,
+            "message": latest.message[:200],
+            "created_at": latest.created_at.isoformat(),
+        } if latest else None,
+    }
+
+
+SECTIONS: Dict[str, Callable[[Session, TenantContext], dict]] = {
+    "lease": _lease,
+    "payments": _payments,
+    "maintenance": _maintenance,
+    "announcements": _announcements,
+    "documents": _documents,
+    "messages": _messages,
+}
+
+
+def _run_section(bind, section: Callable, tenant: TenantContext) -> dict:
+    db = Session(bind=bind)
+    try:
+        return section(db, tenant)
+    finally:
+        db.close()
+
+
+def _run_sequentially(bind, tenant: TenantContext) -> list:
+    return [_run_section(bind, section, tenant) for section in SECTIONS.values()]
+
+
+class TenantBootstrapService:
+    @staticmethod
+    async def load(bind, tenant: TenantContext) -> dict:
+        """
+        Run every section on the bootstrap pool, each with its own session
+        and so its own pooled connection, and combine the results.
+        """
+        loop = asyncio.get_running_loop()
+        if bind.dialect.name == "sqlite":
+            # SQLite connections cannot serve several threads at once
+            results = await loop.run_in_executor(_bootstrap_executor(), _run_sequentially, bind, tenant)
+        else:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(_bootstrap_executor(), _run_section, bind, section, tenant)
+                for section in SECTIONS.values()
+            ))
+        return dict(zip(SECTIONS, results))
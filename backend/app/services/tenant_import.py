@@ -0,0 +1,200 @@
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select, exists, and_
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.tenant import Tenant, TenantStatus
+from app.models.room import Room, RoomStatus
+from app.models.unit import Unit
+from app.models.property import Property
+from app.models.payment import Payment, PaymentStatus
+from app.schemas.tenant import TenantCreate
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+MAX_IMPORT_ROWS = 2000
+
+
+@dataclass
+class Invitation:
+    email: str
+    name: str
+    property_name: str
+
+
+@dataclass
+class ImportResult:
+    rows: List[dict] = field(default_factory=list)
+    invitations: List[Invitation] = field(default_factory=list)
+
+    def summary(self, dry_run: bool) -> dict:
+        counts = {"created": 0, "reactivated": 0, "failed": 0}
+        for row in self.rows:
+            counts["failed" if row["status"] == "error" else row["status"]] += 1
+        return {**counts, "dry_run": dry_run, "rows": self.rows}
+
+
+def parse_csv(content: bytes) -> List[Dict[str, Any]]:
+    """CSV with a header row using TenantCreate field names; blank cells are treated as missing"""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in reader
+    ]
+
+
+def _error(index: int, email: Optional[str], *errors: str) -> dict:
+    return {"row": index, "email": email, "status": "error", "errors": list(errors)}
+
+
+class TenantImportService:
+    @staticmethod
+    def import_rows(db: Session, operator_id, raw_rows: List[Dict[str, Any]], dry_run: bool = False) -> ImportResult:
+        """
+        Validate and apply a batch of tenant onboardings in one transaction.
+
+        Lookups are batched: one query for every email in the batch and one
+        for every target room with its ownership and occupancy. Valid rows are
+        applied together and rows that fail are reported without blocking the
+        rest. The caller sends the returned invitations after the commit.
+        """
+        result = ImportResult()
+
+        # 1. Schema validation
+        parsed = {}
+        for index, raw in enumerate(raw_rows, start=1):
+            try:
+                parsed[index] = TenantCreate(**raw)
+            except ValidationError as e:
+                result.rows.append(_error(index, raw.get("email"), *(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+                )))
+
+        # 2. Batched lookups
+        emails = {row.email for row in parsed.values()}
+        users_by_email = {}
+        if emails:
+            for user, tenant in db.execute(
+                select(User, Tenant).outerjoin(Tenant, Tenant.user_id == User.id).where(User.email.in_(emails))
+            ):
+                users_by_email[user.email] = (user, tenant)
+
+        room_ids = {row.room_id for row in parsed.values()}
+        rooms_by_id = {}
+        if room_ids:
+            occupied = exists().where(and_(Tenant.room_id == Room.id, Tenant.status == TenantStatus.ACTIVE))
+            for room, owner_id, property_name, has_tenant in db.execute(
+                select(Room, Property.operator_id, Property.name, occupied).join(
+                    Unit, Unit.id == Room.unit_id
+                ).join(
+                    Property, Property.id == Unit.property_id
+                ).where(Room.id.in_(room_ids))
+            ):
+                rooms_by_id[room.id] = (room, owner_id, property_name, has_tenant)
+
+        # 3. Row checks, including conflicts inside the batch
+        seen_emails, seen_rooms = set(), set()
+        valid = []
+        for index, row in parsed.items():
+            errors = []
+            if row.email in seen_emails:
+                errors.append("Email appears more than once in this import")
+            if row.room_id in seen_rooms:
+                errors.append("Room appears more than once in this import")
+
+            room_info = rooms_by_id.get(row.room_id)
+            if not room_info:
+                errors.append("Room not found")
+            elif room_info[1] != operator_id:
+                errors.append("Not authorized to manage this property")
+            elif room_info[3] or room_info[0].status == RoomStatus.OCCUPIED:
+                errors.append("Room is already occupied")
+
+            existing_user, existing_tenant = users_by_email.get(row.email, (None, None))
+            if existing_user and existing_user.role != UserRole.TENANT:
+                errors.append("This email is already registered with a different role")
+            elif existing_tenant and existing_tenant.status == TenantStatus.ACTIVE:
+                errors.append("This tenant is already active in another room")
+
+            if row.lease_end <= row.lease_start:
+                errors.append("lease_end must be after lease_start")
+
+            seen_emails.add(row.email)
+            seen_rooms.add(row.room_id)
+            if errors:
+                result.rows.append(_error(index, row.email, *errors))
+            else:
+                valid.append((index, row, existing_user, existing_tenant, room_info))
+
+        # 4. Apply valid rows; the unit of work batches the INSERTs and room UPDATEs
+        applied = []
+        for index, row, user, tenant, (room, _, property_name, _) in valid:
+            outcome = "reactivated" if tenant else "created"
+            invite = user is None or not user.is_activated
+            if not dry_run:
+                if user is None:
+                    user = User(email=row.email, first_name=row.first_name, last_name=row.last_name,
+                                password_hash=None, role=UserRole.TENANT, is_activated=False)
+                    db.add(user)
+                if tenant is None:
+                    tenant = Tenant(user=user)
+                    db.add(tenant)
+                tenant.room_id = row.room_id
+                tenant.lease_start = row.lease_start
+                tenant.lease_end = row.lease_end
+                tenant.rent_amount = row.rent_amount
+                tenant.deposit_paid = row.deposit_paid
+                tenant.move_in_date = row.move_in_date
+                tenant.status = TenantStatus.ACTIVE
+
+                room.status = RoomStatus.OCCUPIED
+                room.rent_amount = row.rent_amount
+
+                # First month's rent, as for single onboarding
+                db.add(Payment(tenant=tenant, room_id=room.id, amount=row.rent_amount,
+                               due_date=row.lease_start, payment_method="manual", status=PaymentStatus.PENDING))
+            applied.append((index, row, tenant, outcome, invite, property_name))
+
+        tenant_ids = {}
+        if applied and not dry_run:
+            db.flush()
+            tenant_ids = {index: str(tenant.id) for index, _, tenant, *_ in applied}
+            db.commit()
+            logger.info(f"Tenant import: {len(applied)} applied, {len(raw_rows) - len(applied)} failed")
+
+        for index, row, _, outcome, invite, property_name in applied:
+            result.rows.append({
+                "row": index,
+                "email": row.email,
+                "status": outcome,
+                "tenant_id": tenant_ids.get(index),
+                "room_id": str(row.room_id),
+            })
+            if invite:
+                result.invitations.append(Invitation(
+                    email=row.email, name=f"{row.first_name} {row.last_name}", property_name=property_name
+                ))
+
+        result.rows.sort(key=lambda r: r["row"])
+        return result
+
+
+def send_invitations(invitations: List[Invitation], signup_url: str):
+    """Background task: one invitation per tenant account that still has to be activated"""
+    for invitation in invitations:
+        try:
+            EmailService.send_tenant_invitation(
+                tenant_email=invitation.email,
+                tenant_name=invitation.name,
+                property_name=invitation.property_name,
+                signup_url=signup_url,
+            )
+        except Exception as e:
+            logger.error(f"Failed to send invitation to {invitation.email}: {str(e)}")
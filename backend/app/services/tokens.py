@@ -0,0 +1,240 @@
+"""
+Access and refresh tokens.
+
+Access tokens are short-lived and self-describing: besides `sub` (the email)
+they carry the user id, role and the operator or tenant the user acts as, so
+authorizing a request needs no query. Revoking one early (logout) writes a
+revoked_tokens row; each worker keeps the revoked, still-unexpired access
+token ids in memory and re-reads them every TOKEN_REVOCATION_SYNC_SECONDS.
+
+Refresh tokens last days and are single use. /auth/refresh revokes the
+presented token in the same INSERT that checks it was unused, then issues a
+new pair in the same family. A refresh token presented twice means two
+holders, so the whole family is revoked.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.database import SessionLocal, dialect_insert
+from app.models.user import User, UserRole
+from app.models.operator import Operator
+from app.models.tenant import Tenant
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+ACCESS = "access"
+REFRESH = "refresh"
+FAMILY = "family"
+
+
+# ============ ENCODING ============
+
+def _encode(claims: dict, lifetime: timedelta) -> str:
+    now = datetime.now(timezone.utc)
+    claims = {**claims, "iat": now, "exp": now + lifetime}
+    claims.setdefault("jti", uuid.uuid4().hex)
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+
+def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
+    """Create a JWT access token"""
+    lifetime = expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    return _encode({**data, "type": ACCESS}, lifetime)
+
+
+def create_refresh_token(user_id, family: Optional[str] = None) -> str:
+    """A refresh token for `user_id`; rotation keeps the family of the token it replaces"""
+    claims = {"uid": str(user_id), "type": REFRESH, "fam": family or uuid.uuid4().hex}
+    return _encode(claims, timedelta(days=settings.refresh_token_expire_days))
+
+
+def decode_token(token: str, token_type: str) -> dict:
+    """Claims of a well-signed, unexpired token of `token_type`; JWTError otherwise"""
+    claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    # Tokens from before the `type` claim were all access tokens
+    if claims.get("type", ACCESS) != token_type:
+        raise JWTError(f"Not an {token_type} token")
+    return claims
+
+
+def _expires_at(claims: dict) -> datetime:
+    return datetime.fromtimestamp(claims["exp"], timezone.utc)
+
+
+def access_claims(db: Session, user: User) -> dict:
+    """What an access token for `user` asserts, with the operator or tenant it acts as"""
+    role = UserRole(user.role)
+    claims = {"sub": user.email, "uid": str(user.id), "role": role.value}
+    if role == UserRole.OPERATOR:
+        operator_id = db.query(Operator.id).filter(Operator.user_id == user.id).scalar()
+        if operator_id:
+            claims["op"] = str(operator_id)
+    elif role == UserRole.TENANT:
+        tenant_id = db.query(Tenant.id).filter(Tenant.user_id == user.id).scalar()
+        if tenant_id:
+            claims["tid"] = str(tenant_id)
+    return claims
+
+
+# ============ IN-MEMORY REVOCATION LIST ============
+
+class RevocationList:
+    """
+    Ids of revoked access tokens that have not expired yet, with their expiry.
+    Only access tokens are kept: they expire within minutes, so the set stays
+    small, and refresh tokens are checked against the table itself.
+    """
+
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expiry
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self.update([(jti, expires_at)])
+
+    def update(self, entries: Iterable[Tuple[str, datetime]]) -> None:
+        """Merge revocations in and drop those whose token has expired since"""
+        now = time.time()
+        with self._lock:
+            merged = {jti: expiry for jti, expiry in self._expiry.items() if expiry > now}
+            for jti, expires_at in entries:
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                merged[jti] = expires_at.timestamp()
+            # Swapped whole, so readers never see a set mid-update
+            self._expiry = merged
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry = {}
+
+
+revocation_list = RevocationList()
+
+
+def sync_revocations(bind=None) -> int:
+    """Background task: re-read revoked access tokens and purge expired rows"""
+    db = Session(bind=bind) if bind is not None else SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        rows = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(
+            RevokedToken.token_type == ACCESS,
+            RevokedToken.expires_at > now
+        ).all()
+        revocation_list.update(rows)
+
+        db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+        db.commit()
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Token revocation sync failed: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+async def revocation_sync_loop(interval_seconds: int):
+    """Sync at startup and then every `interval_seconds`"""
+    while True:
+        await run_in_threadpool(sync_revocations)
+        await asyncio.sleep(interval_seconds)
+
+
+# ============ ISSUING AND ROTATION ============
+
+class TokenService:
+    @staticmethod
+    def issue(db: Session, user: User, family: Optional[str] = None) -> dict:
+        """An access/refresh pair for `user`, as login and refresh return it"""
+        return {
+            "access_token": create_access_token(access_claims(db, user)),
+            "refresh_token": create_refresh_token(user.id, family),
+            "token_type": "bearer",
+            "expires_in": settings.access_token_expire_minutes * 60,
+        }
+
+    @staticmethod
+    def _revoke(db: Session, jti: str, token_type: str, user_id, expires_at: datetime) -> bool:
+        """Record a revocation; False when `jti` was already revoked"""
+        insert = dialect_insert(db.connection())
+        result = db.execute(
+            insert(RevokedToken).values(
+                jti=jti, token_type=token_type, user_id=uuid.UUID(str(user_id)), expires_at=expires_at
+            ).on_conflict_do_nothing(index_elements=["jti"])
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def rotate(db: Session, refresh_token: str) -> Optional[dict]:
+        """
+        Trade a refresh token for a new pair, or None when it is invalid,
+        expired, already used or from a revoked family.
+        """
+        try:
+            claims = decode_token(refresh_token, REFRESH)
+            user_id = uuid.UUID(claims["uid"])
+            jti, family = claims["jti"], claims["fam"]
+        except (JWTError, KeyError, ValueError):
+            return None
+
+        family_revoked = db.query(RevokedToken.jti).filter(
+            RevokedToken.jti == family, RevokedToken.token_type == FAMILY
+        ).first()
+        if family_revoked:
+            return None
+
+        if not TokenService._revoke(db, jti, REFRESH, user_id, _expires_at(claims)):
+            # Already rotated, so this is a replay: end the session for both holders
+            family_expiry = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+            TokenService._revoke(db, family, FAMILY, user_id, family_expiry)
+            db.commit()
+            return None
+
+        user = db.get(User, user_id)
+        if user is None:
+            db.rollback()
+            return None
+
+        tokens = TokenService.issue(db, user, family)
+        db.commit()
+        return tokens
+
+    @staticmethod
+    def revoke(db: Session, access_token: str, refresh_token: Optional[str] = None) -> None:
+        """Logout: refuse the access token from now on, and the refresh token's family if given"""
+        claims = decode_token(access_token, ACCESS)
+        if "jti" in claims:
+            TokenService._revoke(db, claims["jti"], ACCESS, claims["uid"], _expires_at(claims))
+
+        if refresh_token:
+            try:
+                refresh = decode_token(refresh_token, REFRESH)
+            except JWTError:
+                refresh = None
+            # Only the caller's own session
+            if refresh and refresh.get("uid") == claims.get("uid"):
+                family_expiry = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+                TokenService._revoke(db, refresh["fam"], FAMILY, refresh["uid"], family_expiry)
+
+        db.commit()
+        if "jti" in claims:
+            revocation_list.add(claims["jti"], _expires_at(claims))
@@ -1,75 +1,104 @@
+import uuid
+from dataclasses import dataclass, replace
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
 
 from app.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.models.operator import Operator
 from app.models.tenant import Tenant
 from app.config import get_settings
+from app.services.passwords import password_context
+from app.services.tokens import ACCESS, create_access_token, decode_token, revocation_list
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_context(settings.bcrypt_rounds)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+    """Verify a password against a hash, on the calling thread (routes use app.services.passwords)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
+    """Hash a password, on the calling thread (routes use app.services.passwords)"""
     return pwd_context.hash(password)
 
 
-def create_access_token(data: dict, expires_delta: timedelta = None):
-    """Create a JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+@dataclass(frozen=True)
+class OperatorRef:
+    id: uuid.UUID
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    print(f"DEBUG: Received token: {token[:20]}...")
-    
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as their access token describes them. Operator
+    routes read `id`, `email`, `role` and `operator.id` from it as they did
+    from the User row, without one being loaded.
+    """
+    id: uuid.UUID
+    email: str
+    role: str
+    operator: Optional[OperatorRef] = None
+    tenant_id: Optional[uuid.UUID] = None
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Who the access token is for, from its claims alone (no query)"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_email: str = payload.get("sub")
-        print(f"DEBUG: Decoded email from token: {user_email}")
-        if user_email is None:
-            print("DEBUG: No sub in payload")
-            raise credentials_exception
-    except JWTError as e:
-        print(f"DEBUG: JWT decode error: {e}")
-        raise credentials_exception
+        payload = decode_token(token, ACCESS)
+    except JWTError:
+        raise _credentials_exception()
     
-    user = db.query(User).filter(User.email == user_email).first()
-    print(f"DEBUG: Found user: {user.email if user else 'None'}")
-    if user is None:
-        print("DEBUG: User not found in database")
-        raise credentials_exception
+    if payload.get("jti") in revocation_list:
+        raise _credentials_exception()
+    
+    if "uid" in payload:
+        try:
+            return Principal(
+                id=uuid.UUID(payload["uid"]),
+                email=payload.get("sub"),
+                role=payload.get("role"),
+                operator=OperatorRef(uuid.UUID(payload["op"])) if payload.get("op") else None,
+                tenant_id=uuid.UUID(payload["tid"]) if payload.get("tid") else None,
+            )
+        except ValueError:
+            raise _credentials_exception()
     
-    print(f"DEBUG: User role: {user.role}")
+    # Issued before tokens carried claims: only the email to go on
+    user_email = payload.get("sub")
+    user = db.query(User).filter(User.email == user_email).first() if user_email else None
+    if user is None:
+        raise _credentials_exception()
+    return Principal(id=user.id, email=user.email, role=UserRole(user.role).value)
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """The User row, for routes that need more than the token's claims"""
+    user = db.get(User, principal.id)
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
@@ -95,24 +124,24 @@ def get_current_tenant(
 
 
 def get_current_operator(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
-) -> User:
-    """Get current operator user"""
-    if current_user.role != 'operator':
+) -> Principal:
+    """Get current operator, with `operator.id` from the token's scope claim"""
+    if principal.role != 'operator':
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized. Operator access required."
         )
     
-    # Ensure operator profile exists
-    operator = db.query(Operator).filter(Operator.user_id == current_user.id).first()
-    if not operator:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Operator profile not found"
-        )
+    if principal.operator is None:
+        # Token without the scope claim: look the operator profile up
+        operator_id = db.query(Operator.id).filter(Operator.user_id == principal.id).scalar()
+        if not operator_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Operator profile not found"
+            )
+        principal = replace(principal, operator=OperatorRef(operator_id))
     
-    # Attach operator to user object for easy access
-    current_user.operator = operator
-    return current_user
+    return principal
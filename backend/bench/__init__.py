@@ -0,0 +1 @@
+"""Synthetic data, load driver and latency reports for the CoLiv API"""
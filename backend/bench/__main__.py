@@ -0,0 +1,175 @@
+"""
+Benchmark command line.
+
+    python -m bench seed --operators 5 --dataset bench_dataset.json
+    python -m bench load --dataset bench_dataset.json --requests 5000 --concurrency 20 --save after.json
+    python -m bench load --dataset bench_dataset.json --compare before.json --fail-on-regression
+    python -m bench serialize --rows 5000
+    python -m bench startup --budget-ms 2500
+    python -m bench login --dataset bench_dataset.json --requests 500 --concurrency 50 --workers 4
+
+seed, load and login use DATABASE_URL from the environment; point it at a scratch database.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from bench import generator, report
+from bench.load import run_load
+
+
+def _seed(args):
+    from app.database import Base, SessionLocal, engine
+
+    engine.echo = False
+    Base.metadata.create_all(engine)
+
+    scale = generator.Scale(
+        operators=args.operators,
+        properties_per_operator=args.properties,
+        units_per_property=args.units,
+        rooms_per_unit=args.rooms,
+        years_of_payments=args.years,
+    )
+    db = SessionLocal()
+    try:
+        dataset = generator.generate(db, scale, seed=args.seed)
+    finally:
+        db.close()
+
+    generator.save_dataset(dataset, args.dataset)
+    for table, count in dataset.row_counts.items():
+        print(f"{table:<24} {count:>10}")
+    print(f"Dataset handles written to {args.dataset}")
+
+
+def _load(args):
+    from app.database import engine
+    from app.main import app
+
+    engine.echo = False
+    dataset = generator.load_dataset(args.dataset)
+
+    result = asyncio.run(run_load(
+        app,
+        dataset,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        tenant_ratio=args.tenant_ratio,
+        seed=args.seed,
+    ))
+    summary = report.summarize(result)
+    baseline = report.load(args.compare) if args.compare else None
+    print(report.format_table(summary, baseline))
+
+    if args.save:
+        report.save(summary, args.save)
+
+    if baseline and args.fail_on_regression:
+        found = report.regressions(summary, baseline, tolerance=args.tolerance)
+        if found:
+            print("\nRegressions:")
+            print("\n".join(f"  {line}" for line in found))
+            sys.exit(1)
+
+
+def _login(args):
+    # Read when the app is imported, so set them first
+    if args.rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if args.workers is not None:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    # The burst comes from one address at a few accounts: measure hashing, not the rate limiter
+    os.environ["RATE_LIMIT_BACKEND"] = "none"
+
+    from app.database import engine
+    from app.main import app
+    from bench import login
+
+    engine.echo = False
+    dataset = generator.load_dataset(args.dataset)
+
+    result = asyncio.run(login.run_logins(
+        app,
+        dataset,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    ))
+    print(report.format_table(report.summarize(result)))
+    print(f"{login.logins_per_second(result)} logins/s")
+
+
+def _serialize(args):
+    from bench import serialization
+
+    print(serialization.format_table(serialization.run(rows=args.rows, repeat=args.repeat)))
+
+
+def _startup(args):
+    from bench import startup
+
+    result = startup.run(repeat=args.repeat)
+    print(startup.format_table(result, count=args.top))
+
+    found = startup.violations(result, budget_ms=args.budget_ms)
+    if found:
+        print("\nStartup budget exceeded:")
+        print("\n".join(f"  {line}" for line in found))
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="CoLiv API benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Generate a synthetic portfolio")
+    seed.add_argument("--operators", type=int, default=2)
+    seed.add_argument("--properties", type=int, default=3, help="Properties per operator")
+    seed.add_argument("--units", type=int, default=8, help="Units per property")
+    seed.add_argument("--rooms", type=int, default=4, help="Rooms per unit")
+    seed.add_argument("--years", type=int, default=2, help="Years of payment history")
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--dataset", default="bench_dataset.json")
+    seed.set_defaults(func=_seed)
+
+    load = commands.add_parser("load", help="Drive mixed operator/tenant traffic and report latencies")
+    load.add_argument("--dataset", default="bench_dataset.json")
+    load.add_argument("--requests", type=int, default=2000)
+    load.add_argument("--concurrency", type=int, default=10)
+    load.add_argument("--tenant-ratio", type=float, default=0.6)
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--save", help="Write the summary as JSON")
+    load.add_argument("--compare", help="Baseline summary JSON to diff against")
+    load.add_argument("--fail-on-regression", action="store_true")
+    load.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth before failing")
+    load.set_defaults(func=_load)
+
+    login = commands.add_parser("login", help="Login throughput under a burst, with a /health latency probe")
+    login.add_argument("--dataset", default="bench_dataset.json")
+    login.add_argument("--requests", type=int, default=200)
+    login.add_argument("--concurrency", type=int, default=20)
+    login.add_argument("--seed", type=int, default=42)
+    login.add_argument("--rounds", type=int, help="Override BCRYPT_ROUNDS; seeded hashes at another cost are "
+                                                  "upgraded on their first login")
+    login.add_argument("--workers", type=int, help="Override PASSWORD_HASH_WORKERS (0 hashes on the request threads)")
+    login.set_defaults(func=_login)
+
+    serialize = commands.add_parser("serialize", help="Time JSON serialization of the largest list payloads")
+    serialize.add_argument("--rows", type=int, default=5000)
+    serialize.add_argument("--repeat", type=int, default=5, help="Runs per payload; the best is reported")
+    serialize.set_defaults(func=_serialize)
+
+    cold_start = commands.add_parser("startup", help="Time a cold `import app.main` with -X importtime")
+    cold_start.add_argument("--repeat", type=int, default=3, help="Fresh interpreters; the best is reported")
+    cold_start.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    cold_start.add_argument("--budget-ms", type=float, default=2500, help="Fail when the cold start is slower")
+    cold_start.set_defaults(func=_startup)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Deterministic synthetic data generator.
+
+Builds a full portfolio (operators, properties, units, rooms, tenants, years of
+monthly payments, messages, maintenance tickets and announcements) through the
+ORM models using bulk inserts. The same seed and scale always produce the same
+rows and ids, so benchmark runs are comparable across changes.
+"""
+import json
+import random
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.operator import Operator
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room, RoomStatus, RoomType
+from app.models.tenant import Tenant, TenantStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
+from app.models.announcement import Announcement, AnnouncementPriority
+from app.models.message import Message
+from app.services.property_metrics import PropertyMetricsService
+from app.utils.auth import get_password_hash
+
+BENCH_PASSWORD = "bench-password"
+
+# Rows per executemany batch
+BATCH_SIZE = 5000
+
+
+@dataclass
+class Scale:
+    """How much data to generate"""
+    operators: int = 2
+    properties_per_operator: int = 3
+    units_per_property: int = 8
+    rooms_per_unit: int = 4
+    occupancy: float = 0.85
+    years_of_payments: int = 2
+    messages_per_tenant: int = 6
+    tickets_per_unit: int = 3
+    announcements_per_property: int = 10
+
+
+@dataclass
+class OperatorHandle:
+    email: str
+    property_ids: List[str] = field(default_factory=list)
+    unit_ids: List[str] = field(default_factory=list)
+    room_ids: List[str] = field(default_factory=list)
+    tenant_ids: List[str] = field(default_factory=list)
+    maintenance_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TenantHandle:
+    email: str
+    tenant_id: str
+    operator_email: str
+
+
+@dataclass
+class Dataset:
+    """Handles to generated rows that the load driver needs to build requests"""
+    operators: List[OperatorHandle] = field(default_factory=list)
+    tenants: List[TenantHandle] = field(default_factory=list)
+    row_counts: dict = field(default_factory=dict)
+
+
+def _months_back(today: date, months: int) -> date:
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+
+# Parents must be inserted before children because of foreign keys
+_INSERT_ORDER = [User, Operator, Property, Announcement, Unit, Room, Tenant, Payment, MaintenanceRequest, Message]
+
+
+class _Rows:
+    """Accumulates rows per model and flushes them with bulk INSERTs, parents first"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.pending = {}
+        self.counts = {}
+
+    def add(self, model, row: dict):
+        rows = self.pending.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        for m in _INSERT_ORDER:
+            rows = self.pending.get(m)
+            if rows:
+                self.db.execute(insert(m), rows)
+                self.counts[m.__tablename__] = self.counts.get(m.__tablename__, 0) + len(rows)
+                self.pending[m] = []
+
+
+def generate(db: Session, scale: Scale = None, seed: int = 42, today: date = None) -> Dataset:
+    """Generate a synthetic portfolio and commit it"""
+    scale = scale or Scale()
+    today = today or date.today()
+    rng = random.Random(seed)
+    rows = _Rows(db)
+    dataset = Dataset()
+
+    def new_id():
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    # One bcrypt hash shared by every user keeps generation fast and lets the
+    # load driver log in as anyone
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    now = datetime.combine(today, datetime.min.time())
+
+    for o in range(scale.operators):
+        operator_user_id = new_id()
+        operator_id = new_id()
+        handle = OperatorHandle(email=f"operator{o}@bench.coliv")
+        dataset.operators.append(handle)
+
+        rows.add(User, {
+            "id": operator_user_id, "email": handle.email, "password_hash": password_hash,
+            "role": UserRole.OPERATOR, "first_name": "Operator", "last_name": str(o),
+            "is_activated": True,
+        })
+        rows.add(Operator, {"id": operator_id, "user_id": operator_user_id, "company_name": f"Bench Living {o}"})
+
+        for p in range(scale.properties_per_operator):
+            property_id = new_id()
+            handle.property_ids.append(str(property_id))
+            rows.add(Property, {
+                "id": property_id, "operator_id": operator_id, "name": f"Bench House {o}-{p}",
+                "address": f"{rng.randint(1, 9999)} Market St", "city": "San Francisco", "state": "CA",
+                "zip": f"94{rng.randint(100, 199)}", "total_units": scale.units_per_property,
+            })
+
+            for a in range(scale.announcements_per_property):
+                rows.add(Announcement, {
+                    "id": new_id(), "property_id": property_id, "created_by": operator_user_id,
+                    "title": f"Announcement {a}", "message": "Building update " * rng.randint(2, 20),
+                    "priority": rng.choice(list(AnnouncementPriority)),
+                    "created_at": now - timedelta(days=rng.randint(0, 365 * scale.years_of_payments)),
+                })
+
+            for u in range(scale.units_per_property):
+                unit_id = new_id()
+                handle.unit_ids.append(str(unit_id))
+                rows.add(Unit, {
+                    "id": unit_id, "property_id": property_id, "unit_number": f"{u // 4 + 1}{chr(65 + u % 4)}",
+                    "floor": u // 4 + 1, "bedrooms": scale.rooms_per_unit, "bathrooms": 2,
+                    "square_feet": rng.randint(800, 1600), "furnished": rng.random() < 0.5,
+                    "rental_type": "individual_rooms",
+                })
+
+                room_ids = []
+                for r in range(scale.rooms_per_unit):
+                    room_id = new_id()
+                    room_ids.append(room_id)
+                    handle.room_ids.append(str(room_id))
+                    occupied = rng.random() < scale.occupancy
+                    rent = Decimal(rng.randrange(700, 1800, 25))
+                    rows.add(Room, {
+                        "id": room_id, "unit_id": unit_id, "room_number": chr(65 + r),
+                        "room_type": RoomType.PRIVATE, "size_sqft": rng.randint(90, 250),
+                        "has_private_bath": rng.random() < 0.3, "rent_amount": rent,
+                        "status": RoomStatus.OCCUPIED if occupied else RoomStatus.VACANT,
+                    })
+                    if not occupied:
+                        continue
+
+                    tenant_user_id = new_id()
+                    tenant_id = new_id()
+                    tenant_email = f"tenant-{o}-{p}-{u}-{r}@bench.coliv"
+                    handle.tenant_ids.append(str(tenant_id))
+                    dataset.tenants.append(TenantHandle(tenant_email, str(tenant_id), handle.email))
+
+                    months = rng.randint(1, 12 * scale.years_of_payments)
+                    lease_start = _months_back(today, months)
+                    rows.add(User, {
+                        "id": tenant_user_id, "email": tenant_email, "password_hash": password_hash,
+                        "role": UserRole.TENANT, "first_name": "Tenant", "last_name": f"{o}{p}{u}{r}",
+                        "is_activated": True,
+                    })
+                    rows.add(Tenant, {
+                        "id": tenant_id, "user_id": tenant_user_id, "room_id": room_id,
+                        "lease_start": lease_start, "lease_end": lease_start + timedelta(days=365 * 2),
+                        "rent_amount": rent, "deposit_paid": rent, "status": TenantStatus.ACTIVE,
+                        "move_in_date": lease_start,
+                    })
+
+                    for m in range(months, -1, -1):
+                        due = _months_back(today, m)
+                        if m > 1:
+                            status = PaymentStatus.PAID if rng.random() < 0.97 else PaymentStatus.OVERDUE
+                        else:
+                            status = rng.choice([PaymentStatus.PAID, PaymentStatus.PENDING])
+                        paid = status == PaymentStatus.PAID
+                        rows.add(Payment, {
+                            "id": new_id(), "tenant_id": tenant_id, "room_id": room_id, "amount": rent,
+                            "due_date": due, "paid_date": due + timedelta(days=rng.randint(0, 5)) if paid else None,
+                            "status": status, "payment_method": "stripe" if paid else "manual",
+                            "late_fee": Decimal(0), "payment_type": "rent",
+                        })
+
+                    for i in range(scale.messages_per_tenant):
+                        from_tenant = i % 2 == 0
+                        rows.add(Message, {
+                            "id": new_id(),
+                            "sender_id": tenant_user_id if from_tenant else operator_user_id,
+                            "sender_role": "tenant" if from_tenant else "operator",
+                            "receiver_id": operator_user_id if from_tenant else tenant_user_id,
+                            "receiver_role": "operator" if from_tenant else "tenant",
+                            "tenant_id": tenant_id, "message": "Hello " * rng.randint(1, 40),
+                            "is_read": rng.random() < 0.8,
+                            "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                        })
+
+                for t in range(scale.tickets_per_unit):
+                    ticket_id = new_id()
+                    handle.maintenance_ids.append(str(ticket_id))
+                    ticket_status = rng.choice(list(MaintenanceStatus))
+                    created = now - timedelta(hours=rng.randint(1, 24 * 365 * scale.years_of_payments))
+                    rows.add(MaintenanceRequest, {
+                        "id": ticket_id, "property_id": property_id, "unit_id": unit_id,
+                        "room_id": rng.choice(room_ids + [None]), "title": f"Ticket {t}",
+                        "description": "Something is broken " * rng.randint(1, 10),
+                        "priority": rng.choice(list(MaintenancePriority)), "status": ticket_status,
+                        "created_at": created,
+                        "resolved_at": created + timedelta(days=rng.randint(1, 14))
+                        if ticket_status in (MaintenanceStatus.RESOLVED, MaintenanceStatus.CLOSED) else None,
+                    })
+
+    rows.flush()
+    db.commit()
+
+    # Bulk inserts skip the ORM flush hooks, so build the dashboard rollups in one pass
+    PropertyMetricsService.reconcile(db)
+
+    dataset.row_counts = rows.counts
+    return dataset
+
+
+def save_dataset(dataset: Dataset, path: str):
+    """Write dataset handles to JSON so a later load run can reuse them"""
+    with open(path, "w") as f:
+        json.dump(asdict(dataset), f)
+
+
+def load_dataset(path: str) -> Dataset:
+    with open(path) as f:
+        data = json.load(f)
+    return Dataset(
+        operators=[OperatorHandle(**o) for o in data["operators"]],
+        tenants=[TenantHandle(**t) for t in data["tenants"]],
+        row_counts=data.get("row_counts", {}),
+    )
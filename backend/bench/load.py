@@ -0,0 +1,145 @@
+"""
+In-process load driver.
+
+Sends a weighted mix of operator and tenant requests to the ASGI app through
+httpx.AsyncClient, so no server or network is involved and the numbers reflect
+the application and the database only.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from app.database import get_db
+from app.models.user import User
+from app.services.tokens import access_claims, create_access_token
+from bench.generator import Dataset, OperatorHandle, TenantHandle
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class Route:
+    """A request template; `name` is what the report groups latencies by"""
+    method: str
+    name: str
+    weight: int
+    build: Callable[[random.Random, object], str]
+
+
+OPERATOR_ROUTES = [
+    Route("GET", "/dashboard/operator", 10, lambda rng, op: "/dashboard/operator"),
+    Route("GET", "/properties/", 10, lambda rng, op: "/properties/"),
+    Route("GET", "/dashboard/property/{id}", 5,
+          lambda rng, op: f"/dashboard/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/units/property/{id}", 6, lambda rng, op: f"/units/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/rooms/unit/{id}", 6, lambda rng, op: f"/rooms/unit/{rng.choice(op.unit_ids)}"),
+    Route("GET", "/tenants/property/{id}", 6, lambda rng, op: f"/tenants/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/payments/property/{id}", 4, lambda rng, op: f"/payments/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/maintenance/property/{id}", 5,
+          lambda rng, op: f"/maintenance/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/announcements/property/{id}", 3,
+          lambda rng, op: f"/announcements/property/{rng.choice(op.property_ids)}"),
+    Route("GET", "/documents/", 2, lambda rng, op: "/documents/"),
+    Route("GET", "/messages/conversations", 3, lambda rng, op: "/messages/conversations"),
+]
+
+TENANT_ROUTES = [
+    Route("GET", "/tenants/me/profile", 8, lambda rng, t: "/tenants/me/profile"),
+    Route("GET", "/tenants/me/lease", 10, lambda rng, t: "/tenants/me/lease"),
+    Route("GET", "/tenants/me/payments", 10, lambda rng, t: "/tenants/me/payments"),
+    Route("GET", "/tenants/me/maintenance", 5, lambda rng, t: "/tenants/me/maintenance"),
+    Route("GET", "/tenants/me/announcements", 8, lambda rng, t: "/tenants/me/announcements"),
+    Route("GET", "/tenants/me/documents", 5, lambda rng, t: "/tenants/me/documents"),
+    Route("GET", "/messages/conversations", 4, lambda rng, t: "/messages/conversations"),
+]
+
+
+@dataclass
+class Sample:
+    name: str
+    status: int
+    seconds: float
+
+
+@dataclass
+class LoadResult:
+    samples: List[Sample] = field(default_factory=list)
+    elapsed: float = 0.0
+    concurrency: int = 0
+
+    def by_route(self) -> Dict[str, List[Sample]]:
+        grouped = {}
+        for sample in self.samples:
+            grouped.setdefault(sample.name, []).append(sample)
+        return grouped
+
+
+def _pick(rng: random.Random, routes: List[Route]) -> Route:
+    return rng.choices(routes, weights=[r.weight for r in routes])[0]
+
+
+def _mint_tokens(app, emails: List[str]) -> Dict[str, str]:
+    """
+    Access tokens with the claims login issues, minted directly so that bcrypt
+    does not skew read latencies. The session comes from the app's own get_db,
+    so a test's database override applies.
+    """
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    db = next(sessions)
+    try:
+        users = db.query(User).filter(User.email.in_(emails)).all()
+        return {user.email: create_access_token(access_claims(db, user)) for user in users}
+    finally:
+        sessions.close()
+
+
+async def run_load(
+    app,
+    dataset: Dataset,
+    requests: int = 1000,
+    concurrency: int = 10,
+    tenant_ratio: float = 0.6,
+    seed: int = 42,
+    operator_routes: Optional[List[Route]] = None,
+    tenant_routes: Optional[List[Route]] = None,
+) -> LoadResult:
+    """Send `requests` requests from `concurrency` concurrent clients"""
+    operator_routes = operator_routes or OPERATOR_ROUTES
+    tenant_routes = tenant_routes or TENANT_ROUTES
+    if not dataset.tenants:
+        tenant_ratio = 0.0
+
+    tokens = _mint_tokens(app, [o.email for o in dataset.operators] + [t.email for t in dataset.tenants])
+
+    result = LoadResult(concurrency=concurrency)
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int, client: httpx.AsyncClient):
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in remaining:
+            if rng.random() < tenant_ratio:
+                principal: object = rng.choice(dataset.tenants)
+                route = _pick(rng, tenant_routes)
+            else:
+                principal = rng.choice(dataset.operators)
+                route = _pick(rng, operator_routes)
+
+            path = API_PREFIX + route.build(rng, principal)
+            headers = {"Authorization": f"Bearer {tokens[principal.email]}"}
+
+            started = time.perf_counter()
+            response = await client.request(route.method, path, headers=headers)
+            result.samples.append(Sample(f"{route.method} {route.name}", response.status_code,
+                                         time.perf_counter() - started))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i, client) for i in range(concurrency)))
+        result.elapsed = time.perf_counter() - started
+
+    return result
@@ -0,0 +1,65 @@
+"""
+Login throughput benchmark.
+
+Fires POST /auth/login for the seeded users from `concurrency` clients,
+the way rent day does, while a probe keeps requesting GET /health. Login
+throughput shows what the password hashing pool sustains; the probe's
+latency shows whether the burst starves everything else in the worker.
+"""
+import asyncio
+import random
+import time
+
+import httpx
+
+from bench.generator import BENCH_PASSWORD, Dataset
+from bench.load import API_PREFIX, LoadResult, Sample
+
+LOGIN = "POST /auth/login"
+PROBE = "GET /health"
+
+
+async def run_logins(
+    app,
+    dataset: Dataset,
+    requests: int = 200,
+    concurrency: int = 20,
+    seed: int = 42,
+    probe_interval: float = 0.05,
+) -> LoadResult:
+    """Send `requests` logins from `concurrency` concurrent clients, probing /health meanwhile"""
+    emails = [operator.email for operator in dataset.operators] + [tenant.email for tenant in dataset.tenants]
+    result = LoadResult(concurrency=concurrency)
+    remaining = iter(range(requests))
+    done = asyncio.Event()
+
+    async def login(worker_id: int, client: httpx.AsyncClient):
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in remaining:
+            form = {"username": rng.choice(emails), "password": BENCH_PASSWORD}
+            started = time.perf_counter()
+            response = await client.post(f"{API_PREFIX}/auth/login", data=form)
+            result.samples.append(Sample(LOGIN, response.status_code, time.perf_counter() - started))
+
+    async def probe(client: httpx.AsyncClient):
+        while not done.is_set():
+            started = time.perf_counter()
+            response = await client.get("/health")
+            result.samples.append(Sample(PROBE, response.status_code, time.perf_counter() - started))
+            await asyncio.sleep(probe_interval)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        prober = asyncio.create_task(probe(client))
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i, client) for i in range(concurrency)))
+        result.elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    return result
+
+
+def logins_per_second(result: LoadResult) -> float:
+    logins = result.by_route().get(LOGIN, [])
+    return round(len(logins) / result.elapsed, 1) if result.elapsed else 0.0
@@ -0,0 +1,93 @@
+"""
+Latency report: p50/p95/p99 per endpoint, overall throughput, and an optional
+comparison against a previously saved run.
+"""
+import json
+import math
+from typing import Dict, List, Optional
+
+from bench.load import LoadResult
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+def summarize(result: LoadResult) -> dict:
+    """Reduce raw samples to per-endpoint statistics (milliseconds)"""
+    endpoints = {}
+    for name, samples in sorted(result.by_route().items()):
+        latencies = [s.seconds * 1000 for s in samples]
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": sum(1 for s in samples if s.status >= 400),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        }
+
+    total = len(result.samples)
+    return {
+        "requests": total,
+        "concurrency": result.concurrency,
+        "elapsed_s": round(result.elapsed, 3),
+        "throughput_rps": round(total / result.elapsed, 1) if result.elapsed else 0.0,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "endpoints": endpoints,
+    }
+
+
+def format_table(summary: dict, baseline: Optional[dict] = None) -> str:
+    """Render a summary as a text table, with p95 deltas when a baseline is given"""
+    header = f"{'endpoint':<42} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'p95 Δ':>8}"
+    lines = [header, "-" * len(header)]
+
+    base_endpoints: Dict[str, dict] = (baseline or {}).get("endpoints", {})
+    for name, stats in summary["endpoints"].items():
+        line = (f"{name:<42} {stats['count']:>6} {stats['errors']:>4} "
+                f"{stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+        if baseline:
+            before = base_endpoints.get(name)
+            line += f" {_delta(before['p95'], stats['p95']) if before else 'new':>8}"
+        lines.append(line)
+
+    lines.append("-" * len(header))
+    totals = (f"{summary['requests']} requests, concurrency {summary['concurrency']}, "
+              f"{summary['elapsed_s']}s, {summary['throughput_rps']} req/s, {summary['errors']} errors")
+    if baseline:
+        totals += f" (throughput {_delta(baseline['throughput_rps'], summary['throughput_rps'])})"
+    lines.append(totals)
+    return "\n".join(lines)
+
+
+def regressions(summary: dict, baseline: dict, tolerance: float = 0.2) -> List[str]:
+    """Endpoints whose p95 grew by more than `tolerance` relative to the baseline"""
+    found = []
+    for name, stats in summary["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before and before["p95"] and stats["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{name}: p95 {before['p95']:.2f} ms -> {stats['p95']:.2f} ms")
+    return found
+
+
+def save(summary: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.0f}%"
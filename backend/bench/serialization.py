@@ -0,0 +1,161 @@
+"""
+Serialization benchmark for the largest list payloads.
+
+Times the response path of each payload before and after the switch to
+typed response models and ORJSONResponse, on synthetic rows, so it needs
+no database:
+
+    before: hand-built dicts -> jsonable_encoder -> json.dumps
+    after:  rows -> response model (from_attributes) -> orjson.dumps
+"""
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.payment import PaymentStatus
+from app.schemas.document import DocumentResponse
+from app.schemas.payment import TenantPaymentResponse
+from app.schemas.tenant import TenantSummaryResponse
+
+
+@dataclass
+class Timing:
+    payload: str
+    rows: int
+    before_ms: float
+    after_ms: float
+
+    @property
+    def speedup(self) -> float:
+        return self.before_ms / self.after_ms if self.after_ms else 0.0
+
+
+def _json_response(content) -> bytes:
+    # What fastapi.responses.JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_response(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _typed(model) -> Callable:
+    adapter = TypeAdapter(List[model])
+
+    def render(rows) -> bytes:
+        # What FastAPI does for a declared response_model, then ORJSONResponse
+        return _orjson_response(adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json"))
+
+    return render
+
+
+# ============ SYNTHETIC ROWS ============
+
+def _payments(count: int) -> list:
+    created = datetime(2026, 1, 1, 9, 30)
+    return [SimpleNamespace(
+        id=uuid.uuid4(), amount=Decimal("950.00"), due_date=date(2026, 1, 1) + timedelta(days=30 * (i % 24)),
+        paid_date=date(2026, 1, 3) if i % 3 else None, status=PaymentStatus.PAID if i % 3 else PaymentStatus.PENDING,
+        payment_method="stripe", late_fee=Decimal("25.00") if i % 7 == 0 else None, created_at=created,
+        payment_type="rent" if i % 5 else None, description=None,
+    ) for i in range(count)]
+
+
+def _documents(count: int) -> list:
+    created = datetime(2026, 1, 1, 9, 30)
+    return [SimpleNamespace(
+        id=uuid.uuid4(), property_id=uuid.uuid4(), tenant_id=uuid.uuid4() if i % 2 else None,
+        document_type="lease", title=f"Lease {i}", description=None, filename="lease.pdf",
+        file_url=f"documents/{i}.pdf", file_size=1024 * i, mime_type="application/pdf",
+        visible_to_all_tenants=not i % 2, created_at=created,
+        property_name="Main St", tenant_name=f"Tenant {i}" if i % 2 else None,
+    ) for i in range(count)]
+
+
+def _tenants(count: int) -> list:
+    return [SimpleNamespace(id=uuid.uuid4(), user_email=f"tenant-{i}@example.com",
+                            room_number="A", unit_number=f"{i:03d}") for i in range(count)]
+
+
+# ============ BEFORE ============
+
+def _legacy_payments(payments) -> bytes:
+    return _json_response(jsonable_encoder([{
+        "id": str(payment.id),
+        "amount": str(payment.amount),
+        "due_date": payment.due_date.isoformat(),
+        "paid_date": payment.paid_date.isoformat() if payment.paid_date else None,
+        "status": payment.status.lower(),
+        "payment_method": payment.payment_method,
+        "late_fee": str(payment.late_fee) if payment.late_fee else "0.00",
+        "created_at": payment.created_at.isoformat(),
+        "payment_type": payment.payment_type if payment.payment_type else "rent",
+        "description": payment.description
+    } for payment in payments]))
+
+
+_document_adapter = TypeAdapter(List[DocumentResponse])
+
+
+def _legacy_documents(documents) -> bytes:
+    # The endpoint already declared DocumentResponse but built the dicts by hand
+    dicts = [{
+        "id": doc.id, "property_id": doc.property_id, "tenant_id": doc.tenant_id,
+        "document_type": doc.document_type, "title": doc.title, "description": doc.description,
+        "filename": doc.filename, "file_url": doc.file_url, "file_size": doc.file_size,
+        "mime_type": doc.mime_type, "visible_to_all_tenants": doc.visible_to_all_tenants,
+        "created_at": doc.created_at, "property_name": doc.property_name, "tenant_name": doc.tenant_name,
+    } for doc in documents]
+    return _json_response(_document_adapter.dump_python(_document_adapter.validate_python(dicts), mode="json"))
+
+
+def _legacy_tenants(tenants) -> bytes:
+    return _json_response(jsonable_encoder([{
+        "id": str(tenant.id),
+        "user_email": tenant.user_email,
+        "room_number": tenant.room_number,
+        "unit_number": tenant.unit_number,
+    } for tenant in tenants]))
+
+
+PAYLOADS: Dict[str, tuple] = {
+    "tenant payments": (_payments, _legacy_payments, _typed(TenantPaymentResponse)),
+    "operator documents": (_documents, _legacy_documents, _typed(DocumentResponse)),
+    "operator tenants": (_tenants, _legacy_tenants, _typed(TenantSummaryResponse)),
+}
+
+
+def _best_of(render: Callable, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(rows)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows: int = 5000, repeat: int = 5) -> List[Timing]:
+    timings = []
+    for name, (make_rows, before, after) in PAYLOADS.items():
+        data = make_rows(rows)
+        if json.loads(before(data)) != json.loads(after(data)):
+            raise AssertionError(f"{name}: serialized payloads differ")
+        timings.append(Timing(name, rows, round(_best_of(before, data, repeat), 2), round(_best_of(after, data, repeat), 2)))
+    return timings
+
+
+def format_table(timings: List[Timing]) -> str:
+    header = f"{'payload':<22} {'rows':>7} {'before ms':>10} {'after ms':>10} {'speedup':>8}"
+    lines = [header, "-" * len(header)]
+    for t in timings:
+        lines.append(f"{t.payload:<22} {t.rows:>7} {t.before_ms:>10.2f} {t.after_ms:>10.2f} {t.speedup:>7.1f}x")
+    return "\n".join(lines)
@@ -0,0 +1,80 @@
+"""
+Cold start benchmark: how long a fresh interpreter takes to import the app.
+
+Each run is a new `python -X importtime -c "import app.main"` process, so
+nothing is shared with the caller's already-imported modules. The report
+gives the best total and the slowest top-level packages, and fails when
+the total is over budget or a lazily loaded SDK was imported at boot.
+"""
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# SDKs that must only be imported by the routes that use them
+LAZY_MODULES = ("stripe", "boto3", "botocore", "resend", "PIL")
+
+
+@dataclass
+class Startup:
+    total_ms: float
+    # Self import time summed per top-level package, so nested imports are not counted twice
+    packages: Dict[str, float] = field(default_factory=dict)
+    modules: Set[str] = field(default_factory=set)
+
+    def slowest(self, count: int = 10) -> List[tuple]:
+        return sorted(self.packages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def parse_importtime(stderr: str, module: str = "app.main") -> Startup:
+    """Total, per-package and per-module figures from `-X importtime` output"""
+    total_ms, packages, modules = 0.0, {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        root = name.split(".")[0]
+        modules.add(name)
+        packages[root] = packages.get(root, 0.0) + int(self_us) / 1000
+        if name == module:
+            total_ms = int(cumulative_us) / 1000
+    return Startup(round(total_ms, 1), {k: round(v, 1) for k, v in packages.items()}, modules)
+
+
+def _import_once(module: str) -> Startup:
+    env = {**os.environ}
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "bench-secret-key")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr, module)
+
+
+def run(repeat: int = 3, module: str = "app.main") -> Startup:
+    """Best of `repeat` fresh interpreters"""
+    return min((_import_once(module) for _ in range(repeat)), key=lambda startup: startup.total_ms)
+
+
+def violations(startup: Startup, budget_ms: float = None) -> List[str]:
+    found = [f"{name} is imported at startup" for name in LAZY_MODULES if name in startup.modules]
+    if budget_ms is not None and startup.total_ms > budget_ms:
+        found.append(f"cold start {startup.total_ms:.1f} ms is over the {budget_ms:.0f} ms budget")
+    return found
+
+
+def format_table(startup: Startup, count: int = 10) -> str:
+    header = f"{'package':<28} {'self ms':>14}"
+    lines = [header, "-" * len(header)]
+    for name, ms in startup.slowest(count):
+        lines.append(f"{name:<28} {ms:>14.1f}")
+    lines.append(f"\ncold start (import app.main): {startup.total_ms:.1f} ms")
+    return "\n".join(lines)
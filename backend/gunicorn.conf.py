@@ -0,0 +1,94 @@
+"""
+Production launcher settings: `gunicorn app.main:app -c gunicorn.conf.py`.
+
+Migrations are not run here. They run once per deploy as a release step
+(Procfile `release`, Railway `preDeployCommand`) so that starting extra
+instances never waits on `alembic upgrade head`.
+"""
+import logging
+import multiprocessing
+import os
+
+from app.config import get_settings
+
+
+def worker_count(cpus: int, connection_budget: int, connections_per_worker: int) -> int:
+    """
+    The usual 2 * CPU + 1, capped so every worker can fill its connection
+    pool without the service exceeding its share of the database's connections.
+    """
+    by_cpu = 2 * cpus + 1
+    by_pool = connection_budget // max(connections_per_worker, 1)
+    return max(1, min(by_cpu, by_pool))
+
+
+def per_worker_limits(settings, workers: int) -> bool:
+    """Whether each worker keeps its own rate-limit buckets, multiplying every limit by `workers`"""
+    return workers > 1 and settings.rate_limit_backend == "memory"
+
+
+def per_process_backends(settings, workers: int) -> list:
+    """
+    Settings naming per-process stores that are wrong once several workers
+    serve the same clients: a memory response cache is only invalidated in
+    the worker that committed, so the others keep serving the old body.
+    """
+    if workers > 1 and settings.response_cache_backend == "memory":
+        return ["response_cache_backend"]
+    return []
+
+
+settings = get_settings()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY") or worker_count(
+    multiprocessing.cpu_count(),
+    settings.db_connection_budget,
+    settings.db_pool_size + settings.db_max_overflow,
+))
+
+# Refuse the per-worker response cache: with several workers it needs the shared (redis) backend.
+# Settings are cached, so the app imported below sees the change.
+for name in per_process_backends(settings, workers):
+    logging.getLogger("gunicorn.error").warning(
+        f"{name.upper()}=memory is per worker and {workers} workers are configured; "
+        f"the response cache is disabled. Set it to redis (with RESPONSE_CACHE_URL) to cache."
+    )
+    setattr(settings, name, "none")
+
+# Memory rate limits still stop single-worker floods, so they are kept, but the real limit is higher
+if per_worker_limits(settings, workers):
+    logging.getLogger("gunicorn.error").warning(
+        f"RATE_LIMIT_BACKEND=memory counts per worker: with {workers} workers an address gets up to "
+        f"{workers} times each limit. Set it to redis (with RATE_LIMIT_URL) to enforce them as configured."
+    )
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+
+# Seconds a silent worker may run before it is killed, and how long a restarting
+# worker gets to finish in-flight requests
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# Kept above the edge proxy's idle timeout so the proxy, not us, closes idle connections
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "75"))
+
+# Recycle workers to bound slow memory growth; jitter keeps them from restarting together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+# Behind the platform proxy: trust X-Forwarded-* for the scheme. The client address this yields is the
+# left-most X-Forwarded-For entry, which the client controls; rate limits use rate_limit.client_ip instead
+forwarded_allow_ips = "*"
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Connections opened by the master during preload must not be shared across processes
+    from app.database import engine
+    engine.dispose(close=False)
@@ -1,9 +1,8 @@
 #!/bin/bash
 
-# Run migrations
-echo "Running database migrations..."
-alembic upgrade head
+# Migrations run once per deploy as the release step (see Procfile / railway.json),
+# not on every instance start
 
 # Start the app
 echo "Starting application..."
-uvicorn app.main:app --host 0.0.0.0 --port $PORT
+exec gunicorn app.main:app -c gunicorn.conf.py
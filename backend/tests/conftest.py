@@ -0,0 +1,332 @@
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("METRICS_RECONCILE_INTERVAL_SECONDS", "0")
+os.environ.setdefault("METRICS_SNAPSHOT_INTERVAL_SECONDS", "0")
+os.environ.setdefault("STRIPE_EVENT_INTERVAL_SECONDS", "0")
+os.environ.setdefault("TOKEN_REVOCATION_SYNC_SECONDS", "0")
+os.environ.setdefault("MAINTENANCE_PHOTO_SWEEP_INTERVAL_SECONDS", "0")
+# Tests log in far more often than any limit allows; test_rate_limit installs its own limiter
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+# Cheapest bcrypt cost, hashed in-process; tests that need the pool create their own
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import ARRAY, create_engine, event, types as sqltypes
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.database import Base, get_db
+from app.models.user import User
+from app.models.operator import Operator
+from app.models.property import Property
+from app.models.unit import Unit
+from app.models.room import Room, RoomStatus
+from app.models.tenant import Tenant, TenantStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
+from app.models.announcement import Announcement
+from app.models.document import Document
+from app.models.message import Message
+from app.models.tenant_preference import TenantPreference
+from app.services.property_snapshots import bucket_start
+from app.services.response_cache import response_cache
+from app.services.tokens import access_claims, create_access_token
+
+
+# ============ SQLITE STAND-IN FOR POSTGRES TYPES ============
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(bucket_start, "sqlite")
+def _compile_bucket_start(element, compiler, **kw):
+    unit, value = element.clauses.clauses
+    value = compiler.process(value, **kw)
+    if unit.name == "'week'":
+        return f"date({value}, '-' || ((CAST(strftime('%w', {value}) AS INTEGER) + 6) % 7) || ' days')"
+    return f"date({value}, 'start of month')"
+
+
+class _SQLiteUuid(sqltypes.Uuid):
+    """Accept string ids the way Postgres does (routers pass path params through as str)"""
+
+    def bind_processor(self, dialect):
+        process = super().bind_processor(dialect)
+
+        def coerce(value):
+            if isinstance(value, str):
+                value = uuid.UUID(value)
+            return process(value) if process else value
+
+        return coerce
+
+
+def make_engine():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    engine.dialect.colspecs = {**engine.dialect.colspecs, sqltypes.Uuid: _SQLiteUuid}
+    Base.metadata.create_all(engine)
+    return engine
+
+
+# ============ FIXTURES ============
+
+@pytest.fixture
+def engine():
+    engine = make_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    response_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.pop(get_db, None)
+
+
+class QueryCounter:
+    """Records every SQL statement sent to the engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @contextmanager
+    def count(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def total(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def query_counter(engine):
+    return QueryCounter(engine)
+
+
+# ============ SEED DATA ============
+
+@dataclass
+class Portfolio:
+    """Ids and tokens for one seeded operator and one of their tenants"""
+    operator_token: str
+    tenant_token: str
+    property_id: str
+    unit_id: str
+    room_id: str
+    tenant_id: str
+    payment_id: str
+    maintenance_id: str
+    announcement_id: str
+    document_id: str
+    operator_user_id: str
+    tenant_user_id: str
+
+
+def auth_headers(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_portfolio(
+    db,
+    name: str,
+    properties: int = 1,
+    units_per_property: int = 1,
+    rooms_per_unit: int = 2,
+    payments_per_tenant: int = 2,
+    requests_per_room: int = 1,
+    documents_per_tenant: int = 1,
+    announcements_per_property: int = 1,
+    messages_per_tenant: int = 2,
+) -> Portfolio:
+    """
+    Seed one operator with a full property tree.
+    Every room is occupied so that each per-row lookup is exercised.
+    """
+    today = date.today()
+
+    operator_user = User(email=f"{name}-operator@example.com", role="operator",
+                         first_name=name.title(), last_name="Operator")
+    db.add(operator_user)
+    db.flush()
+    operator = Operator(user_id=operator_user.id, company_name=f"{name.title()} Living")
+    db.add(operator)
+    db.flush()
+
+    first = {}
+    for p in range(properties):
+        prop = Property(operator_id=operator.id, name=f"{name} property {p}",
+                        address=f"{p} Main St", city="Springfield", state="CA", zip="90000")
+        db.add(prop)
+        db.flush()
+        first.setdefault("property", prop)
+
+        for a in range(announcements_per_property):
+            announcement = Announcement(property_id=prop.id, created_by=operator_user.id,
+                                        title=f"Notice {a}", message="Water shut off on Friday")
+            db.add(announcement)
+            db.flush()
+            first.setdefault("announcement", announcement)
+
+        for u in range(units_per_property):
+            unit = Unit(property_id=prop.id, unit_number=f"{p}{u:02d}", floor=u,
+                        bedrooms=rooms_per_unit, bathrooms=1)
+            db.add(unit)
+            db.flush()
+            first.setdefault("unit", unit)
+
+            for r in range(rooms_per_unit):
+                room = Room(unit_id=unit.id, room_number=chr(ord("A") + r),
+                            rent_amount=Decimal("900.00") + r * 50, status=RoomStatus.OCCUPIED)
+                db.add(room)
+                db.flush()
+                first.setdefault("room", room)
+
+                tenant_user = User(email=f"{name}-tenant-{p}-{u}-{r}@example.com", role="tenant",
+                                   first_name="Tenant", last_name=f"{p}{u}{r}")
+                db.add(tenant_user)
+                db.flush()
+                tenant = Tenant(user_id=tenant_user.id, room_id=room.id,
+                                lease_start=today - timedelta(days=180),
+                                lease_end=today + timedelta(days=180),
+                                rent_amount=room.rent_amount, status=TenantStatus.ACTIVE)
+                db.add(tenant)
+                db.flush()
+                first.setdefault("tenant", tenant)
+                first.setdefault("tenant_user", tenant_user)
+                db.add(TenantPreference(tenant_id=tenant.id))
+
+                for i in range(payments_per_tenant):
+                    payment = Payment(tenant_id=tenant.id, room_id=room.id, amount=room.rent_amount,
+                                      due_date=today - timedelta(days=30 * i),
+                                      paid_date=today - timedelta(days=30 * i) if i else None,
+                                      status=PaymentStatus.PAID if i else PaymentStatus.PENDING,
+                                      payment_method="manual")
+                    db.add(payment)
+                    first.setdefault("payment", payment)
+
+                for i in range(requests_per_room):
+                    request = MaintenanceRequest(property_id=prop.id, unit_id=unit.id, room_id=room.id,
+                                                 tenant_id=tenant.id, title=f"Leaky faucet {i}",
+                                                 priority=MaintenancePriority.MEDIUM,
+                                                 status=MaintenanceStatus.OPEN,
+                                                 assigned_to=operator_user.id)
+                    db.add(request)
+                    db.flush()
+                    first.setdefault("maintenance", request)
+
+                for i in range(documents_per_tenant):
+                    document = Document(property_id=prop.id, tenant_id=tenant.id, document_type="lease",
+                                        title=f"Lease {i}", filename="lease.pdf",
+                                        file_url=f"documents/{uuid.uuid4()}.pdf",
+                                        file_size=1024, mime_type="application/pdf")
+                    db.add(document)
+                    db.flush()
+                    first.setdefault("document", document)
+
+                for i in range(messages_per_tenant):
+                    from_tenant = i % 2 == 0
+                    db.add(Message(sender_id=tenant_user.id if from_tenant else operator_user.id,
+                                   sender_role="tenant" if from_tenant else "operator",
+                                   receiver_id=operator_user.id if from_tenant else tenant_user.id,
+                                   receiver_role="operator" if from_tenant else "tenant",
+                                   tenant_id=tenant.id, message=f"Message {i}"))
+
+    db.commit()
+
+    return Portfolio(
+        operator_token=create_access_token(access_claims(db, operator_user)),
+        tenant_token=create_access_token(access_claims(db, first["tenant_user"])),
+        property_id=str(first["property"].id),
+        unit_id=str(first["unit"].id),
+        room_id=str(first["room"].id),
+        tenant_id=str(first["tenant"].id),
+        payment_id=str(first["payment"].id),
+        maintenance_id=str(first["maintenance"].id),
+        announcement_id=str(first["announcement"].id),
+        document_id=str(first["document"].id),
+        operator_user_id=str(operator_user.id),
+        tenant_user_id=str(first["tenant_user"].id),
+    )
+
+
+@pytest.fixture
+def small_portfolio(db):
+    return seed_portfolio(db, "small")
+
+
+@pytest.fixture
+def large_portfolio(db):
+    return seed_portfolio(
+        db,
+        "large",
+        properties=3,
+        units_per_property=3,
+        rooms_per_unit=3,
+        payments_per_tenant=6,
+        requests_per_room=3,
+        documents_per_tenant=3,
+        announcements_per_property=4,
+        messages_per_tenant=5,
+    )
@@ -0,0 +1,98 @@
+"""
+A local stand-in for the parts of the Stripe API the services call.
+
+Runs a real HTTP server on a free port so the stripe SDK is exercised end
+to end (request encoding, list pagination, error handling), just pointed
+at `api_base` instead of api.stripe.com.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeStripe:
+    def __init__(self):
+        self.payment_intents = {}
+        self.requests = []
+        self._ids = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_intent(self, amount: int, status: str = "requires_payment_method", payment_id=None,
+                   created: int = None, **fields) -> dict:
+        self._ids += 1
+        intent = {
+            "id": f"pi_fake_{self._ids}",
+            "object": "payment_intent",
+            "amount": amount,
+            "amount_received": amount if status == "succeeded" else 0,
+            "currency": "usd",
+            "status": status,
+            "client_secret": f"pi_fake_{self._ids}_secret",
+            "created": created or int(time.time()) - 60,
+            "metadata": {"payment_id": str(payment_id)} if payment_id else {},
+            "last_payment_error": None,
+            **fields,
+        }
+        self.payment_intents[intent["id"]] = intent
+        return intent
+
+    # ============ HTTP ============
+
+    def _list_intents(self, query):
+        def bound(name):
+            value = query.get(f"created[{name}]")
+            return int(value[0]) if value else None
+
+        gte, lt = bound("gte"), bound("lt")
+        intents = sorted(self.payment_intents.values(), key=lambda i: (i["created"], i["id"]), reverse=True)
+        intents = [i for i in intents if (gte is None or i["created"] >= gte) and (lt is None or i["created"] < lt)]
+        if "starting_after" in query:
+            ids = [i["id"] for i in intents]
+            intents = intents[ids.index(query["starting_after"][0]) + 1:]
+        limit = int(query.get("limit", ["10"])[0])
+        return {"object": "list", "url": "/v1/payment_intents",
+                "has_more": len(intents) > limit, "data": intents[:limit]}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                fake.requests.append(("GET", url.path, url.query))
+                if url.path == "/v1/payment_intents":
+                    return self._send(200, fake._list_intents(parse_qs(url.query)))
+                match = re.fullmatch(r"/v1/payment_intents/([\w]+)", url.path)
+                if match and match.group(1) in fake.payment_intents:
+                    return self._send(200, fake.payment_intents[match.group(1)])
+                self._send(404, {"error": {"type": "invalid_request_error", "message": "No such resource"}})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
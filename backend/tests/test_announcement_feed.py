@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from app.models.announcement import Announcement
+from app.models.announcement_read import AnnouncementRead
+from tests.conftest import auth_headers
+
+FEED = "/api/v1/tenants/me/announcements"
+
+
+def post_announcements(db, portfolio, count, start=datetime(2026, 1, 1)):
+    announcements = [
+        Announcement(property_id=portfolio.property_id, created_by=portfolio.operator_user_id,
+                     title=f"Notice {start + timedelta(hours=i)}", message="Bins go out on Tuesday",
+                     created_at=start + timedelta(hours=i // 2))  # pairs share a timestamp
+        for i in range(count)
+    ]
+    db.add_all(announcements)
+    db.commit()
+    return announcements
+
+
+def feed(client, portfolio, **params):
+    response = client.get(FEED, params=params, headers=auth_headers(portfolio.tenant_token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def unread(client, portfolio):
+    return client.get(f"{FEED}/unread-count", headers=auth_headers(portfolio.tenant_token)).json()["unread_count"]
+
+
+def test_feed_pages_newest_first_without_repeats(client, db, small_portfolio):
+    post_announcements(db, small_portfolio, 25)
+    expected = db.query(Announcement).filter(Announcement.property_id == small_portfolio.property_id).all()
+    expected.sort(key=lambda a: (a.created_at, str(a.id)), reverse=True)
+
+    items, cursor = [], None
+    while True:
+        page = feed(client, small_portfolio, limit=7, **({"cursor": cursor} if cursor else {}))
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert [item["id"] for item in items] == [str(a.id) for a in expected]
+
+
+def test_polling_with_since_returns_only_new_announcements(client, db, small_portfolio):
+    newest = feed(client, small_portfolio)["newest_cursor"]
+    assert feed(client, small_portfolio, since=newest)["items"] == []
+
+    posted = post_announcements(db, small_portfolio, 3, start=datetime(2030, 1, 1))
+    page = feed(client, small_portfolio, since=newest)
+
+    assert {item["id"] for item in page["items"]} == {str(a.id) for a in posted}
+    assert feed(client, small_portfolio, since=page["newest_cursor"])["items"] == []
+
+
+def test_read_state_and_unread_count(client, db, small_portfolio, large_portfolio):
+    posted = post_announcements(db, small_portfolio, 4)
+    headers = auth_headers(small_portfolio.tenant_token)
+    assert unread(client, small_portfolio) == 5
+
+    first = client.get(FEED, headers=headers)
+    response = client.post(f"{FEED}/read", headers=headers,
+                           json={"announcement_ids": [str(posted[0].id), large_portfolio.announcement_id]})
+    assert response.json() == {"unread_count": 4}
+
+    # Reading changes the feed's ETag, and the other property's announcement was not recorded
+    after = client.get(FEED, headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200
+    assert [item["id"] for item in after.json()["items"] if item["read"]] == [str(posted[0].id)]
+    assert db.query(AnnouncementRead).count() == 1
+
+    assert client.post(f"{FEED}/read", headers=headers, json={"all": True}).json() == {"unread_count": 0}
+    assert unread(client, large_portfolio) == 4
+
+
+def test_feed_rejects_bad_parameters(client, small_portfolio):
+    headers = auth_headers(small_portfolio.tenant_token)
+
+    for params in ({"limit": 0}, {"cursor": "nope"}, {"since": "nope"}):
+        assert client.get(FEED, params=params, headers=headers).status_code == 400
+    assert client.post(f"{FEED}/read", headers=headers, json={}).status_code == 400
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.models.payment import Payment
+from bench import generator, report, serialization, startup
+from bench.load import run_load
+from bench.login import LOGIN, PROBE, run_logins
+from tests.conftest import make_engine
+
+SMALL = generator.Scale(operators=1, properties_per_operator=1, units_per_property=2,
+                        rooms_per_unit=2, occupancy=1.0, years_of_payments=1,
+                        messages_per_tenant=2, tickets_per_unit=1, announcements_per_property=2)
+
+
+def test_generator_is_deterministic(session_factory):
+    first = generator.generate(session_factory(), SMALL, seed=7, today=date(2026, 1, 15))
+
+    other_engine = make_engine()
+    second = generator.generate(sessionmaker(bind=other_engine)(), SMALL, seed=7, today=date(2026, 1, 15))
+    other_engine.dispose()
+
+    assert first == second
+    assert len(first.tenants) == 4
+    assert first.row_counts["rooms"] == 4
+
+    db = session_factory()
+    assert db.query(func.count(Payment.id)).scalar() == first.row_counts["payments"]
+    db.close()
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert report.percentile(values, 50) == 50.0
+    assert report.percentile(values, 95) == 95.0
+    assert report.percentile(values, 99) == 99.0
+    assert report.percentile([], 50) == 0.0
+
+
+def test_load_run_reports_every_route(client, session_factory):
+    # `client` installs the test database override on the app
+    dataset = generator.generate(session_factory(), SMALL, seed=1)
+
+    result = asyncio.run(run_load(app, dataset, requests=60, concurrency=4, seed=1))
+    summary = report.summarize(result)
+
+    assert summary["requests"] == 60
+    assert summary["errors"] == 0
+    assert all(stats["p50"] <= stats["p95"] <= stats["p99"] for stats in summary["endpoints"].values())
+    assert report.regressions(summary, summary) == []
+
+
+def test_login_run_probes_other_routes(client, session_factory):
+    dataset = generator.generate(session_factory(), SMALL, seed=1)
+
+    result = asyncio.run(run_logins(app, dataset, requests=12, concurrency=3, seed=1, probe_interval=0.001))
+    by_route = result.by_route()
+
+    assert len(by_route[LOGIN]) == 12
+    assert by_route[PROBE]
+    assert report.summarize(result)["errors"] == 0
+
+
+def test_serialization_paths_produce_the_same_json():
+    # run() fails if the typed/orjson payload differs from the hand-built one
+    timings = serialization.run(rows=50, repeat=1)
+
+    assert [t.payload for t in timings] == list(serialization.PAYLOADS)
+    assert all(t.before_ms > 0 and t.after_ms > 0 for t in timings)
+
+
+def test_cold_start_does_not_import_payment_storage_or_email_sdks():
+    result = startup.run()
+
+    assert result.total_ms > 0
+    assert "app.routers.stripe_routes" in result.modules
+    # Same budget as `python -m bench startup`
+    assert startup.violations(result, budget_ms=2500) == []
+
+
+def test_lazy_sdks_are_not_loaded_by_importing_the_app():
+    # A fresh interpreter, since this one has already imported everything
+    script = "import sys, app.main; print(' '.join(sorted(sys.modules)))"
+    env = {**os.environ, "DATABASE_URL": "sqlite://", "SECRET_KEY": "bench-secret-key"}
+    completed = subprocess.run([sys.executable, "-c", script], cwd=startup.BACKEND, env=env,
+                               capture_output=True, text=True, check=True)
+
+    loaded = {name.split(".")[0] for name in completed.stdout.split()}
+    assert loaded.isdisjoint({"stripe", "resend", "boto3"})
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from app.models.property_metrics import PropertyMetrics
+from app.models.room import Room
+from app.models.unit import Unit
+from tests.conftest import auth_headers
+
+
+def _unit(number, floor, rooms=(), **overrides):
+    return {"unit_number": number, "floor": floor, "bedrooms": max(len(rooms), 1), "bathrooms": 1,
+            "square_feet": 900, "rooms": [{"room_number": r, "rent_amount": "1200.00"} for r in rooms],
+            **overrides}
+
+
+def test_bulk_create_units_with_rooms(client, db, small_portfolio):
+    payload = {"property_id": small_portfolio.property_id, "units": [
+        _unit("201", 2, rooms=("A", "B", "C")),
+        _unit("202", 2, rental_type="whole_unit", rooms=("ignored",)),
+    ]}
+
+    response = client.post("/api/v1/units/bulk", json=payload, headers=auth_headers(small_portfolio.operator_token))
+
+    assert response.status_code == 201
+    units = {u["unit_number"]: u for u in response.json()}
+    assert sorted(r["room_number"] for r in units["201"]["rooms"]) == ["A", "B", "C"]
+    # Whole unit rentals still get exactly one virtual room
+    assert [(r["room_number"], r["size_sqft"]) for r in units["202"]["rooms"]] == [("Whole Unit", 900)]
+
+
+def test_bulk_create_rejects_taken_numbers(client, db, small_portfolio, large_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+    taken = db.query(Unit.unit_number).filter(Unit.property_id == small_portfolio.property_id).scalar()
+
+    response = client.post("/api/v1/units/bulk", headers=headers, json={
+        "property_id": small_portfolio.property_id, "units": [_unit(taken, 1), _unit("300", 3), _unit("300", 3)]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Unit numbers already in use: {taken}, 300"
+
+    response = client.post("/api/v1/units/bulk", headers=headers, json={
+        "property_id": large_portfolio.property_id, "units": [_unit("900", 9)]})
+    assert response.status_code == 404
+
+
+def test_clone_unit_across_floors(client, db, small_portfolio):
+    # Seeded unit "000" sits on floor 0 with two occupied rooms
+    response = client.post(
+        f"/api/v1/units/{small_portfolio.unit_id}/clone",
+        json={"floors": [1, 2, 3]},
+        headers=auth_headers(small_portfolio.operator_token),
+    )
+
+    assert response.status_code == 201
+    units = response.json()
+    assert [u["unit_number"] for u in units] == ["100", "200", "300"]
+    assert all(len(u["rooms"]) == 2 for u in units)
+    assert {r["status"] for u in units for r in u["rooms"]} == {"vacant"}
+
+
+def test_bulk_rent_change(client, db, small_portfolio, large_portfolio, query_counter):
+    room_ids = [str(r.id) for r in db.query(Room).join(Unit).filter(Unit.property_id == small_portfolio.property_id)]
+    headers = auth_headers(small_portfolio.operator_token)
+
+    with query_counter.count():
+        response = client.post("/api/v1/rooms/bulk-rent", json={"room_ids": room_ids, "percent_change": "10"},
+                               headers=headers)
+    assert response.json() == {"updated": 2}
+    updates = [s for s in query_counter.statements if s.startswith("UPDATE rooms")]
+    assert len(updates) == 1
+
+    db.expire_all()
+    assert sorted(r.rent_amount for r in db.query(Room).filter(Room.id.in_(room_ids))) == [Decimal("990.00"), Decimal("1045.00")]
+    metrics = db.query(PropertyMetrics).filter(PropertyMetrics.property_id == small_portfolio.property_id).one()
+    assert metrics.potential_monthly == Decimal("2035.00")
+
+    response = client.post("/api/v1/rooms/bulk-rent", headers=headers,
+                           json={"room_ids": room_ids + [large_portfolio.room_id], "rent_amount": "1"})
+    assert response.status_code == 404
+    response = client.post("/api/v1/rooms/bulk-rent", headers=headers,
+                           json={"room_ids": room_ids, "rent_amount": "1", "percent_change": "5"})
+    assert response.status_code == 400
+
+
+def test_bulk_rent_change_rejects_non_positive_rents(client, db, small_portfolio):
+    room_ids = [str(r.id) for r in db.query(Room).join(Unit).filter(Unit.property_id == small_portfolio.property_id)]
+    headers = auth_headers(small_portfolio.operator_token)
+    before = sorted(r.rent_amount for r in db.query(Room).filter(Room.id.in_(room_ids)))
+
+    for change in ({"rent_amount": "0"}, {"rent_amount": "-950"}, {"percent_change": "-100"}, {"percent_change": "-150"}):
+        response = client.post("/api/v1/rooms/bulk-rent", headers=headers, json={"room_ids": room_ids, **change})
+        assert response.status_code == 422, change
+
+    db.expire_all()
+    assert sorted(r.rent_amount for r in db.query(Room).filter(Room.id.in_(room_ids))) == before
@@ -0,0 +1,83 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, choose_encoding, is_compressible
+from tests.conftest import auth_headers
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+def test_choose_encoding(gzip_only):
+    assert choose_encoding("gzip, deflate, br") == "gzip"
+    assert choose_encoding("br;q=1.0, gzip;q=0.8") == "gzip"
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*, gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding(None) is None
+
+
+def test_brotli_is_preferred_when_available(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+
+
+def test_content_types():
+    assert is_compressible("application/json")
+    assert is_compressible("text/csv; charset=utf-8")
+    assert is_compressible("image/svg+xml")
+    assert not is_compressible("application/pdf")
+    assert not is_compressible("image/png")
+    assert not is_compressible("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+
+def test_large_json_is_compressed_and_small_is_not(client, gzip_only, large_portfolio):
+    headers = {**auth_headers(large_portfolio.operator_token), "Accept-Encoding": "gzip"}
+
+    response = client.get("/api/v1/documents/", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 27 * 3
+
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/api/v1/documents/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_etag_is_weak(gzip_only):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.get("/item")
+    def item():
+        return JSONResponse({"name": "x" * 100}, headers={"ETag": '"abc"'})
+
+    test_client = TestClient(app)
+    assert test_client.get("/item", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"abc"'
+    assert test_client.get("/item", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
+
+
+def test_streamed_export_is_compressed_per_chunk(client, gzip_only, large_portfolio):
+    headers = {**auth_headers(large_portfolio.operator_token), "Accept-Encoding": "gzip"}
+
+    with client.stream("GET", "/api/v1/exports/payments.csv", headers=headers) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    plain = client.get("/api/v1/exports/payments.csv", headers={**headers, "Accept-Encoding": "identity"})
+    assert gzip.decompress(raw) == plain.content
+
+    xlsx = client.get("/api/v1/exports/payments.xlsx", headers=headers)
+    assert "content-encoding" not in xlsx.headers
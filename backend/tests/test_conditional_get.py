@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from app.models.announcement import Announcement
+from app.models.property import Property
+from app.models.tenant import Tenant
+from app.models.user import User
+from tests.conftest import auth_headers
+
+
+def test_unchanged_resource_answers_304_without_the_full_query(client, query_counter, small_portfolio):
+    headers = auth_headers(small_portfolio.tenant_token)
+    first = client.get("/api/v1/tenants/me/documents", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "private, no-cache"
+
+    with query_counter.count():
+        response = client.get("/api/v1/tenants/me/documents", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert not any("FROM documents" in statement for statement in query_counter.statements)
+
+    # Weak-prefixed and list forms match too
+    assert client.get("/api/v1/tenants/me/documents",
+                      headers={**headers, "If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+
+def test_writes_change_the_etag(client, db, small_portfolio):
+    headers = auth_headers(small_portfolio.tenant_token)
+    etags = {path: client.get(path, headers=headers).headers["etag"]
+             for path in ("/api/v1/tenants/me/lease", "/api/v1/tenants/me/announcements")}
+
+    operator = db.query(User).filter(User.id == small_portfolio.operator_user_id).one()
+    db.add(Announcement(property_id=small_portfolio.property_id, created_by=operator.id,
+                        title="Elevator", message="Elevator maintenance on Monday"))
+    db.commit()
+
+    response = client.get("/api/v1/tenants/me/announcements",
+                          headers={**headers, "If-None-Match": etags["/api/v1/tenants/me/announcements"]})
+    assert response.status_code == 200
+    assert "Elevator" in {a["title"] for a in response.json()["items"]}
+    assert response.headers["etag"] != etags["/api/v1/tenants/me/announcements"]
+
+    # Property-level changes also reach the lease; the lease itself changes with the tenant row
+    lease_etag = etags["/api/v1/tenants/me/lease"]
+    assert client.get("/api/v1/tenants/me/lease",
+                      headers={**headers, "If-None-Match": lease_etag}).status_code == 200
+    lease_etag = client.get("/api/v1/tenants/me/lease", headers=headers).headers["etag"]
+
+    tenant = db.query(Tenant).filter(Tenant.id == small_portfolio.tenant_id).one()
+    tenant.lease_end = date.today() + timedelta(days=400)
+    db.commit()
+
+    response = client.get("/api/v1/tenants/me/lease", headers={**headers, "If-None-Match": lease_etag})
+    assert response.status_code == 200
+    assert response.json()["lease_end"] == (date.today() + timedelta(days=400)).isoformat()
+
+
+def test_property_list_etag_is_per_operator(client, db, small_portfolio, large_portfolio):
+    small_headers = auth_headers(small_portfolio.operator_token)
+    etag = client.get("/api/v1/properties/", headers=small_headers).headers["etag"]
+    assert client.get("/api/v1/properties/", headers={**small_headers, "If-None-Match": etag}).status_code == 304
+
+    # Another operator's write leaves this list's ETag alone
+    other = db.query(Property).filter(Property.id == large_portfolio.property_id).one()
+    other.name = "Renamed"
+    db.commit()
+    assert client.get("/api/v1/properties/", headers={**small_headers, "If-None-Match": etag}).status_code == 304
+
+    mine = db.query(Property).filter(Property.id == small_portfolio.property_id).one()
+    mine.name = "Renamed"
+    db.commit()
+    response = client.get("/api/v1/properties/", headers={**small_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Renamed"
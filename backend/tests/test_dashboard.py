@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.maintenance import MaintenanceRequest, MaintenanceStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.room import Room, RoomStatus
+from app.models.tenant import Tenant
+from tests.conftest import auth_headers
+
+
+def test_operator_dashboard_metrics(client, db, small_portfolio, large_portfolio):
+    # Small portfolio: 1 property, 1 unit, 2 occupied rooms at 900 + 950,
+    # leases ending in 180 days and one pending payment per tenant due today
+    tenant = db.query(Tenant).filter(Tenant.id == small_portfolio.tenant_id).one()
+    tenant.lease_end = date.today() + timedelta(days=45)
+    overdue_date = date.today() - timedelta(days=3)
+    db.add(Payment(tenant_id=tenant.id, room_id=tenant.room_id, amount=Decimal("900.00"),
+                   due_date=overdue_date, status=PaymentStatus.PENDING,
+                   late_fee=Decimal("25.00")))
+    for request in db.query(MaintenanceRequest).filter(
+        MaintenanceRequest.property_id == small_portfolio.property_id
+    ):
+        request.status = MaintenanceStatus.CLOSED
+    db.commit()
+
+    response = client.get("/api/v1/dashboard/operator", headers=auth_headers(small_portfolio.operator_token))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_properties": 1,
+        "total_units": 1,
+        "total_rooms": 2,
+        "occupied_rooms": 2,
+        "total_revenue": 1850.0,
+        "collected_this_month": 0.0,
+        "outstanding_this_month": 1850.0 + (925.0 if overdue_date.month == date.today().month else 0.0),
+        "overdue_amount": 925.0,
+        "open_maintenance": 0,
+        "lease_expirations": {"next_30_days": 0, "next_60_days": 1, "next_90_days": 1},
+    }
+
+
+def test_property_dashboard_metrics(client, db, large_portfolio):
+    room = db.query(Room).filter(Room.id == large_portfolio.room_id).one()
+    room.status = RoomStatus.VACANT
+    db.commit()
+
+    response = client.get(
+        f"/api/v1/dashboard/property/{large_portfolio.property_id}",
+        headers=auth_headers(large_portfolio.operator_token),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["property"]["name"] == "large property 0"
+    assert body["units"] == {"total": 3}
+    assert body["rooms"] == {"total": 9, "occupied": 8, "vacant": 1, "occupancy_rate": 88.9}
+    assert body["revenue"]["potential_monthly"] == 3 * (900 + 950 + 1000)
+    assert body["revenue"]["actual_monthly"] == 3 * (900 + 950 + 1000) - 900
+    assert body["maintenance"] == {"open": 27}
+
+
+def test_property_dashboard_is_scoped_to_operator(client, small_portfolio, large_portfolio):
+    response = client.get(
+        f"/api/v1/dashboard/property/{large_portfolio.property_id}",
+        headers=auth_headers(small_portfolio.operator_token),
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,61 @@
+import runpy
+from pathlib import Path
+
+import pytest
+
+from app.config import get_settings
+
+CONFIG = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+
+
+@pytest.fixture(autouse=True)
+def restore_settings(monkeypatch):
+    # The config adjusts the shared settings object; put it back afterwards
+    settings = get_settings()
+    monkeypatch.setattr(settings, "response_cache_backend", settings.response_cache_backend)
+    monkeypatch.setattr(settings, "rate_limit_backend", settings.rate_limit_backend)
+
+
+def test_worker_count_is_capped_by_the_connection_budget():
+    worker_count = runpy.run_path(str(CONFIG))["worker_count"]
+
+    assert worker_count(cpus=2, connection_budget=1000, connections_per_worker=15) == 5
+    assert worker_count(cpus=8, connection_budget=80, connections_per_worker=15) == 5
+    assert worker_count(cpus=8, connection_budget=10, connections_per_worker=15) == 1
+
+
+def test_config_uses_uvicorn_workers_with_preload(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    config = runpy.run_path(str(CONFIG))
+
+    assert config["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert config["workers"] == 3
+    assert config["preload_app"] is True
+    assert config["max_requests_jitter"] > 0
+
+
+def test_memory_cache_is_refused_with_several_workers(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "response_cache_backend", "memory")
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    runpy.run_path(str(CONFIG))
+    assert settings.response_cache_backend == "memory"
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    runpy.run_path(str(CONFIG))
+    assert settings.response_cache_backend == "none"
+
+    monkeypatch.setattr(settings, "response_cache_backend", "redis")
+    runpy.run_path(str(CONFIG))
+    assert settings.response_cache_backend == "redis"
+
+
+def test_per_worker_rate_limits_are_flagged(monkeypatch):
+    settings = get_settings()
+    per_worker_limits = runpy.run_path(str(CONFIG))["per_worker_limits"]
+
+    monkeypatch.setattr(settings, "rate_limit_backend", "memory")
+    assert per_worker_limits(settings, workers=3)
+    assert not per_worker_limits(settings, workers=1)
+    monkeypatch.setattr(settings, "rate_limit_backend", "redis")
+    assert not per_worker_limits(settings, workers=3)
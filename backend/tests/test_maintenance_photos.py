@@ -0,0 +1,188 @@
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from PIL import Image
+
+from app.main import app
+from app.models.maintenance_photo import MaintenancePhoto, MaintenancePhotoStatus
+from app.models.tenant import Tenant
+from app.routers import tenant_portal
+from app.services import maintenance_photos
+from app.services.file_storage import file_storage
+from tests.conftest import auth_headers
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Run thumbnail generation inline and capture what the worker stores"""
+    files = {}
+    monkeypatch.setattr(maintenance_photos, "_photo_executor", lambda: InlineExecutor())
+    monkeypatch.setattr(file_storage, "put_bytes", lambda key, content, content_type: files.update({key: content}))
+    return files
+
+
+def jpeg(width=2400, height=1800, orientation=None) -> bytes:
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new("RGB", (width, height), "teal").save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def upload(client, path, token, content, content_type="image/jpeg"):
+    return client.post(path, headers=auth_headers(token),
+                       files={"file": ("photo.jpg", content, content_type)})
+
+
+def test_operator_upload_generates_thumbnail_and_webp_variants(client, db, small_portfolio, stored):
+    path = f"/api/v1/maintenance/{small_portfolio.maintenance_id}/photos"
+    response = upload(client, path, small_portfolio.operator_token, jpeg())
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == MaintenancePhotoStatus.PROCESSING
+
+    photo = db.get(MaintenancePhoto, response.json()["id"])
+    assert photo.status == MaintenancePhotoStatus.READY
+    assert (photo.width, photo.height) == (2400, 1800)
+
+    sizes = {key: Image.open(io.BytesIO(content)) for key, content in stored.items()}
+    assert (sizes[photo.thumbnail_key].format, sizes[photo.thumbnail_key].size) == ("JPEG", (320, 240))
+    assert (sizes[photo.thumbnail_webp_key].format, sizes[photo.thumbnail_webp_key].size) == ("WEBP", (320, 240))
+    assert (sizes[photo.display_webp_key].format, sizes[photo.display_webp_key].size) == ("WEBP", (1600, 1200))
+
+    detail = client.get(f"/api/v1/maintenance/photos/{photo.id}",
+                        headers=auth_headers(small_portfolio.operator_token)).json()
+    assert detail["original_url"].endswith(photo.original_key)
+    assert detail["display_webp_url"].endswith(photo.display_webp_key)
+
+
+def test_exif_rotation_is_applied(client, db, small_portfolio, stored):
+    # Orientation 6: stored landscape, displayed portrait
+    path = f"/api/v1/maintenance/{small_portfolio.maintenance_id}/photos"
+    photo_id = upload(client, path, small_portfolio.operator_token, jpeg(orientation=6)).json()["id"]
+
+    photo = db.get(MaintenancePhoto, photo_id)
+    assert (photo.width, photo.height) == (1800, 2400)
+    assert Image.open(io.BytesIO(stored[photo.thumbnail_key])).size == (240, 320)
+
+
+def test_lists_carry_thumbnails_only(client, small_portfolio, stored):
+    path = f"/api/v1/maintenance/{small_portfolio.maintenance_id}/photos"
+    upload(client, path, small_portfolio.operator_token, jpeg())
+    upload(client, path, small_portfolio.operator_token, b"not an image")
+
+    items = client.get("/api/v1/maintenance/queue", headers=auth_headers(small_portfolio.operator_token)).json()["items"]
+    photos = next(item["photos"] for item in items if item["id"] == small_portfolio.maintenance_id)
+    tenant_items = client.get("/api/v1/tenants/me/maintenance", headers=auth_headers(small_portfolio.tenant_token)).json()
+
+    by_status = {p["status"]: p for p in photos}
+    assert len(photos) == 2
+    assert by_status[MaintenancePhotoStatus.READY]["thumbnail_url"]
+    assert by_status[MaintenancePhotoStatus.READY]["thumbnail_webp_url"]
+    assert by_status[MaintenancePhotoStatus.FAILED]["thumbnail_url"] is None
+    assert all("original_url" not in p for p in photos)
+    assert tenant_items[0]["photos"] == photos
+
+
+def test_tenant_upload_is_limited_to_their_own_requests(client, db, small_portfolio, large_portfolio, stored):
+    own = upload(client, f"/api/v1/tenants/me/maintenance/{small_portfolio.maintenance_id}/photos",
+                 small_portfolio.tenant_token, jpeg())
+    other = upload(client, f"/api/v1/tenants/me/maintenance/{large_portfolio.maintenance_id}/photos",
+                   small_portfolio.tenant_token, jpeg())
+
+    assert own.status_code == 200
+    assert other.status_code == 404
+    assert client.get(f"/api/v1/tenants/me/maintenance/photos/{own.json()['id']}",
+                      headers=auth_headers(large_portfolio.tenant_token)).status_code == 404
+    assert client.get(f"/api/v1/maintenance/photos/{own.json()['id']}",
+                      headers=auth_headers(large_portfolio.operator_token)).status_code == 404
+
+
+def test_rejects_unsupported_types_and_oversized_files(client, small_portfolio, stored, monkeypatch):
+    path = f"/api/v1/maintenance/{small_portfolio.maintenance_id}/photos"
+    monkeypatch.setattr(maintenance_photos, "CHUNK_SIZE", 1024)
+    monkeypatch.setattr(maintenance_photos.get_settings(), "maintenance_photo_max_bytes", 4096)
+
+    assert upload(client, path, small_portfolio.operator_token, b"%PDF", "application/pdf").status_code == 400
+    assert upload(client, path, small_portfolio.operator_token, jpeg()).status_code == 400
+    assert stored == {}
+
+
+def test_tenant_without_a_room_sees_no_requests(client, small_portfolio, stored):
+    app.dependency_overrides[tenant_portal.get_current_tenant] = lambda: Tenant(room_id=None)
+    try:
+        response = upload(client, f"/api/v1/tenants/me/maintenance/{small_portfolio.maintenance_id}/photos",
+                          small_portfolio.tenant_token, jpeg())
+    finally:
+        app.dependency_overrides.pop(tenant_portal.get_current_tenant)
+
+    assert response.status_code == 404
+    assert stored == {}
+
+
+def test_failed_jobs_are_logged(monkeypatch, caplog):
+    monkeypatch.setattr(maintenance_photos, "_photo_executor", lambda: InlineExecutor())
+
+    def broken(*args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(maintenance_photos, "generate_variants", broken)
+    maintenance_photos._queue("photo-id", "/nowhere")
+
+    assert "database went away" in caplog.text
+
+
+def test_sweep_requeues_lost_jobs_and_fails_abandoned_ones(db, session_factory, small_portfolio, stored, monkeypatch):
+    now = datetime.now(timezone.utc)
+    lost = MaintenancePhoto(request_id=small_portfolio.maintenance_id, original_key="maintenance/lost.jpg",
+                            created_at=now - timedelta(minutes=20))
+    abandoned = MaintenancePhoto(request_id=small_portfolio.maintenance_id, original_key="maintenance/old.jpg",
+                                 created_at=now - timedelta(hours=2), updated_at=now - timedelta(minutes=20))
+    recent = MaintenancePhoto(request_id=small_portfolio.maintenance_id, original_key="maintenance/new.jpg",
+                              created_at=now)
+    db.add_all([lost, abandoned, recent])
+    db.commit()
+
+    downloaded = []
+    monkeypatch.setattr(file_storage, "download_fileobj",
+                        lambda key, fileobj: (downloaded.append(key), fileobj.write(jpeg(640, 480))))
+    assert maintenance_photos.recover_stale_photos(db.get_bind(), timedelta(minutes=10)) == 1
+
+    db.expire_all()
+    assert downloaded == ["maintenance/lost.jpg"]
+    assert db.get(MaintenancePhoto, lost.id).status == MaintenancePhotoStatus.READY
+    assert db.get(MaintenancePhoto, abandoned.id).status == MaintenancePhotoStatus.FAILED
+    assert db.get(MaintenancePhoto, recent.id).status == MaintenancePhotoStatus.PROCESSING
+    # Already swept: a second pass finds nothing to do
+    assert maintenance_photos.recover_stale_photos(db.get_bind(), timedelta(minutes=10)) == 0
+
+
+def test_sweep_removes_orphaned_spool_files():
+    fd, orphan = tempfile.mkstemp(prefix=maintenance_photos.SPOOL_PREFIX)
+    os.close(fd)
+    fd, live = tempfile.mkstemp(prefix=maintenance_photos.SPOOL_PREFIX)
+    os.close(fd)
+    hours_ago = time.time() - 3 * 3600
+    os.utime(orphan, (hours_ago, hours_ago))
+    try:
+        maintenance_photos._remove_orphaned_spools(maintenance_photos.MAX_PROCESSING_AGE)
+        assert not os.path.exists(orphan)
+        assert os.path.exists(live)
+    finally:
+        os.unlink(live)
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from app.models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
+from tests.conftest import auth_headers
+
+RANK = {priority: rank for rank, priority in enumerate(MaintenancePriority)}
+
+
+def queue(client, portfolio, **params):
+    response = client.get("/api/v1/maintenance/queue", params=params, headers=auth_headers(portfolio.operator_token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_queue_pages_through_open_tickets_by_priority_then_age(client, db, large_portfolio):
+    requests = db.query(MaintenanceRequest).order_by(MaintenanceRequest.id).all()
+    start = datetime(2026, 1, 1)
+    for i, request in enumerate(requests):
+        request.priority = list(MaintenancePriority)[i % 4]
+        request.created_at = start + timedelta(hours=i % 7)  # plenty of ties on created_at
+        if i % 5 == 0:
+            request.status = MaintenanceStatus.CLOSED
+    db.commit()
+    expected = sorted(
+        (r for r in requests if r.status != MaintenanceStatus.CLOSED),
+        key=lambda r: (-RANK[r.priority], r.created_at, str(r.id)),
+    )
+
+    items, cursor = [], None
+    while True:
+        page = queue(client, large_portfolio, limit=20, **({"cursor": cursor} if cursor else {}))
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert [item["id"] for item in items] == [str(r.id) for r in expected]
+
+
+def test_queue_filters(client, db, large_portfolio, small_portfolio):
+    request = db.get(MaintenanceRequest, large_portfolio.maintenance_id)
+    request.status = MaintenanceStatus.RESOLVED
+    db.commit()
+
+    by_property = queue(client, large_portfolio, property_id=large_portfolio.property_id, limit=100)["items"]
+    resolved = queue(client, large_portfolio, status="resolved")["items"]
+    assigned = queue(client, large_portfolio, assigned_to=large_portfolio.operator_user_id, limit=100)["items"]
+    other = queue(client, large_portfolio, assigned_to=small_portfolio.operator_user_id)["items"]
+
+    assert len(by_property) == 26 and {i["property_id"] for i in by_property} == {large_portfolio.property_id}
+    assert [i["id"] for i in resolved] == [large_portfolio.maintenance_id]
+    assert len(assigned) == 80
+    assert other == []
+
+
+def test_queue_rejects_bad_parameters(client, small_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+
+    for params in ({"status": "pending"}, {"limit": 0}, {"cursor": "not-a-cursor"}):
+        assert client.get("/api/v1/maintenance/queue", params=params, headers=headers).status_code == 400
@@ -0,0 +1,102 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.models.user import User
+from app.routers.tenant_profile import PasswordChange, change_password
+from app.services import passwords
+
+
+def login(client, email, password):
+    return client.post("/api/v1/auth/login", data={"username": email, "password": password})
+
+
+@pytest.fixture
+def operator(db, small_portfolio):
+    user = db.query(User).filter(User.id == small_portfolio.operator_user_id).one()
+    user.password_hash = passwords.password_context(get_settings().bcrypt_rounds).hash("correct horse")
+    db.commit()
+    return user
+
+
+def test_login_checks_the_password(client, operator):
+    assert login(client, operator.email, "correct horse").status_code == 200
+    assert login(client, operator.email, "wrong horse").status_code == 401
+    assert login(client, "nobody@example.com", "correct horse").status_code == 401
+
+
+def test_login_rehashes_at_the_configured_cost(client, db, operator):
+    rounds = get_settings().bcrypt_rounds
+    operator.password_hash = passwords.password_context(rounds + 1).hash("correct horse")
+    db.commit()
+
+    assert login(client, operator.email, "correct horse").status_code == 200
+
+    db.refresh(operator)
+    assert operator.password_hash.startswith(f"$2b${rounds:02d}$")
+    assert passwords.password_context(rounds).verify("correct horse", operator.password_hash)
+
+
+def test_change_password_and_tenant_signup(client, db, small_portfolio):
+    tenant_user = db.query(User).filter(User.id == small_portfolio.tenant_user_id).one()
+    tenant_user.is_activated = False
+    db.commit()
+
+    signup = client.post("/api/v1/tenant-auth/signup", json={
+        "email": tenant_user.email, "password": "first-password", "confirm_password": "first-password",
+    })
+    assert signup.status_code == 200, signup.text
+
+    db.refresh(tenant_user)
+    # The profile router is not mounted, so call the endpoint directly
+    with pytest.raises(HTTPException) as wrong:
+        asyncio.run(change_password(PasswordChange(current_password="not-it", new_password="second-password"),
+                                    db, tenant_user))
+    asyncio.run(change_password(PasswordChange(current_password="first-password", new_password="second-password"),
+                                db, tenant_user))
+
+    assert wrong.value.status_code == 400
+    assert login(client, tenant_user.email, "second-password").status_code == 200
+
+
+def test_hashing_runs_on_the_process_pool(monkeypatch):
+    monkeypatch.setattr(get_settings(), "password_hash_workers", 1)
+    passwords._hash_pool.cache_clear()
+    try:
+        async def round_trip():
+            password_hash = await passwords.hash_password("correct horse")
+            return password_hash, await passwords.verify_password("correct horse", password_hash)
+
+        password_hash, (matches, new_hash) = asyncio.run(round_trip())
+        assert passwords._hash_pool() is not None
+    finally:
+        pool = passwords._hash_pool()
+        passwords._hash_pool.cache_clear()
+        pool.shutdown()
+
+    assert matches and new_hash is None
+    assert password_hash.startswith(f"$2b${get_settings().bcrypt_rounds:02d}$")
+
+
+def test_broken_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr(get_settings(), "password_hash_workers", 1)
+    passwords._hash_pool.cache_clear()
+    broken = passwords._hash_pool()
+    try:
+        # A pool process dying (e.g. OOM-killed) breaks the whole pool
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+
+        matches, _ = asyncio.run(passwords.verify_password(
+            "correct horse", passwords.password_context(get_settings().bcrypt_rounds).hash("correct horse")
+        ))
+        assert matches
+        assert passwords._hash_pool() is not broken
+    finally:
+        pool = passwords._hash_pool()
+        passwords._hash_pool.cache_clear()
+        pool.shutdown()
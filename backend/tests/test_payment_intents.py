@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.payment import Payment, PaymentStatus
+from app.services import stripe_service
+from tests.conftest import auth_headers
+
+
+class FakePaymentIntents:
+    """Stands in for stripe.PaymentIntent; honours idempotency keys like the API does"""
+
+    def __init__(self):
+        self.intents = {}
+        self.by_key = {}
+        self.creates = 0
+
+    def create(self, amount, currency, idempotency_key=None, **kwargs):
+        if idempotency_key in self.by_key:
+            return self.by_key[idempotency_key]
+        self.creates += 1
+        intent = SimpleNamespace(id=f"pi_{self.creates}", client_secret=f"pi_{self.creates}_secret",
+                                 amount=amount, currency=currency, status="requires_payment_method")
+        self.intents[intent.id] = intent
+        if idempotency_key:
+            self.by_key[idempotency_key] = intent
+        return intent
+
+    def retrieve(self, intent_id):
+        return self.intents[intent_id]
+
+    def cancel(self, intent_id):
+        self.intents[intent_id].status = "canceled"
+        return self.intents[intent_id]
+
+
+@pytest.fixture
+def intents(monkeypatch):
+    intents = FakePaymentIntents()
+    fake = SimpleNamespace(PaymentIntent=intents, error=SimpleNamespace(StripeError=RuntimeError))
+    monkeypatch.setattr(stripe_service, "get_stripe", lambda: fake)
+    return intents
+
+
+def create_intent(client, portfolio, payment_id):
+    return client.post(f"/api/v1/stripe/create-payment-intent/{payment_id}",
+                       headers=auth_headers(portfolio.tenant_token))
+
+
+def test_reopening_the_payment_modal_reuses_the_intent(client, db, small_portfolio, intents):
+    payment = db.query(Payment).filter(Payment.tenant_id == small_portfolio.tenant_id,
+                                       Payment.status == PaymentStatus.PENDING).one()
+
+    first = create_intent(client, small_portfolio, payment.id)
+    second = create_intent(client, small_portfolio, payment.id)
+
+    assert first.status_code == 200
+    assert second.json()["clientSecret"] == first.json()["clientSecret"]
+    assert intents.creates == 1
+    db.expire_all()
+    assert db.get(Payment, payment.id).stripe_payment_id == "pi_1"
+
+
+def test_new_intent_when_the_stored_one_is_not_reusable(client, db, small_portfolio, intents):
+    payment = db.query(Payment).filter(Payment.tenant_id == small_portfolio.tenant_id,
+                                       Payment.status == PaymentStatus.PENDING).one()
+    create_intent(client, small_portfolio, payment.id)
+
+    intents.intents["pi_1"].status = "canceled"
+    assert create_intent(client, small_portfolio, payment.id).json()["clientSecret"] == "pi_2_secret"
+
+    # Amount changed since the intent was created: the old one can no longer be paid
+    payment.amount += 25
+    db.commit()
+    assert create_intent(client, small_portfolio, payment.id).json()["clientSecret"] == "pi_3_secret"
+    assert intents.creates == 3
+    assert intents.intents["pi_2"].status == "canceled"
+
+
+@pytest.mark.parametrize("intent_status", ["processing", "succeeded"])
+def test_no_second_intent_while_a_payment_is_in_flight(client, db, small_portfolio, intents, intent_status):
+    payment = db.query(Payment).filter(Payment.tenant_id == small_portfolio.tenant_id,
+                                       Payment.status == PaymentStatus.PENDING).one()
+    create_intent(client, small_portfolio, payment.id)
+
+    # e.g. an ACH debit that takes days to settle, with the webhook not in yet
+    intents.intents["pi_1"].status = intent_status
+    payment.amount += 25
+    db.commit()
+
+    response = create_intent(client, small_portfolio, payment.id)
+    assert response.status_code == 409
+    assert intents.creates == 1
+
+
+def test_paid_payment_gets_no_intent(client, db, small_portfolio, intents):
+    payment = db.query(Payment).filter(Payment.tenant_id == small_portfolio.tenant_id,
+                                       Payment.status == PaymentStatus.PAID).first()
+
+    assert create_intent(client, small_portfolio, payment.id).status_code == 400
+    assert intents.creates == 0
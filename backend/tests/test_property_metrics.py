@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from app.models.property import Property
+from app.models.property_metrics import PropertyMetrics
+from app.models.room import Room, RoomStatus
+from app.models.tenant import Tenant, TenantStatus
+from app.models.unit import Unit
+from app.services import property_metrics
+from app.services.property_metrics import PropertyMetricsService
+from tests.conftest import auth_headers
+
+
+def _metrics(db, property_id):
+    db.expire_all()
+    return db.query(PropertyMetrics).filter(PropertyMetrics.property_id == property_id).one()
+
+
+def test_rollup_follows_orm_writes(db, small_portfolio):
+    metrics = _metrics(db, small_portfolio.property_id)
+    assert (metrics.total_rooms, metrics.occupied_rooms, metrics.vacant_rooms) == (2, 2, 0)
+    assert metrics.as_of == date.today()
+
+    tenant = db.query(Tenant).filter(Tenant.id == small_portfolio.tenant_id).one()
+    room = db.query(Room).filter(Room.id == tenant.room_id).one()
+    tenant.status = TenantStatus.MOVED_OUT
+    room.status = RoomStatus.VACANT
+    room.rent_amount = 1000
+    db.commit()
+
+    metrics = _metrics(db, small_portfolio.property_id)
+    assert (metrics.occupied_rooms, metrics.vacant_rooms) == (1, 1)
+    assert float(metrics.potential_monthly) == 1950.0
+    assert float(metrics.actual_monthly) == 950.0
+
+
+def test_payments_stay_with_the_property_they_were_charged_in(db, large_portfolio):
+    old_property = large_portfolio.property_id
+    new_property = db.query(Property).filter(Property.name == "large property 1").one()
+    before = {pid: _metrics(db, pid).outstanding_this_month for pid in (old_property, new_property.id)}
+
+    unit = db.query(Unit).filter(Unit.property_id == new_property.id).first()
+    room = Room(unit_id=unit.id, room_number="Z", rent_amount=1200, status=RoomStatus.OCCUPIED)
+    db.add(room)
+    db.flush()
+    tenant = db.query(Tenant).filter(Tenant.id == large_portfolio.tenant_id).one()
+    tenant.room_id = room.id
+    db.commit()
+
+    after = {pid: _metrics(db, pid).outstanding_this_month for pid in (old_property, new_property.id)}
+    assert after == before
+    assert PropertyMetricsService.reconcile(db)["drifted"] == []
+
+
+def test_reconcile_repairs_bulk_updates(db, small_portfolio, large_portfolio):
+    # Bulk UPDATEs skip the flush hooks and leave the rollup behind
+    db.query(Room).filter(Room.id == large_portfolio.room_id).update({"status": RoomStatus.VACANT})
+    db.commit()
+    assert _metrics(db, large_portfolio.property_id).vacant_rooms == 0
+
+    report = PropertyMetricsService.reconcile(db)
+
+    assert report["checked"] == 4
+    assert report["drifted"] == [large_portfolio.property_id]
+    assert _metrics(db, large_portfolio.property_id).vacant_rooms == 1
+    assert PropertyMetricsService.reconcile(db)["drifted"] == []
+
+
+def test_stale_rows_are_recomputed_on_read(client, db, small_portfolio):
+    db.query(PropertyMetrics).update({"as_of": date.today() - timedelta(days=1), "occupied_rooms": 0})
+    db.commit()
+
+    response = client.get(
+        f"/api/v1/dashboard/property/{small_portfolio.property_id}",
+        headers=auth_headers(small_portfolio.operator_token),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["rooms"]["occupied"] == 2
+    assert _metrics(db, small_portfolio.property_id).as_of == date.today()
+
+
+def test_reconciliation_runs_in_one_worker_at_a_time(db, small_portfolio, monkeypatch):
+    assert property_metrics.reconcile_once(db.get_bind()) is not None
+
+    @contextmanager
+    def held_elsewhere(name, bind=None):
+        yield False
+
+    def must_not_run(db):
+        raise AssertionError("reconciled while another worker held the lock")
+
+    monkeypatch.setattr(property_metrics, "advisory_lock", held_elsewhere)
+    monkeypatch.setattr(PropertyMetricsService, "reconcile", must_not_run)
+    assert property_metrics.reconcile_once(db.get_bind()) is None
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.property_snapshot import PropertySnapshot
+from app.models.room import Room, RoomStatus
+from app.services import property_snapshots
+from app.services.property_snapshots import PropertySnapshotService
+from tests.conftest import auth_headers
+
+
+def test_capture_is_idempotent_per_day(db, small_portfolio, large_portfolio):
+    assert PropertySnapshotService.capture(db) == 4
+
+    room = db.query(Room).filter(Room.id == small_portfolio.room_id).one()
+    room.status = RoomStatus.VACANT
+    db.commit()
+    PropertySnapshotService.capture(db)
+
+    rows = db.query(PropertySnapshot).filter(PropertySnapshot.property_id == small_portfolio.property_id).all()
+    assert len(rows) == 1
+    assert (rows[0].snapshot_date, rows[0].occupied_rooms, rows[0].vacant_rooms) == (date.today(), 1, 1)
+    assert rows[0].rent_roll == Decimal("950.00")
+
+
+def _seed_history(db, property_id, first_day, days):
+    # Occupancy climbs by one room a week; collections grow through each month
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        occupied = min(10, 4 + offset // 7)
+        db.add(PropertySnapshot(property_id=property_id, snapshot_date=day, total_rooms=10,
+                                occupied_rooms=occupied, vacant_rooms=10 - occupied,
+                                rent_roll=Decimal(occupied * 1000), collected=Decimal(day.day * 100),
+                                overdue=Decimal(0)))
+    db.commit()
+
+
+def test_history_downsamples_to_buckets(client, db, small_portfolio):
+    # 2026-01-05 is a Monday; 56 days are eight full weeks, ending on Sunday 1 March
+    _seed_history(db, small_portfolio.property_id, date(2026, 1, 5), 56)
+    headers = auth_headers(small_portfolio.operator_token)
+
+    weekly = client.get("/api/v1/dashboard/history?start=2026-01-01&end=2026-03-31&bucket=week",
+                        headers=headers).json()["points"]
+    assert len(weekly) == 8
+    assert weekly[0] == {
+        "period_start": "2026-01-05", "days": 7, "total_rooms": 10, "occupied_rooms": 4,
+        "vacant_rooms": 6, "average_occupancy_rate": 40.0, "rent_roll": 4000.0,
+        "collected": 1100.0, "overdue": 0.0,
+    }
+    assert weekly[-1]["period_start"] == "2026-02-23"
+
+    monthly = client.get("/api/v1/dashboard/history?start=2026-01-01&end=2026-03-31&bucket=month",
+                         headers=headers).json()["points"]
+    assert [(p["period_start"], p["days"]) for p in monthly] == [("2026-01-01", 27), ("2026-02-01", 28), ("2026-03-01", 1)]
+    assert monthly[0]["collected"] == 3100.0
+    assert monthly[1]["collected"] == 2800.0
+    assert monthly[1]["occupied_rooms"] == 10
+
+
+def test_history_validates_and_scopes(client, small_portfolio, large_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+
+    response = client.get("/api/v1/dashboard/history?start=2026-01-01&end=2026-03-31&bucket=year", headers=headers)
+    assert response.status_code == 400
+
+    response = client.get(
+        f"/api/v1/dashboard/history?start=2026-01-01&end=2026-03-31&property_id={large_portfolio.property_id}",
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+
+def test_capture_runs_in_one_worker_at_a_time(db, small_portfolio, monkeypatch):
+    assert property_snapshots.capture_once(db.get_bind()) == 1
+
+    @contextmanager
+    def held_elsewhere(name, bind=None):
+        yield False
+
+    monkeypatch.setattr(property_snapshots, "advisory_lock", held_elsewhere)
+    db.query(PropertySnapshot).delete()
+    db.commit()
+    assert property_snapshots.capture_once(db.get_bind()) is None
+    assert db.query(PropertySnapshot).count() == 0
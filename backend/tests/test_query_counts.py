@@ -0,0 +1,218 @@
+"""
+Query-count regression suite.
+
+Every endpoint is called once against a small portfolio and once against a
+portfolio several times larger. The number of SQL statements must be the
+same for both and stay within the endpoint's budget, so a loop that issues
+one query per row (N+1) fails here before it reaches production.
+"""
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+
+from app.services import email_service
+from tests.conftest import auth_headers
+
+
+@dataclass
+class Endpoint:
+    method: str
+    path: str
+    budget: int
+    as_tenant: bool = False
+    json: Optional[dict] = None
+
+    @property
+    def id(self):
+        return f"{self.method} {self.path}"
+
+
+ENDPOINTS = [
+    # Authentication
+    Endpoint("GET", "/auth/me", 1),
+
+    # Dashboard
+    Endpoint("GET", "/dashboard/operator", 2),
+    Endpoint("GET", "/dashboard/property/{property_id}", 1),
+    Endpoint("GET", "/dashboard/history?start=2020-01-01&end=2100-01-01&bucket=month", 1),
+
+    # Properties
+    Endpoint("GET", "/properties/", 2),
+    Endpoint("GET", "/properties/{property_id}", 1),
+
+    # Units
+    Endpoint("GET", "/units/property/{property_id}", 3),
+    Endpoint("GET", "/units/{unit_id}", 2),
+
+    # Rooms
+    Endpoint("GET", "/rooms/unit/{unit_id}", 3),
+    Endpoint("GET", "/rooms/{room_id}", 3),
+
+    # Tenants
+    Endpoint("GET", "/tenants/property/{property_id}", 3),
+    Endpoint("GET", "/tenants/room/{room_id}", 5),
+    Endpoint("GET", "/tenants/{tenant_id}", 4),
+    Endpoint("GET", "/tenants/all/tenants", 1),
+
+    # Payments
+    Endpoint("GET", "/payments/property/{property_id}", 3),
+    Endpoint("POST", "/payments/generate-recurring", 6),
+
+    # Maintenance
+    Endpoint("GET", "/maintenance/property/{property_id}", 3),
+    Endpoint("GET", "/maintenance/queue", 2),
+    Endpoint("GET", "/maintenance/{maintenance_id}", 2),
+
+    # Announcements
+    Endpoint("GET", "/announcements/property/{property_id}", 2),
+
+    # Documents
+    Endpoint("GET", "/documents/property/{property_id}", 2),
+    Endpoint("GET", "/documents/", 1),
+    Endpoint("GET", "/documents/download/{document_id}", 2),
+
+    # Preferences
+    Endpoint("GET", "/preferences/me", 3, as_tenant=True),
+    Endpoint("GET", "/preferences/{tenant_id}", 4),
+
+    # Messages
+    Endpoint("GET", "/messages/conversations", 4),
+    Endpoint("GET", "/messages/conversations", 3, as_tenant=True),
+
+    # Tenant portal
+    Endpoint("GET", "/tenants/me/profile", 2, as_tenant=True),
+    Endpoint("GET", "/tenants/me/bootstrap", 9, as_tenant=True),
+    Endpoint("GET", "/tenants/me/lease", 3, as_tenant=True),
+    Endpoint("GET", "/tenants/me/payments", 4, as_tenant=True),
+    Endpoint("GET", "/tenants/me/maintenance", 4, as_tenant=True),
+    Endpoint("GET", "/tenants/me/announcements", 3, as_tenant=True),
+    Endpoint("GET", "/tenants/me/announcements/unread-count", 2, as_tenant=True),
+    Endpoint("GET", "/tenants/me/documents", 3, as_tenant=True),
+    Endpoint("GET", "/tenants/me/documents/{document_id}/download", 4, as_tenant=True),
+
+    # Search
+    Endpoint("GET", "/search?q=tenant", 5),  # one per result type
+
+    # Exports
+    Endpoint("GET", "/exports/payments.csv", 1),
+    Endpoint("GET", "/exports/tenants.csv", 1),
+    Endpoint("GET", "/exports/rent-roll.xlsx", 1),
+
+    # Notifications
+    Endpoint("POST", "/notifications/send-payment-reminders", 1),
+    Endpoint("POST", "/notifications/send-announcement/{announcement_id}", 2),
+
+    # Stripe
+    Endpoint("GET", "/stripe/config", 0),
+]
+
+# Writes act on one row of each portfolio; string values in the body are
+# formatted with the portfolio's ids like the path is
+WRITE_ENDPOINTS = [
+    # Properties
+    Endpoint("POST", "/properties/", 4, json={
+        "name": "New property", "address": "1 New St", "city": "Springfield", "state": "CA", "zip": "90000"}),
+    Endpoint("PUT", "/properties/{property_id}", 5, json={"house_rules": "No smoking"}),
+
+    # Units
+    Endpoint("POST", "/units/", 5, json={
+        "property_id": "{property_id}", "unit_number": "999", "bedrooms": 2, "bathrooms": 1}),
+    Endpoint("PUT", "/units/{unit_id}", 6, json={"floor": 4}),
+
+    # Rooms
+    Endpoint("POST", "/rooms/", 8, json={"unit_id": "{unit_id}", "room_number": "Z", "rent_amount": "850.00"}),
+    Endpoint("PUT", "/rooms/{room_id}", 9, json={"rent_amount": "975.00"}),
+    Endpoint("POST", "/rooms/bulk-rent", 4, json={"room_ids": ["{room_id}"], "rent_amount": "990.00"}),
+
+    # Tenants
+    Endpoint("PUT", "/tenants/{tenant_id}", 10, json={"deposit_paid": "500.00"}),
+
+    # Payments
+    Endpoint("POST", "/payments/", 8, json={
+        "tenant_id": "{tenant_id}", "room_id": "{room_id}", "amount": "900.00", "due_date": "2100-01-01"}),
+    Endpoint("POST", "/payments/custom-request", 8, json={
+        "tenant_id": "{tenant_id}", "amount": "25.00", "due_date": "2100-01-01",
+        "payment_type": "service_fee", "description": "Key replacement"}),
+    Endpoint("PUT", "/payments/{payment_id}", 9, json={"status": "paid", "paid_date": "2020-01-01"}),
+
+    # Maintenance
+    Endpoint("POST", "/maintenance/", 6, json={
+        "property_id": "{property_id}", "unit_id": "{unit_id}", "room_id": "{room_id}", "title": "Broken blind"}),
+    Endpoint("PUT", "/maintenance/{maintenance_id}", 8, json={"status": "in_progress"}),
+    Endpoint("DELETE", "/maintenance/{maintenance_id}", 4),
+
+    # Announcements
+    Endpoint("POST", "/announcements/", 4, json={"property_id": "{property_id}", "message": "Fire drill"}),
+    Endpoint("PUT", "/announcements/{announcement_id}", 5, json={"title": "Updated notice"}),
+    Endpoint("DELETE", "/announcements/{announcement_id}", 4),
+
+    # Preferences
+    Endpoint("PUT", "/preferences/me", 5, as_tenant=True, json={"noise_tolerance": 2}),
+    Endpoint("PUT", "/preferences/{tenant_id}", 6, json={"pets": True}),
+
+    # Messages
+    Endpoint("POST", "/messages/send", 7, json={
+        "receiver_id": "{tenant_user_id}", "tenant_id": "{tenant_id}", "message": "Rent is due"}),
+    Endpoint("POST", "/messages/send", 7, as_tenant=True, json={
+        "receiver_id": "{operator_user_id}", "tenant_id": "{tenant_id}", "message": "Paid today"}),
+    Endpoint("POST", "/messages/mark-all-read/{tenant_id}", 2),
+
+    # Tenant portal
+    Endpoint("POST", "/tenants/me/maintenance", 6, as_tenant=True, json={"title": "No hot water", "priority": "MEDIUM"}),
+    Endpoint("POST", "/tenants/me/announcements/read", 5, as_tenant=True, json={"all": True}),
+]
+
+
+@pytest.fixture(autouse=True)
+def outbox(monkeypatch):
+    """Notification endpoints send email; record it instead of calling Resend"""
+    sent = []
+    monkeypatch.setattr(email_service, "get_resend", lambda: SimpleNamespace(
+        Emails=SimpleNamespace(send=lambda params: sent.append(params) or {"id": f"email_{len(sent)}"})
+    ))
+    return sent
+
+
+def _format(value, portfolio):
+    if isinstance(value, str):
+        return value.format(**vars(portfolio))
+    if isinstance(value, list):
+        return [_format(item, portfolio) for item in value]
+    if isinstance(value, dict):
+        return {key: _format(item, portfolio) for key, item in value.items()}
+    return value
+
+
+def _call(client, query_counter, endpoint, portfolio):
+    token = portfolio.tenant_token if endpoint.as_tenant else portfolio.operator_token
+    path = "/api/v1" + _format(endpoint.path, portfolio)
+
+    with query_counter.count():
+        response = client.request(endpoint.method, path, headers=auth_headers(token),
+                                  json=_format(endpoint.json, portfolio))
+
+    assert response.status_code < 400, f"{endpoint.id} -> {response.status_code}: {response.text}"
+    return query_counter.total
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    [pytest.param(e, id=e.id + (" [tenant]" if e.as_tenant else "")) for e in ENDPOINTS + WRITE_ENDPOINTS],
+)
+def test_query_count_is_bounded(client, query_counter, small_portfolio, large_portfolio, endpoint):
+    small = _call(client, query_counter, endpoint, small_portfolio)
+    large = _call(client, query_counter, endpoint, large_portfolio)
+
+    assert small == large, f"{endpoint.id}: {small} queries for the small portfolio, {large} for the large one"
+    assert large <= endpoint.budget, f"{endpoint.id}: {large} queries, budget is {endpoint.budget}"
+
+
+def test_announcement_is_sent_to_its_property_only(client, large_portfolio, outbox):
+    response = client.post(f"/api/v1/notifications/send-announcement/{large_portfolio.announcement_id}",
+                           headers=auth_headers(large_portfolio.operator_token))
+
+    assert response.status_code == 200
+    recipients = sorted(email["to"][0] for email in outbox)
+    assert recipients == sorted(f"large-tenant-0-{u}-{r}@example.com" for u in range(3) for r in range(3))
@@ -0,0 +1,131 @@
+import pytest
+
+from app.routers import auth
+from app.services import rate_limit
+from app.services.rate_limit import Limit, MemoryBucketStore, RateLimiter, RedisBucketStore
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(MemoryBucketStore(), {
+        "login": {"ip": Limit(4, 60), "account": Limit(2, 60)},
+        "signup": {"ip": Limit(10, 60), "account": Limit(1, 60)},
+    })
+    monkeypatch.setattr(rate_limit, "rate_limiter", limiter)
+    return limiter
+
+
+def login(client, email, password="wrong horse"):
+    return client.post("/api/v1/auth/login", data={"username": email, "password": password})
+
+
+def test_account_bucket_throttles_one_email(client, small_portfolio, limiter):
+    assert [login(client, "owner@example.com").status_code for _ in range(2)] == [401, 401]
+
+    rejected = login(client, "Owner@Example.com ")
+    assert rejected.status_code == 429
+    assert 1 <= int(rejected.headers["Retry-After"]) <= 30
+    # Other accounts from the same address still get through
+    assert login(client, "someone-else@example.com").status_code == 401
+
+
+def test_ip_bucket_throttles_a_spray_of_emails(client, small_portfolio, limiter):
+    statuses = [login(client, f"user{i}@example.com").status_code for i in range(5)]
+    assert statuses == [401, 401, 401, 401, 429]
+
+
+def test_rejected_attempts_reach_neither_database_nor_bcrypt(client, small_portfolio, limiter,
+                                                            query_counter, monkeypatch):
+    for _ in range(2):
+        login(client, "owner@example.com")
+
+    async def no_hashing(*args):
+        raise AssertionError("bcrypt ran for a rejected attempt")
+
+    monkeypatch.setattr(auth, "verify_password", no_hashing)
+    with query_counter.count():
+        assert login(client, "owner@example.com").status_code == 429
+    assert query_counter.total == 0
+
+
+def test_ip_bucket_uses_the_address_the_proxy_saw(client, small_portfolio, limiter):
+    def from_address(i, proxy_saw):
+        # Everything left of the proxy's own entry is made up by the client
+        headers = {"X-Forwarded-For": f"10.0.0.{i}, {proxy_saw}"}
+        return client.post("/api/v1/auth/login", headers=headers,
+                           data={"username": f"user{i}@example.com", "password": "wrong"}).status_code
+
+    assert [from_address(i, "203.0.113.7") for i in range(5)] == [401, 401, 401, 401, 429]
+    assert from_address(9, "203.0.113.8") == 401
+
+
+def test_client_ip_counts_hops_from_the_right():
+    from starlette.requests import Request
+
+    request = Request({"type": "http", "client": ("192.0.2.1", 5000),
+                       "headers": [(b"x-forwarded-for", b"spoofed, 203.0.113.7, 10.1.0.2")]})
+
+    assert rate_limit.client_ip(request, hops=1) == "10.1.0.2"
+    assert rate_limit.client_ip(request, hops=2) == "203.0.113.7"
+    assert rate_limit.client_ip(request, hops=0) == "192.0.2.1"
+    # Fewer entries than proxies: the header is not what the proxies wrote
+    assert rate_limit.client_ip(request, hops=4) == "192.0.2.1"
+
+
+def test_tenant_signup_is_limited_by_the_submitted_email(client, small_portfolio, limiter):
+    body = {"email": "new-tenant@example.com", "password": "secret-1", "confirm_password": "secret-2"}
+
+    assert client.post("/api/v1/tenant-auth/signup", json=body).status_code == 400
+    assert client.post("/api/v1/tenant-auth/signup", json=body).status_code == 429
+
+
+def test_memory_buckets_refill_and_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    store = MemoryBucketStore(max_keys=3)
+    limit = Limit(2, 10)  # a token every 5s
+
+    assert store.take("a", limit) == (True, 0.0)
+    assert store.take("a", limit) == (True, 0.0)
+    assert store.take("a", limit) == (False, 5.0)
+
+    now[0] += 5
+    assert store.take("a", limit)[0]
+
+    # Full again after 10s, so the idle bucket is dropped
+    now[0] += 10
+    store.take("b", limit)
+    assert len(store) == 1
+
+    for key in "cde":
+        store.take(key, limit)
+    assert len(store) == 3
+
+
+def test_limit_parsing():
+    assert Limit.parse("5/300") == Limit(5, 300)
+    assert Limit.parse("") is None and Limit.parse("0") is None
+    with pytest.raises(ValueError):
+        Limit.parse("-1/60")
+
+
+class FakeScriptingRedis:
+    """Records script calls; the script itself runs on the server"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def register_script(self, script):
+        def run(keys, args):
+            self.calls.append((keys, args))
+            return self.reply
+        return run
+
+
+def test_redis_store_shares_buckets_through_the_server():
+    client = FakeScriptingRedis([0, "2.5"])
+    limiter = RateLimiter(RedisBucketStore(client), {"login": {"ip": None, "account": Limit(5, 300)}})
+
+    assert limiter._take_all("login", "10.0.0.1", "owner@example.com") == 2.5
+    assert client.calls == [(["coliv:ratelimit:login:account:owner@example.com"], [5, 5 / 300])]
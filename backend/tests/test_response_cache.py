@@ -0,0 +1,181 @@
+from datetime import date
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.unit import Unit
+from app.models.user import User
+from app.services.response_cache import LRUCacheBackend, RedisCacheBackend, ResponseCache
+from tests.conftest import auth_headers
+
+
+class FakeRedis:
+    """Just enough of the Redis command set for RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member)
+
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match):
+        return [key for key in self.data if key.startswith(match.rstrip("*"))]
+
+    def info(self, section):
+        return {"evicted_keys": 7}
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return getattr(redis, name)
+
+            def execute(self):
+                pass
+
+        return Pipeline()
+
+
+def test_lru_backend_bounds_and_tags():
+    backend = LRUCacheBackend(max_entries=2, max_bytes=10)
+    backend.set("a", b"1234", {"t1"}, ttl=60)
+    backend.set("b", b"1234", {"t2"}, ttl=60)
+    assert backend.get("a") == b"1234"  # a is now most recent
+
+    backend.set("c", b"12", {"t1"}, ttl=60)  # over the entry bound: b goes
+    assert backend.get("b") is None
+    backend.set("d", b"123456", set(), ttl=60)  # over the byte bound: a goes
+    assert backend.get("a") is None
+
+    assert backend.invalidate({"t1"}) == 1
+    assert backend.get("c") is None
+    backend.set("e", b"1", set(), ttl=-1)  # already expired
+    assert backend.get("e") is None
+
+    stats = backend.stats()
+    assert stats["entries"] == 1 and stats["bytes"] == 6
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["invalidations"]) == (1, 4, 2, 1)
+    assert stats["hit_ratio"] == 0.2
+
+
+def test_redis_backend_and_stale_build_guard():
+    cache = ResponseCache(RedisCacheBackend(FakeRedis()), ttl_seconds=60)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert cache.cached("route", "scope", build, tags=["t"]).headers["x-cache"] == "MISS"
+    hit = cache.cached("route", "scope", build, tags=["t"])
+    assert hit.headers["x-cache"] == "HIT" and hit.body == b'{"value":1}'
+
+    cache.invalidate(["t"])
+    assert cache.cached("route", "scope", build, tags=["t"]).body == b'{"value":2}'
+
+    # A tag invalidated while the response was being built keeps it out of the cache
+    def racing_build():
+        cache.invalidate(["t"])
+        return {"value": "stale"}
+
+    cache.invalidate(["t"])
+    cache.cached("route", "scope", racing_build, tags=["t"])
+    assert cache.cached("route", "scope", build, tags=["t"]).headers["x-cache"] == "MISS"
+    assert cache.stats()["evictions"] == 7
+
+    # With no build running, past invalidations are not remembered
+    cache.invalidate(["t", "u"])
+    assert cache._invalidated_at == {}
+
+
+def test_version_stamped_keys_ignore_entries_from_before_a_write():
+    # Another worker committed: this one's copy was never invalidated, but the versions moved on
+    cache = ResponseCache(LRUCacheBackend(), ttl_seconds=60)
+    assert cache.cached("route", "scope", lambda: {"value": "old"}, versions={"s": 1}).body == b'{"value":"old"}'
+
+    response = cache.cached("route", "scope", lambda: {"value": "new"}, versions={"s": 2})
+    assert response.headers["x-cache"] == "MISS" and response.body == b'{"value":"new"}'
+
+
+def test_cached_endpoint_is_served_without_queries_and_invalidated_on_commit(
+    client, db, query_counter, small_portfolio
+):
+    headers = auth_headers(small_portfolio.operator_token)
+    path = f"/api/v1/units/property/{small_portfolio.property_id}"
+
+    assert client.get(path, headers=headers).headers["x-cache"] == "MISS"
+    with query_counter.count():
+        response = client.get(path, headers=headers)
+    assert response.headers["x-cache"] == "HIT"
+    assert len(response.json()) == 1
+    assert not any("FROM units" in statement for statement in query_counter.statements)
+
+    db.add(Unit(property_id=small_portfolio.property_id, unit_number="999", bedrooms=1, bathrooms=1))
+    db.commit()
+    response = client.get(path, headers=headers)
+    assert response.headers["x-cache"] == "MISS"
+    assert sorted(unit["unit_number"] for unit in response.json()) == ["000", "999"]
+
+    assert client.get("/health/cache").status_code == 401
+    stats = client.get("/health/cache", headers=headers).json()
+    assert stats["backend"] == "memory"
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["invalidations"] >= 1
+
+
+def test_dashboard_cache_follows_rollup_refresh(client, db, small_portfolio, large_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+    before = client.get("/api/v1/dashboard/operator", headers=headers).json()
+    assert client.get("/api/v1/dashboard/operator", headers=headers).headers["x-cache"] == "HIT"
+
+    for payment in db.query(Payment).filter(Payment.status == PaymentStatus.PAID):
+        payment.status = PaymentStatus.OVERDUE
+        payment.due_date = date.today().replace(day=1)
+    db.commit()
+
+    response = client.get("/api/v1/dashboard/operator", headers=headers)
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["overdue_amount"] > before["overdue_amount"]
+
+    # Entries are per operator: a cached property dashboard is not served to another operator
+    path = f"/api/v1/dashboard/property/{small_portfolio.property_id}"
+    assert client.get(path, headers=headers).status_code == 200
+    assert client.get(path, headers=auth_headers(large_portfolio.operator_token)).status_code == 404
+
+
+def test_rooms_by_unit_follows_tenant_profile_changes(client, db, small_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+    path = f"/api/v1/rooms/unit/{small_portfolio.unit_id}"
+
+    def tenant_names():
+        response = client.get(path, headers=headers)
+        return response.headers["x-cache"], {room["tenant"]["first_name"] for room in response.json() if room["tenant"]}
+
+    client.get(path, headers=headers)
+    assert tenant_names()[0] == "HIT"
+
+    # A password change does not touch what the response shows, so it keeps the entry
+    tenant_user = db.get(User, small_portfolio.tenant_user_id)
+    tenant_user.password_hash = "rehashed"
+    db.commit()
+    assert tenant_names()[0] == "HIT"
+
+    tenant_user.first_name = "Renamed"
+    db.commit()
+    cache_status, names = tenant_names()
+    assert cache_status == "MISS"
+    assert "Renamed" in names
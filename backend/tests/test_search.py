@@ -0,0 +1,75 @@
+from sqlalchemy.dialects import postgresql
+
+from app.models.document import Document
+from app.models.user import User
+from app.services.search import _Matcher
+from tests.conftest import auth_headers
+
+
+def _search(client, token, q, **params):
+    response = client.get("/api/v1/search", params={"q": q, **params}, headers=auth_headers(token))
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_search_is_scoped_to_operator(client, small_portfolio, large_portfolio):
+    results = _search(client, large_portfolio.operator_token, "tenant 121", types="tenant")
+
+    assert [r["title"] for r in results] == ["Tenant 121"]
+    assert results[0]["subtitle"] == "large-tenant-1-2-1@example.com · Unit 102, Room B"
+
+    results = _search(client, small_portfolio.operator_token, "large", types="tenant")
+    assert results == []
+
+
+def test_search_covers_every_type(client, small_portfolio):
+    token = small_portfolio.operator_token
+
+    rooms = _search(client, token, "000", types="room")
+    assert [r["title"] for r in rooms] == ["Unit 000, Room A", "Unit 000, Room B"]
+
+    assert {r["type"] for r in _search(client, token, "leaky fau")} == {"maintenance"}
+    assert {r["type"] for r in _search(client, token, "lease")} == {"document"}
+
+    messages = _search(client, token, "message 1", types="message")
+    assert len(messages) == 2
+    assert {r["title"] for r in messages} == {"Message 1"}
+
+
+def test_exact_matches_rank_first_across_types(client, db, small_portfolio):
+    db.add(Document(property_id=small_portfolio.property_id, document_type="other", title="00",
+                    filename="00.pdf", file_url="documents/00.pdf", file_size=1, mime_type="application/pdf"))
+    db.commit()
+
+    results = _search(client, small_portfolio.operator_token, "00")
+
+    # Rooms only matched the prefix of unit 000, tenants a substring of their last name
+    assert [(r["type"], r["match"]) for r in results[:1]] == [("document", "exact")]
+    assert {r["match"] for r in results[1:]} == {"prefix"}
+    assert {r["type"] for r in results[1:]} == {"tenant", "room"}
+    assert all(0 < r["rank"] <= 1 for r in results)
+    assert max(r["rank"] for r in results if r["type"] == "room") == 1
+
+
+def test_search_validation(client, small_portfolio):
+    headers = auth_headers(small_portfolio.operator_token)
+
+    assert client.get("/api/v1/search?q=a", headers=headers).json()["results"] == []
+    assert client.get("/api/v1/search?q=lease&types=invoices", headers=headers).status_code == 400
+    assert client.get("/api/v1/search?q=lease&limit=0", headers=headers).status_code == 400
+    assert client.get("/api/v1/search?q=lease", headers=auth_headers(small_portfolio.tenant_token)).status_code == 403
+
+
+def test_postgres_query_uses_prefix_tsquery_and_trigram_fallback():
+    condition, rank, matched = _Matcher("postgresql", "Jo.Smi@ex").full_text(
+        "users", [User.email], fuzzy=[User.email]
+    )
+    compiled = condition.compile(dialect=postgresql.dialect())
+
+    assert "users.search_vector @@ to_tsquery(" in str(compiled)
+    assert "jo:* & smi:* & ex:*" in compiled.params.values()
+    assert "users.email %% %(email_1)s" in str(compiled)
+    assert compiled.params["email_1"] == "Jo.Smi@ex"
+    assert "similarity" in str(rank.compile(dialect=postgresql.dialect()))
+    # Rows found only by trigram similarity are in the weakest match class
+    assert "CASE WHEN (users.search_vector @@ to_tsquery(" in str(matched.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,100 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.stripe_event import StripeEvent
+from app.services import stripe_events
+from app.services.stripe_events import StripeEventService
+
+SECRET = "whsec_test"
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Emails the processor sends, by recipient"""
+    sent = []
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(stripe_events.EmailService, "send_payment_confirmation",
+                        lambda **kw: sent.append(("tenant", kw["tenant_email"])))
+    monkeypatch.setattr(stripe_events.EmailService, "send_operator_payment_received",
+                        lambda **kw: sent.append(("operator", kw["operator_email"])))
+    return sent
+
+
+def intent_event(event_id, event_type, payment_id, created=None):
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": event_type,
+        "created": created or int(time.time()),
+        "data": {"object": {"id": "pi_123", "object": "payment_intent", "metadata": {"payment_id": payment_id}}},
+    }
+
+
+def deliver(client, event):
+    payload = json.dumps(event)
+    timestamp = int(time.time())
+    signature = hmac.new(SECRET.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return client.post("/api/v1/stripe/webhook", content=payload,
+                       headers={"stripe-signature": f"t={timestamp},v1={signature}"})
+
+
+def pending_payment(db, portfolio) -> Payment:
+    return db.query(Payment).filter(Payment.tenant_id == portfolio.tenant_id,
+                                    Payment.status == PaymentStatus.PENDING).one()
+
+
+def test_webhook_records_once_and_applies_in_background(client, db, small_portfolio, sent):
+    payment = pending_payment(db, small_portfolio)
+    event = intent_event("evt_1", "payment_intent.succeeded", str(payment.id))
+
+    assert deliver(client, event).status_code == 200
+    assert deliver(client, event).status_code == 200  # Stripe retry
+
+    db.expire_all()
+    assert db.query(StripeEvent).count() == 1
+    assert db.get(StripeEvent, "evt_1").processed_at is not None
+    assert db.get(Payment, payment.id).status == PaymentStatus.PAID
+    assert sent == [("tenant", "small-tenant-0-0-0@example.com"), ("operator", "small-operator@example.com")]
+
+
+def test_webhook_rejects_bad_signature(client, db, small_portfolio, sent):
+    response = client.post("/api/v1/stripe/webhook", content=json.dumps(intent_event("evt_1", "x", "y")),
+                           headers={"stripe-signature": "t=1,v1=bad"})
+
+    assert response.status_code == 400
+    assert db.query(StripeEvent).count() == 0
+
+
+def test_events_apply_in_creation_order_and_failures_do_not_block(db, small_portfolio, sent):
+    payment = pending_payment(db, small_portfolio)
+    now = int(time.time())
+    # Delivered out of order: the failure was created before the success
+    StripeEventService.record(db, intent_event("evt_b", "payment_intent.succeeded", str(payment.id), now))
+    StripeEventService.record(db, intent_event("evt_a", "payment_intent.payment_failed", str(payment.id), now - 5))
+    StripeEventService.record(db, {"id": "evt_bad", "type": "payment_intent.succeeded", "created": now - 10, "data": {}})
+
+    assert StripeEventService.process_all(db) == 2
+
+    db.expire_all()
+    assert db.get(Payment, payment.id).status == PaymentStatus.PAID
+    broken = db.get(StripeEvent, "evt_bad")
+    assert broken.processed_at is None and broken.attempts == 1 and broken.last_error
+
+
+def test_replay_reapplies_without_duplicate_side_effects(db, small_portfolio, sent):
+    payment = pending_payment(db, small_portfolio)
+    StripeEventService.record(db, intent_event("evt_1", "payment_intent.succeeded", str(payment.id)))
+    StripeEventService.process_all(db)
+
+    replayed = StripeEventService.replay(db, since=datetime(2020, 1, 1, tzinfo=timezone.utc),
+                                         types=["payment_intent.succeeded"])
+
+    assert replayed == 1
+    assert StripeEventService.process_all(db) == 1
+    assert len(sent) == 2
@@ -0,0 +1,113 @@
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.models.payment import Payment, PaymentStatus
+from app.services import stripe_reconciliation
+from app.services.stripe_reconciliation import StripeReconciliationService
+from app.services.stripe_service import get_stripe
+from tests.fake_stripe import FakeStripe
+
+
+@pytest.fixture
+def fake_stripe(monkeypatch):
+    fake = FakeStripe().start()
+    stripe = get_stripe()
+    monkeypatch.setattr(stripe, "api_base", fake.url)
+    monkeypatch.setattr(stripe, "api_key", "sk_test_fake")
+    monkeypatch.setattr(stripe, "max_network_retries", 0)
+    yield fake
+    fake.stop()
+
+
+def pending_payments(db):
+    return db.query(Payment).filter(Payment.status == PaymentStatus.PENDING).order_by(Payment.id).all()
+
+
+def test_reconcile_applies_missed_outcomes_and_reports_discrepancies(db, large_portfolio, fake_stripe):
+    missed, declined, wrong_amount = pending_payments(db)[:3]
+    for payment, status in ((missed, "succeeded"), (declined, "requires_payment_method"),
+                            (wrong_amount, "succeeded")):
+        amount = int(payment.amount * 100) + (500 if payment is wrong_amount else 0)
+        intent = fake_stripe.add_intent(amount, status, payment_id=payment.id,
+                                        last_payment_error={"code": "card_declined"} if payment is declined else None)
+        payment.stripe_payment_id = intent["id"]
+    db.commit()
+    stranger = fake_stripe.add_intent(1000, "succeeded", payment_id=uuid.uuid4())
+    fake_stripe.add_intent(1000, "succeeded")  # not created by this app
+
+    run = StripeReconciliationService.reconcile(db, page_size=2)
+
+    db.expire_all()
+    assert db.get(Payment, missed.id).status == PaymentStatus.PAID
+    assert db.get(Payment, missed.id).payment_method == "stripe"
+    assert db.get(Payment, declined.id).status == PaymentStatus.FAILED
+    assert db.get(Payment, wrong_amount.id).status == PaymentStatus.PENDING
+    assert (run.intents_seen, run.payments_paid, run.payments_failed) == (5, 1, 1)
+    assert sorted((d["kind"], d["payment_intent"]) for d in run.discrepancies) == sorted([
+        ("amount_mismatch", wrong_amount.stripe_payment_id),
+        ("unknown_payment", stranger["id"]),
+    ])
+    # Five intents in pages of two
+    assert len([r for r in fake_stripe.requests if r[1] == "/v1/payment_intents"]) == 3
+
+
+def test_reconcile_matches_by_metadata_when_the_stored_intent_was_replaced(db, small_portfolio, fake_stripe):
+    payment = pending_payments(db)[0]
+    paid_intent = fake_stripe.add_intent(int(payment.amount * 100), "succeeded", payment_id=payment.id)
+    payment.stripe_payment_id = fake_stripe.add_intent(int(payment.amount * 100), payment_id=payment.id)["id"]
+    db.commit()
+
+    StripeReconciliationService.reconcile(db)
+
+    db.expire_all()
+    assert db.get(Payment, payment.id).status == PaymentStatus.PAID
+    assert db.get(Payment, payment.id).stripe_payment_id == paid_intent["id"]
+
+
+def test_next_run_starts_from_the_watermark(db, small_portfolio, fake_stripe):
+    first = StripeReconciliationService.reconcile(db, now=int(time.time()) - 100, lookback_days=1)
+    fake_stripe.requests.clear()
+
+    StripeReconciliationService.reconcile(db, lookback_days=0)
+
+    (_, _, query), = fake_stripe.requests
+    assert parse_qs(query)["created[gte]"] == [str(first.watermark)]
+
+
+def test_paid_date_comes_from_the_charge(db, small_portfolio, fake_stripe):
+    payment = pending_payments(db)[0]
+    # An ACH debit started three days ago and settled since
+    charged = datetime.now(timezone.utc) - timedelta(days=3)
+    fake_stripe.add_intent(int(payment.amount * 100), "succeeded", payment_id=payment.id,
+                           latest_charge={"id": "ch_1", "object": "charge", "created": int(charged.timestamp())})
+
+    StripeReconciliationService.reconcile(db)
+
+    db.expire_all()
+    assert db.get(Payment, payment.id).paid_date == charged.date()
+    (_, _, query), = fake_stripe.requests
+    assert parse_qs(query)["expand[0]"] == ["data.latest_charge"]
+
+
+def test_payment_paid_meanwhile_keeps_its_date(db, small_portfolio, fake_stripe, monkeypatch):
+    payment = pending_payments(db)[0]
+    fake_stripe.add_intent(int(payment.amount * 100), "succeeded", payment_id=payment.id,
+                           created=int(time.time()) - 5 * 24 * 3600)
+    match_page = stripe_reconciliation._match_page
+
+    def webhook_lands_after_the_match(db, intents, outcome):
+        match_page(db, intents, outcome)
+        db.query(Payment).filter(Payment.id == payment.id).update(
+            {"status": PaymentStatus.PAID, "paid_date": date.today()}, synchronize_session=False
+        )
+
+    monkeypatch.setattr(stripe_reconciliation, "_match_page", webhook_lands_after_the_match)
+    run = StripeReconciliationService.reconcile(db)
+
+    db.expire_all()
+    assert db.get(Payment, payment.id).paid_date == date.today()
+    assert run.payments_paid == 0
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.tenant import Tenant
+from app.services import tenant_bootstrap
+from tests.conftest import auth_headers
+
+
+def bootstrap(client, portfolio):
+    response = client.get("/api/v1/tenants/me/bootstrap", headers=auth_headers(portfolio.tenant_token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_bootstrap_combines_every_section(client, db, large_portfolio):
+    tenant = db.get(Tenant, large_portfolio.tenant_id)
+    db.add(Payment(tenant_id=tenant.id, room_id=tenant.room_id, amount=tenant.rent_amount,
+                   due_date=date.today() - timedelta(days=10), status=PaymentStatus.PENDING))
+    db.commit()
+
+    body = bootstrap(client, large_portfolio)
+
+    assert set(body) == set(tenant_bootstrap.SECTIONS)
+    assert body["lease"]["room_number"] == "A" and body["lease"]["property_name"] == "large property 0"
+    # Seeded: one pending payment due today and five paid, plus the overdue one added above
+    payments = body["payments"]
+    assert (payments["count"], payments["paid_count"], payments["pending_count"], payments["overdue_count"]) == (7, 5, 1, 1)
+    assert payments["outstanding_amount"] == 2 * float(tenant.rent_amount)
+    assert payments["next_due"]["due_date"] == date.today().isoformat()
+    assert body["maintenance"]["open_count"] == 3
+    assert body["announcements"]["unread_count"] == 4
+    assert body["documents"]["count"] == 3
+    assert body["messages"]["latest"]["message"] == "Message 4"
+    assert body["messages"]["unread_count"] == 2  # operator-sent messages are to the tenant
+
+
+def test_bootstrap_matches_the_section_endpoints(client, db, small_portfolio):
+    headers = auth_headers(small_portfolio.tenant_token)
+    body = bootstrap(client, small_portfolio)
+
+    lease = client.get("/api/v1/tenants/me/lease", headers=headers).json()
+    maintenance = client.get("/api/v1/tenants/me/maintenance", headers=headers).json()
+    announcements = client.get("/api/v1/tenants/me/announcements", headers=headers).json()["items"]
+
+    for key in ("property_name", "unit_number", "room_number", "lease_start", "lease_end", "status"):
+        assert body["lease"][key] == lease[key]
+    assert [r["id"] for r in body["maintenance"]["recent"]] == [r["id"] for r in maintenance][:3]
+    assert [a["id"] for a in body["announcements"]["recent"]] == [a["id"] for a in announcements][:3]
+
+
+def test_bootstrap_is_for_tenants(client, small_portfolio):
+    response = client.get("/api/v1/tenants/me/bootstrap", headers=auth_headers(small_portfolio.operator_token))
+    assert response.status_code == 403
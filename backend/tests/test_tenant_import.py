@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+from app.models.payment import Payment
+from app.models.room import Room, RoomStatus
+from app.models.tenant import Tenant, TenantStatus
+from app.models.unit import Unit
+from app.models.user import User
+from app.services.email_service import EmailService
+from tests.conftest import auth_headers
+
+
+def _vacant_rooms(db, property_id, count):
+    unit = Unit(property_id=property_id, unit_number="NEW", floor=9, bedrooms=count, bathrooms=1)
+    db.add(unit)
+    db.flush()
+    rooms = [Room(unit_id=unit.id, room_number=f"N{i}", rent_amount=Decimal("1000.00"), status=RoomStatus.VACANT)
+             for i in range(count)]
+    db.add_all(rooms)
+    db.commit()
+    return [str(room.id) for room in rooms]
+
+
+def _row(email, room_id, **overrides):
+    return {"email": email, "first_name": "New", "last_name": "Tenant", "room_id": room_id,
+            "lease_start": "2026-11-01", "lease_end": "2027-10-31", "rent_amount": "1100.00", **overrides}
+
+
+def test_json_import_reports_per_row(client, db, small_portfolio, large_portfolio, monkeypatch):
+    sent = []
+    monkeypatch.setattr(EmailService, "send_tenant_invitation", staticmethod(lambda **kw: sent.append(kw["tenant_email"])))
+    rooms = _vacant_rooms(db, small_portfolio.property_id, 3)
+
+    # Reactivate a moved-out tenant from the small portfolio alongside brand new ones
+    moved = db.query(Tenant).filter(Tenant.id == small_portfolio.tenant_id).one()
+    moved.status = TenantStatus.MOVED_OUT
+    moved_email = db.query(User.email).filter(User.id == moved.user_id).scalar()
+    db.commit()
+
+    rows = [
+        _row("one@example.com", rooms[0]),
+        _row("two@example.com", rooms[0]),                        # room already taken in this batch
+        _row("three@example.com", str(large_portfolio.room_id)),  # another operator's room
+        _row("not-an-email", rooms[1]),
+        _row(moved_email, rooms[1]),
+        _row("four@example.com", rooms[2], lease_end="2026-10-01"),
+    ]
+    response = client.post("/api/v1/tenants/import", json=rows, headers=auth_headers(small_portfolio.operator_token))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["reactivated"], body["failed"]) == (1, 1, 4)
+    assert [r["status"] for r in body["rows"]] == ["created", "error", "error", "error", "reactivated", "error"]
+    assert body["rows"][1]["errors"] == ["Room appears more than once in this import"]
+    assert body["rows"][2]["errors"] == ["Not authorized to manage this property"]
+    assert body["rows"][5]["errors"] == ["lease_end must be after lease_start"]
+
+    db.expire_all()
+    created = db.query(Tenant).join(User).filter(User.email == "one@example.com").one()
+    assert str(created.id) == body["rows"][0]["tenant_id"]
+    assert db.query(Room).filter(Room.id == rooms[0]).one().status == RoomStatus.OCCUPIED
+    assert db.query(Payment).filter(Payment.tenant_id == created.id).count() == 1
+    assert db.query(Tenant).filter(Tenant.id == small_portfolio.tenant_id).one().status == TenantStatus.ACTIVE
+    # Only the account that still has to be activated gets an invitation
+    assert sent == ["one@example.com"]
+
+
+def test_import_query_count_does_not_grow_with_rows(client, db, small_portfolio, query_counter, monkeypatch):
+    monkeypatch.setattr(EmailService, "send_tenant_invitation", staticmethod(lambda **kw: None))
+    rooms = _vacant_rooms(db, small_portfolio.property_id, 12)
+    headers = auth_headers(small_portfolio.operator_token)
+
+    with query_counter.count():
+        client.post("/api/v1/tenants/import", json=[_row(f"a{i}@example.com", rooms[i]) for i in range(2)],
+                    headers=headers)
+    small = query_counter.total
+    with query_counter.count():
+        response = client.post("/api/v1/tenants/import",
+                               json=[_row(f"b{i}@example.com", rooms[i]) for i in range(2, 12)], headers=headers)
+
+    assert response.json()["created"] == 10
+    assert query_counter.total == small
+
+
+def test_csv_import_dry_run(client, db, small_portfolio):
+    rooms = _vacant_rooms(db, small_portfolio.property_id, 2)
+    content = ("email,first_name,last_name,room_id,lease_start,lease_end,rent_amount,deposit_paid\n"
+               f"csv1@example.com,Csv,One,{rooms[0]},2026-11-01,2027-10-31,1000,\n"
+               f"csv2@example.com,Csv,Two,{rooms[1]},2026-11-01,2027-10-31,1000,500\n")
+
+    response = client.post(
+        "/api/v1/tenants/import/csv?dry_run=true",
+        files={"file": ("tenants.csv", content, "text/csv")},
+        headers=auth_headers(small_portfolio.operator_token),
+    )
+
+    body = response.json()
+    assert (body["created"], body["failed"], body["dry_run"]) == (2, 0, True)
+    assert db.query(User).filter(User.email.like("csv%")).count() == 0
@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose import jwt
+
+from app.config import get_settings
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from app.services import tokens
+from app.services.passwords import password_context
+from app.utils.auth import create_access_token
+from tests.conftest import auth_headers
+
+
+@pytest.fixture
+def session(client, db, small_portfolio):
+    """Log the seeded operator in and return the token pair"""
+    user = db.query(User).filter(User.id == small_portfolio.operator_user_id).one()
+    user.password_hash = password_context(get_settings().bcrypt_rounds).hash("correct horse")
+    db.commit()
+    response = client.post("/api/v1/auth/login", data={"username": user.email, "password": "correct horse"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def properties(client, access_token):
+    return client.get("/api/v1/properties/", headers=auth_headers(access_token))
+
+
+def refresh(client, refresh_token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_access_token_carries_user_and_scope_claims(client, session, small_portfolio):
+    claims = jwt.get_unverified_claims(session["access_token"])
+
+    assert claims["uid"] == small_portfolio.operator_user_id
+    assert claims["role"] == "operator"
+    assert claims["op"] and claims["type"] == "access" and claims["jti"]
+    assert session["expires_in"] == get_settings().access_token_expire_minutes * 60
+    assert properties(client, session["access_token"]).status_code == 200
+
+    tenant_claims = jwt.get_unverified_claims(small_portfolio.tenant_token)
+    assert tenant_claims["tid"] == small_portfolio.tenant_id
+    assert properties(client, small_portfolio.tenant_token).status_code == 403
+
+
+def test_refresh_rotates_and_a_replay_ends_the_family(client, session):
+    rotated = refresh(client, session["refresh_token"])
+    assert rotated.status_code == 200
+    assert properties(client, rotated.json()["access_token"]).status_code == 200
+
+    # The first token was used up; presenting it again also kills the one it was traded for
+    assert refresh(client, session["refresh_token"]).status_code == 401
+    assert refresh(client, rotated.json()["refresh_token"]).status_code == 401
+
+
+def test_refresh_rejects_access_tokens_and_garbage(client, session):
+    assert refresh(client, session["access_token"]).status_code == 401
+    assert refresh(client, "not-a-token").status_code == 401
+    assert properties(client, session["refresh_token"]).status_code == 401
+
+
+def test_logout_revokes_the_access_token_and_session(client, session):
+    response = client.post("/api/v1/auth/logout", headers=auth_headers(session["access_token"]),
+                           json={"refresh_token": session["refresh_token"]})
+
+    assert response.status_code == 200
+    assert properties(client, session["access_token"]).status_code == 401
+    assert refresh(client, session["refresh_token"]).status_code == 401
+
+
+def test_revocations_from_other_workers_apply_after_a_sync(client, db, engine, session, small_portfolio):
+    claims = jwt.get_unverified_claims(session["access_token"])
+    now = datetime.now(timezone.utc)
+    db.add(RevokedToken(jti=claims["jti"], token_type=tokens.ACCESS, user_id=uuid.UUID(small_portfolio.operator_user_id),
+                        expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc)))
+    db.add(RevokedToken(jti="long-gone", token_type=tokens.ACCESS, user_id=uuid.UUID(small_portfolio.operator_user_id),
+                        expires_at=now - timedelta(minutes=1)))
+    db.commit()
+
+    # Revoked elsewhere: this worker only learns of it from the table
+    assert properties(client, session["access_token"]).status_code == 200
+    assert tokens.sync_revocations(bind=engine) == 1
+    assert properties(client, session["access_token"]).status_code == 401
+    assert "long-gone" not in tokens.revocation_list
+    assert db.query(RevokedToken).filter(RevokedToken.jti == "long-gone").count() == 0
+
+
+def test_tokens_without_claims_are_still_accepted(client, db, small_portfolio):
+    operator = db.query(User).filter(User.id == small_portfolio.operator_user_id).one()
+    tenant = db.query(User).filter(User.email != operator.email, User.role == "tenant").first()
+
+    assert properties(client, create_access_token({"sub": operator.email})).status_code == 200
+    assert client.get("/api/v1/tenants/me/lease",
+                      headers=auth_headers(create_access_token({"sub": tenant.email}))).status_code == 200
+    assert properties(client, create_access_token({"sub": "nobody@example.com"})).status_code == 401
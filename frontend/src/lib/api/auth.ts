@@ -20,7 +20,12 @@ export const authApi = {
     return data
   },
 
-  logout: () => {
+  logout: async () => {
+    // Revoke server-side too, so the tokens stop working before they expire
+    await apiClient
+      .post('/auth/logout', { refresh_token: localStorage.getItem('refresh_token') })
+      .catch(() => undefined)
     localStorage.removeItem('access_token')
+    localStorage.removeItem('refresh_token')
   },
 }
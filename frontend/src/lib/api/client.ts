@@ -18,12 +18,42 @@ apiClient.interceptors.request.use((config) => {
   return config
 })
 
-// Handle 401 errors
+let refreshing: Promise<string> | null = null
+
+// One refresh at a time: each refresh token works once, and presenting it twice ends the session
+function refreshAccessToken(refreshToken: string): Promise<string> {
+  refreshing ??= axios
+    .post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+    .then(({ data }) => {
+      localStorage.setItem('access_token', data.access_token)
+      localStorage.setItem('refresh_token', data.refresh_token)
+      return data.access_token as string
+    })
+    .finally(() => {
+      refreshing = null
+    })
+  return refreshing
+}
+
+// Handle 401 errors: an expired access token is renewed once, otherwise back to login
 apiClient.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config
+    const refreshToken = localStorage.getItem('refresh_token')
+    if (error.response?.status === 401 && refreshToken && original && !original._retried) {
+      original._retried = true
+      try {
+        const token = await refreshAccessToken(refreshToken)
+        original.headers.Authorization = `Bearer ${token}`
+        return apiClient(original)
+      } catch {
+        // Refresh token expired or revoked as well
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('access_token')  // Changed from 'token' to 'access_token'
+      localStorage.removeItem('refresh_token')
       window.location.href = '/login'
     }
     return Promise.reject(error)
@@ -0,0 +1,24 @@
+import { apiClient } from './client'
+
+export type ExportDataset = 'payments' | 'tenants' | 'rent-roll'
+export type ExportFormat = 'csv' | 'xlsx'
+
+export const exportsApi = {
+  // Streams the file from the server and hands it to the browser as a download
+  download: async (
+    dataset: ExportDataset,
+    format: ExportFormat,
+    params: Record<string, string | undefined> = {}
+  ): Promise<void> => {
+    const { data } = await apiClient.get<Blob>(`/exports/${dataset}.${format}`, {
+      params,
+      responseType: 'blob',
+    })
+    const url = window.URL.createObjectURL(data)
+    const a = document.createElement('a')
+    a.href = url
+    a.download = `${dataset}-${new Date().toISOString().split('T')[0]}.${format}`
+    a.click()
+    window.URL.revokeObjectURL(url)
+  },
+}
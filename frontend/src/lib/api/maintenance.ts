@@ -14,14 +14,49 @@ export interface MaintenanceRequest {
   resolved_at?: string
 }
 
+export interface MaintenancePhotoThumbnail {
+  id: string
+  status: 'processing' | 'ready' | 'failed'
+  thumbnail_url: string | null
+  thumbnail_webp_url: string | null
+}
+
+export interface MaintenancePhotoDetail extends MaintenancePhotoThumbnail {
+  display_webp_url: string | null
+  original_url: string
+  width: number | null
+  height: number | null
+}
+
 export interface MaintenanceWithDetails extends MaintenanceRequest {
   property_name: string
   room_number: string
   unit_number: string
   reporter_email: string
+  photos: MaintenancePhotoThumbnail[]
+}
+
+export interface MaintenanceQueuePage {
+  items: MaintenanceWithDetails[]
+  next_cursor: string | null
+}
+
+export interface MaintenanceQueueParams {
+  property_id?: string
+  assigned_to?: string
+  status?: MaintenanceRequest['status'][]
+  limit?: number
+  cursor?: string
 }
 
 export const maintenanceApi = {
+  getQueue: async ({ status, ...params }: MaintenanceQueueParams = {}): Promise<MaintenanceQueuePage> => {
+    const { data } = await apiClient.get<MaintenanceQueuePage>('/maintenance/queue', {
+      params: { ...params, status: status?.join(',') },
+    })
+    return data
+  },
+
   getByProperty: async (propertyId: string): Promise<MaintenanceWithDetails[]> => {
     const { data } = await apiClient.get<MaintenanceWithDetails[]>(
       `/maintenance/property/${propertyId}`
@@ -52,4 +87,19 @@ export const maintenanceApi = {
   delete: async (id: string): Promise<void> => {
     await apiClient.delete(`/maintenance/${id}`)
   },
+
+  uploadPhoto: async (id: string, file: File): Promise<MaintenancePhotoThumbnail> => {
+    const formData = new FormData()
+    formData.append('file', file)
+
+    const { data } = await apiClient.post<MaintenancePhotoThumbnail>(`/maintenance/${id}/photos`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' }
+    })
+    return data
+  },
+
+  getPhoto: async (photoId: string): Promise<MaintenancePhotoDetail> => {
+    const { data } = await apiClient.get<MaintenancePhotoDetail>(`/maintenance/photos/${photoId}`)
+    return data
+  },
 }
@@ -0,0 +1,25 @@
+import { apiClient } from './client'
+
+export type SearchResultType = 'tenant' | 'room' | 'message' | 'maintenance' | 'document'
+
+export interface SearchResult {
+  type: SearchResultType
+  id: string
+  title: string
+  subtitle: string
+  // 0-1 within its type; results come ordered by match, then rank
+  rank: number
+  match: 'exact' | 'prefix' | 'fuzzy'
+  property_id?: string
+  tenant_id?: string
+}
+
+export const searchApi = {
+  // Server-side ranked search; every term is matched as a prefix, so this suits type-ahead
+  search: async (q: string, types?: SearchResultType[], limit = 10): Promise<SearchResult[]> => {
+    const { data } = await apiClient.get<{ query: string; results: SearchResult[] }>('/search', {
+      params: { q, types: types?.join(','), limit },
+    })
+    return data.results
+  },
+}
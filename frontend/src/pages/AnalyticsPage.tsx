@@ -2,6 +2,7 @@ import { useQuery } from '@tanstack/react-query'
 import { useState } from 'react'
 import { dashboardApi } from '@/lib/api/dashboard'
 import { paymentsApi } from '@/lib/api/payments'
+import { exportsApi } from '@/lib/api/exports'
 import { propertiesApi } from '@/lib/api/properties'
 import { Card, CardContent, CardHeader } from '@/components/ui/Card'
 import { LoadingScreen } from '@/components/ui/Spinner'
@@ -86,30 +87,10 @@ export function AnalyticsPage() {
     : '0'
 
   const handleExportCSV = () => {
-    if (!filteredPayments) return
-
-    const csv = [
-      ['Date', 'Property', 'Tenant', 'Unit', 'Room', 'Amount', 'Status', 'Payment Method', 'Due Date', 'Paid Date'],
-      ...filteredPayments.map(p => [
-        new Date(p.due_date).toLocaleDateString(),
-        p.property_name,
-        p.tenant_email,
-        p.unit_number,
-        p.room_number,
-        p.amount,
-        p.status,
-        p.payment_method || 'N/A',
-        p.due_date,
-        p.paid_date || 'N/A'
-      ])
-    ].map(row => row.join(',')).join('\n')
-
-    const blob = new Blob([csv], { type: 'text/csv' })
-    const url = window.URL.createObjectURL(blob)
-    const a = document.createElement('a')
-    a.href = url
-    a.download = `payments-analytics-${new Date().toISOString().split('T')[0]}.csv`
-    a.click()
+    const propertyId = selectedProperty === 'all'
+      ? undefined
+      : properties?.find(p => p.name === selectedProperty)?.id
+    exportsApi.download('payments', 'csv', { property_id: propertyId })
   }
 
   return (
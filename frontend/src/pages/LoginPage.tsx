@@ -47,7 +47,7 @@ export function LoginPage() {
         created_at: new Date().toISOString(),
       }
       
-      setAuth(user, response.access_token)
+      setAuth(user, response.access_token, response.refresh_token)
       navigate('/dashboard')
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Invalid credentials')
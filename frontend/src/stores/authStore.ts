@@ -5,7 +5,7 @@ interface AuthState {
   user: User | null
   token: string | null
   isAuthenticated: boolean
-  setAuth: (user: User, token: string) => void
+  setAuth: (user: User, token: string, refreshToken?: string) => void
   logout: () => void
 }
 
@@ -14,13 +14,17 @@ export const useAuthStore = create<AuthState>((set) => ({
   token: localStorage.getItem('access_token'),
   isAuthenticated: !!localStorage.getItem('access_token'),
   
-  setAuth: (user, token) => {
+  setAuth: (user, token, refreshToken) => {
     localStorage.setItem('access_token', token)
+    if (refreshToken) {
+      localStorage.setItem('refresh_token', refreshToken)
+    }
     set({ user, token, isAuthenticated: true })
   },
   
   logout: () => {
     localStorage.removeItem('access_token')
+    localStorage.removeItem('refresh_token')
     set({ user: null, token: null, isAuthenticated: false })
   },
 }))
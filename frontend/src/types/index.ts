@@ -91,7 +91,9 @@ export interface SignupData {
 
 export interface AuthResponse {
   access_token: string
+  refresh_token: string
   token_type: string
+  expires_in: number
 }
 
 export interface TenantWithUser {
@@ -1,12 +1,22 @@
 import { Outlet, useNavigate, useLocation } from 'react-router-dom'
+import { useQuery } from '@tanstack/react-query'
+import { authApi } from '@/lib/api/auth'
+import { announcementsApi } from '@/lib/api'
 import { Home, Wrench, Megaphone, User, LogOut, DollarSign, FileText, MessageSquare } from 'lucide-react'
 
 export function TenantLayout() {
   const navigate = useNavigate()
   const location = useLocation()
 
-  const handleLogout = () => {
-    localStorage.removeItem('tenant_token')
+  // Shared with the announcements page, which updates it when it marks items read
+  const { data: unreadAnnouncements } = useQuery({
+    queryKey: ['tenant-announcements-unread'],
+    queryFn: announcementsApi.getUnreadCount,
+    refetchInterval: 60_000,
+  })
+
+  const handleLogout = async () => {
+    await authApi.logout()
     navigate('/login')
   }
 
@@ -15,7 +25,7 @@ export function TenantLayout() {
     { path: '/payments', icon: DollarSign, label: 'Payments' },
     { path: '/documents', icon: FileText, label: 'Documents' }, // Add this line
     { path: '/maintenance', icon: Wrench, label: 'Maintenance' },
-    { path: '/announcements', icon: Megaphone, label: 'Announcements' },
+    { path: '/announcements', icon: Megaphone, label: 'Announcements', badge: unreadAnnouncements },
     { path: '/messages', icon: MessageSquare, label: 'Messages' },
     { path: '/profile', icon: User, label: 'Profile' },
   ]
@@ -48,6 +58,11 @@ export function TenantLayout() {
               >
                 <Icon className="w-5 h-5" />
                 <span>{item.label}</span>
+                {item.badge ? (
+                  <span className="ml-auto min-w-5 px-1.5 py-0.5 rounded-full bg-[#ff453a] text-white text-xs text-center">
+                    {item.badge}
+                  </span>
+                ) : null}
               </button>
             )
           })}
@@ -18,6 +18,43 @@ apiClient.interceptors.request.use((config) => {
   return config
 })
 
+let refreshing: Promise<string> | null = null
+
+// One refresh at a time: each refresh token works once, and presenting it twice ends the session
+function refreshAccessToken(refreshToken: string): Promise<string> {
+  refreshing ??= axios
+    .post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+    .then(({ data }) => {
+      localStorage.setItem('tenant_token', data.access_token)
+      localStorage.setItem('tenant_refresh_token', data.refresh_token)
+      return data.access_token as string
+    })
+    .finally(() => {
+      refreshing = null
+    })
+  return refreshing
+}
+
+// An expired access token is renewed once and the request retried
+apiClient.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const original = error.config
+    const refreshToken = localStorage.getItem('tenant_refresh_token')
+    if (error.response?.status === 401 && refreshToken && original && !original._retried) {
+      original._retried = true
+      try {
+        const token = await refreshAccessToken(refreshToken)
+        original.headers.Authorization = `Bearer ${token}`
+        return apiClient(original)
+      } catch {
+        localStorage.removeItem('tenant_refresh_token')
+      }
+    }
+    return Promise.reject(error)
+  }
+)
+
 // Auth API
 export const authApi = {
   login: async (email: string, password: string) => {
@@ -45,6 +82,12 @@ export const tenantApi = {
     const { data } = await apiClient.get('/tenants/me/lease')
     return data
   },
+
+  // Home screen in one request: lease, payment totals and recent items from every section
+  getBootstrap: async () => {
+    const { data } = await apiClient.get('/tenants/me/bootstrap')
+    return data
+  },
 }
 
 // Payments API
@@ -73,9 +116,29 @@ export const maintenanceApi = {
 }
 
 // Announcements API
+export interface AnnouncementFeedPage {
+  items: any[]
+  next_cursor: string | null
+  newest_cursor: string | null
+}
+
 export const announcementsApi = {
-  getMyAnnouncements: async () => {
-    const { data } = await apiClient.get('/tenants/me/announcements')
+  // One page of the feed, newest first; the next older page via `cursor` = `next_cursor`,
+  // new arrivals via `since` = `newest_cursor`
+  getMyAnnouncements: async (
+    params: { limit?: number; cursor?: string; since?: string } = {}
+  ): Promise<AnnouncementFeedPage> => {
+    const { data } = await apiClient.get('/tenants/me/announcements', { params })
     return data
   },
+
+  getUnreadCount: async (): Promise<number> => {
+    const { data } = await apiClient.get('/tenants/me/announcements/unread-count')
+    return data.unread_count
+  },
+
+  markRead: async (announcementIds: string[]): Promise<number> => {
+    const { data } = await apiClient.post('/tenants/me/announcements/read', { announcement_ids: announcementIds })
+    return data.unread_count
+  },
 }
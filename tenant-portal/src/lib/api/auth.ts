@@ -7,7 +7,9 @@ export interface LoginCredentials {
 
 export interface AuthResponse {
   access_token: string
+  refresh_token: string
   token_type: string
+  expires_in: number
 }
 
 export interface CheckEmailResponse {
@@ -46,4 +48,13 @@ export const authApi = {
     const { data } = await apiClient.post('/tenant-auth/signup', signupData)
     return data
   },
+
+  logout: async () => {
+    // Revoke server-side too, so the tokens stop working before they expire
+    await apiClient
+      .post('/auth/logout', { refresh_token: localStorage.getItem('tenant_refresh_token') })
+      .catch(() => undefined)
+    localStorage.removeItem('tenant_token')
+    localStorage.removeItem('tenant_refresh_token')
+  },
 }
@@ -1,15 +1,42 @@
-import { useQuery } from '@tanstack/react-query'
+import { useEffect } from 'react'
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { announcementsApi } from '@/lib/api'
 import { Card, CardContent, CardHeader } from '@/components/ui/Card'
+import { Button } from '@/components/ui/Button'
 import { LoadingScreen } from '@/components/ui/Spinner'
-import { Megaphone, AlertCircle } from 'lucide-react'
+import { Megaphone, AlertCircle, Mail } from 'lucide-react'
 
 export function AnnouncementsPage() {
-  const { data: announcements, isLoading } = useQuery({
+  const queryClient = useQueryClient()
+
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['tenant-announcements'],
-    queryFn: announcementsApi.getMyAnnouncements,
+    queryFn: ({ pageParam }) => announcementsApi.getMyAnnouncements({ cursor: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+  })
+  const announcements = data?.pages.flatMap((page) => page.items)
+
+  const { data: unreadCount } = useQuery({
+    queryKey: ['tenant-announcements-unread'],
+    queryFn: announcementsApi.getUnreadCount,
+  })
+
+  const markReadMutation = useMutation({
+    mutationFn: announcementsApi.markRead,
+    onSuccess: (count) => {
+      queryClient.setQueryData(['tenant-announcements-unread'], count)
+    },
   })
 
+  // Mark what the tenant has on screen as read; items keep their "New" label until the next visit
+  const unreadIds = announcements?.filter((a: any) => !a.read).map((a: any) => a.id) || []
+  useEffect(() => {
+    if (unreadIds.length > 0) {
+      markReadMutation.mutate(unreadIds)
+    }
+  }, [unreadIds.join(',')])
+
   if (isLoading) {
     return <LoadingScreen message="Loading announcements..." />
   }
@@ -43,10 +70,10 @@ export function AnnouncementsPage() {
         <Card>
           <CardContent>
             <div className="flex items-center gap-3">
-              <Megaphone className="w-8 h-8 text-[#667eea]" />
+              <Mail className="w-8 h-8 text-[#667eea]" />
               <div>
-                <p className="text-sm text-[#636366]">Total</p>
-                <p className="text-2xl font-bold text-white">{announcements?.length || 0}</p>
+                <p className="text-sm text-[#636366]">Unread</p>
+                <p className="text-2xl font-bold text-white">{unreadCount ?? 0}</p>
               </div>
             </div>
           </CardContent>
@@ -114,6 +141,9 @@ export function AnnouncementsPage() {
                         <span className={`px-2 py-0.5 rounded text-xs border ${priorityColors[announcement.priority as keyof typeof priorityColors]}`}>
                           {announcement.priority}
                         </span>
+                        {!announcement.read && (
+                          <span className="px-2 py-0.5 rounded text-xs bg-[#667eea] text-white">New</span>
+                        )}
                       </div>
                       <p className="text-sm text-[#98989d] whitespace-pre-wrap">
                         {announcement.message}
@@ -128,6 +158,14 @@ export function AnnouncementsPage() {
                 </div>
               ))}
             </div>
+
+            {hasNextPage && (
+              <div className="mt-6 flex justify-center">
+                <Button variant="secondary" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                  {isFetchingNextPage ? 'Loading...' : 'Load older announcements'}
+                </Button>
+              </div>
+            )}
           </CardContent>
         </Card>
       )}
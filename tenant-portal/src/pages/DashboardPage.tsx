@@ -1,31 +1,23 @@
 import { useQuery } from '@tanstack/react-query'
-import { tenantApi, paymentsApi } from '@/lib/api'
+import { tenantApi } from '@/lib/api'
 import { Card, CardContent, CardHeader } from '@/components/ui/Card'
 import { LoadingScreen } from '@/components/ui/Spinner'
 import { Home, DollarSign, Calendar, CheckCircle, AlertCircle } from 'lucide-react'
 import { formatCurrency, formatDate } from '@/lib/utils'
 
 export function DashboardPage() {
-  const { data: lease, isLoading: leaseLoading } = useQuery({
-    queryKey: ['tenant-lease'],
-    queryFn: tenantApi.getLeaseInfo,
+  const { data: bootstrap, isLoading } = useQuery({
+    queryKey: ['tenant-bootstrap'],
+    queryFn: tenantApi.getBootstrap,
   })
 
-  const { data: payments, isLoading: paymentsLoading } = useQuery({
-    queryKey: ['tenant-payments'],
-    queryFn: paymentsApi.getMyPayments,
-  })
-
-
-
-  if (leaseLoading || paymentsLoading) {
+  if (isLoading) {
     return <LoadingScreen message="Loading your dashboard..." />
   }
 
-  const pendingPayments = payments?.filter((p: any) => p.status === 'pending') || []
-  const paidPayments = payments?.filter((p: any) => p.status === 'paid') || []
-  const overduePayments = payments?.filter((p: any) => p.status === 'overdue') || []
-  const nextPayment = pendingPayments?.sort((a: any, b: any) => new Date(a.due_date).getTime() - new Date(b.due_date).getTime())[0]
+  const lease = bootstrap?.lease
+  const payments = bootstrap?.payments
+  const nextPayment = payments?.next_due
 
   return (
     <div className="space-y-8">
@@ -103,7 +95,7 @@ export function DashboardPage() {
               <DollarSign className="w-8 h-8 text-[#667eea]" />
               <div>
                 <p className="text-sm text-[#636366]">Total Payments</p>
-                <p className="text-2xl font-bold text-white">{payments?.length || 0}</p>
+                <p className="text-2xl font-bold text-white">{payments?.count || 0}</p>
               </div>
             </div>
           </CardContent>
@@ -115,7 +107,7 @@ export function DashboardPage() {
               <CheckCircle className="w-8 h-8 text-[#32d74b]" />
               <div>
                 <p className="text-sm text-[#636366]">Paid</p>
-                <p className="text-2xl font-bold text-white">{paidPayments.length}</p>
+                <p className="text-2xl font-bold text-white">{payments?.paid_count || 0}</p>
               </div>
             </div>
           </CardContent>
@@ -127,13 +119,13 @@ export function DashboardPage() {
               <Calendar className="w-8 h-8 text-[#ffd60a]" />
               <div>
                 <p className="text-sm text-[#636366]">Pending</p>
-                <p className="text-2xl font-bold text-white">{pendingPayments.length}</p>
+                <p className="text-2xl font-bold text-white">{payments?.pending_count || 0}</p>
               </div>
             </div>
           </CardContent>
         </Card>
 
-        {overduePayments.length > 0 ? (
+        {payments?.overdue_count > 0 ? (
           <Card className="border-[#ff453a]/20">
             <CardContent>
               <div className="flex items-center gap-3">
@@ -143,7 +135,7 @@ export function DashboardPage() {
                 <div>
                   <h3 className="font-medium text-[#ff453a]">Overdue Payment</h3>
                   <p className="text-xl font-bold text-white mt-1">
-                    {overduePayments.length} payment{overduePayments.length > 1 ? 's' : ''}
+                    {payments.overdue_count} payment{payments.overdue_count > 1 ? 's' : ''}
                   </p>
                   <p className="text-sm text-[#98989d]">Contact property manager</p>
                 </div>
@@ -16,6 +16,7 @@ export function LoginPage() {
     mutationFn: () => authApi.login(email, password),
     onSuccess: (data) => {
       localStorage.setItem('tenant_token', data.access_token)
+      localStorage.setItem('tenant_refresh_token', data.refresh_token)
       toast.success('Welcome back!')
       navigate('/dashboard')
     },
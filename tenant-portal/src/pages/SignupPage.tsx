@@ -51,6 +51,7 @@ export function SignupPage() {
     mutationFn: authApi.signup,
     onSuccess: (data) => {
       localStorage.setItem('tenant_token', data.access_token)
+      localStorage.setItem('tenant_refresh_token', data.refresh_token)
       toast.success('Account created successfully!')
       navigate('/dashboard')
     },